@@ -0,0 +1,326 @@
+"""Request-scoped project access context, backed by a cross-request ACL cache."""
+
+import asyncio
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.db.models import CharField, F, IntegerField, Value
+
+from .models import Project, ProjectMember
+
+EDITOR_GROUP = "editor"
+
+ACL_CACHE_PREFIX = "scrum_app:acl"
+ACL_HITS_KEY = f"{ACL_CACHE_PREFIX}:stats:hits"
+ACL_MISSES_KEY = f"{ACL_CACHE_PREFIX}:stats:misses"
+
+
+def _acl_cache_key(user_id):
+    return f"{ACL_CACHE_PREFIX}:user:{user_id}"
+
+
+# Counter increments not yet written to the cache (see count())
+_pending = Counter()
+_pending_lock = threading.Lock()
+_flushed_at = time.monotonic()
+
+
+def incr_counter(key, amount=1):
+    """
+    Increment a shared cache counter, creating it on first use.
+
+    Some backends implement incr() as a read and a rewrite, so increments
+    racing in two workers may count once: the counters are approximate.
+    """
+    if not cache.add(key, amount, timeout=None):
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            # Evicted between add() and incr(); start over.
+            cache.set(key, amount, timeout=None)
+
+
+async def aincr_counter(key, amount=1):
+    """incr_counter() for async views."""
+    if not await cache.aadd(key, amount, timeout=None):
+        try:
+            await cache.aincr(key, amount)
+        except ValueError:
+            await cache.aset(key, amount, timeout=None)
+
+
+def _take_due(key, amount):
+    """Record an increment; return everything pending once a flush is due."""
+    global _flushed_at  # pylint: disable=global-statement
+    with _pending_lock:
+        _pending[key] += amount
+        now = time.monotonic()
+        if now - _flushed_at < settings.SCRUM_CACHE_STATS_FLUSH_SECONDS:
+            return {}
+        _flushed_at = now
+        due = dict(_pending)
+        _pending.clear()
+    return due
+
+
+def count(key, amount=1):
+    """
+    Add to a shared counter without a cache write per call.
+
+    Increments are summed in process memory and written with incr_counter()
+    at most every SCRUM_CACHE_STATS_FLUSH_SECONDS.
+    """
+    for due_key, due_amount in _take_due(key, amount).items():
+        incr_counter(due_key, due_amount)
+
+
+async def acount(key, amount=1):
+    """count() for async views."""
+    for due_key, due_amount in _take_due(key, amount).items():
+        await aincr_counter(due_key, due_amount)
+
+
+def read_counter(key):
+    """Shared value of a count() counter plus this process's unflushed part."""
+    with _pending_lock:
+        pending = _pending[key]
+    return cache.get(key, 0) + pending
+
+
+def reset_counters(*keys):
+    """Zero count() counters, flushed or not."""
+    with _pending_lock:
+        for key in keys:
+            _pending.pop(key, None)
+    cache.delete_many(keys)
+
+
+def invalidate_user_acl(*user_ids):
+    """Drop the cached ACL of the given users."""
+    cache.delete_many([_acl_cache_key(user_id) for user_id in user_ids if user_id])
+
+
+def acl_cache_stats():
+    """
+    Hit/miss counters of the ACL cache, summed over every worker process.
+
+    Other processes report their share every SCRUM_CACHE_STATS_FLUSH_SECONDS.
+    """
+    hits = read_counter(ACL_HITS_KEY)
+    misses = read_counter(ACL_MISSES_KEY)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+    }
+
+
+def reset_acl_cache_stats():
+    """Zero the hit/miss counters."""
+    reset_counters(ACL_HITS_KEY, ACL_MISSES_KEY)
+
+
+def _project_id(project):
+    """Accept a Project instance or a raw primary key."""
+    return getattr(project, "pk", project)
+
+
+class ProjectAccess:
+    """
+    Answers "can this user see / manage this project?" for one request.
+
+    Owned projects, memberships and global group names are resolved together
+    in a single UNION query the first time any question is asked, and every
+    later answer is served from memory. The resolved sets are also kept in
+    Django's cache framework so later requests skip the query entirely; the
+    signal handlers in ``scrum_app.signals`` drop the entry whenever
+    ownership, membership or group assignment changes. With a shared cache
+    backend (see CACHES in the settings) a change made through one worker
+    reaches the others on their next request.
+
+    Async views use the ``a``-prefixed methods, which load through the async
+    cache and ORM APIs.
+    """
+
+    def __init__(self, user, auser=None):
+        self.user = user
+        # Async views resolve the user through this (request.auser)
+        self._auser = auser
+        self._owned = None
+        self._member = None
+        self._groups = None
+        self._aloading = None
+
+    def _load(self):
+        if self._owned is not None:
+            return
+
+        self._owned, self._member, self._groups = set(), set(), set()
+        if not self.user.is_authenticated:
+            return
+
+        key = _acl_cache_key(self.user.pk)
+        cached = cache.get(key)
+        if cached is not None:
+            count(ACL_HITS_KEY)
+            self._owned, self._member, self._groups = cached
+            return
+
+        count(ACL_MISSES_KEY)
+        self._owned, self._member, self._groups = self._split_rows(self._rows_query())
+        cache.set(
+            key,
+            (self._owned, self._member, self._groups),
+            timeout=settings.SCRUM_ACL_CACHE_TIMEOUT,
+        )
+
+    async def _aload(self):
+        """_load() for async views, shared by concurrent callers."""
+        if self._owned is not None:
+            return
+        if self._aloading is None:
+            self._aloading = asyncio.ensure_future(self._afetch())
+        await self._aloading
+
+    async def _afetch(self):
+        if self._auser is not None:
+            # request.user would resolve the session synchronously
+            self.user = await self._auser()
+
+        owned, member, groups = set(), set(), set()
+        if self.user.is_authenticated:
+            key = _acl_cache_key(self.user.pk)
+            cached = await cache.aget(key)
+            if cached is not None:
+                await acount(ACL_HITS_KEY)
+                owned, member, groups = cached
+            else:
+                await acount(ACL_MISSES_KEY)
+                rows = [row async for row in self._rows_query()]
+                owned, member, groups = self._split_rows(rows)
+                await cache.aset(
+                    key,
+                    (owned, member, groups),
+                    timeout=settings.SCRUM_ACL_CACHE_TIMEOUT,
+                )
+        self._owned, self._member, self._groups = owned, member, groups
+
+    @staticmethod
+    def _split_rows(rows):
+        """(owned ids, member ids, group names) from _rows_query() rows."""
+        owned, member, groups = set(), set(), set()
+        for kind, project_id, group_name in rows:
+            if kind == "owner":
+                owned.add(project_id)
+            elif kind == "member":
+                member.add(project_id)
+            else:
+                groups.add(group_name)
+        return owned, member, groups
+
+    def _rows_query(self):
+        """(kind, project_id, group_name) rows for the user, as one UNION."""
+        no_project = Value(None, output_field=IntegerField())
+        no_group = Value(None, output_field=CharField())
+        columns = ("kind", "project_ref", "group_name")
+
+        owned = (
+            Project.objects.filter(owner=self.user)
+            .order_by()
+            .annotate(
+                kind=Value("owner", output_field=CharField()),
+                project_ref=F("pk"),
+                group_name=no_group,
+            )
+            .values_list(*columns)
+        )
+        member = (
+            ProjectMember.objects.filter(user=self.user)
+            .order_by()
+            .annotate(
+                kind=Value("member", output_field=CharField()),
+                project_ref=F("project_id"),
+                group_name=no_group,
+            )
+            .values_list(*columns)
+        )
+        groups = (
+            Group.objects.filter(user=self.user)
+            .order_by()
+            .annotate(
+                kind=Value("group", output_field=CharField()),
+                project_ref=no_project,
+                group_name=F("name"),
+            )
+            .values_list(*columns)
+        )
+        return owned.union(member, groups, all=True)
+
+    @property
+    def is_editor(self):
+        """User belongs to the global 'editor' group."""
+        self._load()
+        return EDITOR_GROUP in self._groups
+
+    def in_group(self, name):
+        """Check membership in a global Django group."""
+        self._load()
+        return name in self._groups
+
+    def is_owner(self, project):
+        """Check if the user owns the project."""
+        self._load()
+        return _project_id(project) in self._owned
+
+    def is_member(self, project):
+        """Owner or ProjectMember (mirrors Project.is_member)."""
+        self._load()
+        project_id = _project_id(project)
+        return project_id in self._owned or project_id in self._member
+
+    def can_manage(self, project, allow_superuser=False):
+        """
+        Owner or global editor (used for UI show/hide).
+
+        Sprint and member management also admit superusers; pass
+        allow_superuser=True there. Projects themselves never did.
+        """
+        if allow_superuser and self.user.is_superuser:
+            return True
+        return self.is_owner(project) or self.is_editor
+
+    async def ais_member(self, project):
+        """is_member() for async views."""
+        await self._aload()
+        return self.is_member(project)
+
+    async def ais_owner(self, project):
+        """is_owner() for async views."""
+        await self._aload()
+        return self.is_owner(project)
+
+    async def acan_manage(self, project, allow_superuser=False):
+        """can_manage() for async views."""
+        await self._aload()
+        return self.can_manage(project, allow_superuser=allow_superuser)
+
+    def require_member(self, project):
+        """Raise PermissionDenied unless the user is owner or member."""
+        if not self.is_member(project):
+            raise PermissionDenied
+
+    def require_editor(self, project, allow_superuser=False):
+        """
+        Raise PermissionDenied unless the user may manage the project.
+
+        The user must be a project member and pass can_manage().
+        """
+        self.require_member(project)
+        if not self.can_manage(project, allow_superuser=allow_superuser):
+            raise PermissionDenied
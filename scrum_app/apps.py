@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ScrumAppConfig(AppConfig):
     name = "scrum_app"
+
+    def ready(self):
+        from . import signals  # noqa: F401  pylint: disable=unused-import,import-outside-toplevel
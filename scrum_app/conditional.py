@@ -0,0 +1,172 @@
+"""
+Conditional GET for the read views.
+
+``project_condition`` gives a view a weak ETag built from the project's cache
+generation (scrum_app.generations), which every write under the project
+bumps. A refresh of an unchanged page then costs one
+``values_list`` lookup and a cache read, and answers 304 without running the
+view or its template. The generations are in the cache shared by all worker
+processes, so whichever worker handled a write, every worker's validators
+change with it.
+
+The ETag also varies on everything else the page shows for the current
+request: the user and their permissions on the project, the CSRF cookie
+embedded in the forms and the full path (cursor, sort, ...). There is no
+Last-Modified header: a change of membership or permissions alters the page
+without touching the project, and a date could not express it, so an
+If-Modified-Since request would get a wrong 304.
+
+It follows Django's ``condition`` decorator, which cannot be used as is:
+its validator functions are called synchronously, so async views would run
+the project lookup through the sync ORM. Async views get async validators
+here.
+"""
+
+import hashlib
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib import messages
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from .generations import PROJECT, aget_generation, get_generation
+
+
+class ProjectLookup:
+    """Maps a view's URL kwargs to its project id, for sync and async views."""
+
+    def __init__(self, resolve, aresolve):
+        self.resolve = resolve
+        self.aresolve = aresolve
+
+
+def project_id_from(model, kwarg):
+    """Project lookup reading ``model.project_id`` for the ``kwarg`` URL argument."""
+
+    def queryset(kwargs):
+        return (
+            model.objects.filter(pk=kwargs[kwarg])
+            .order_by()
+            .values_list("project_id", flat=True)
+        )
+
+    return ProjectLookup(
+        lambda kwargs: queryset(kwargs).first(),
+        lambda kwargs: queryset(kwargs).afirst(),
+    )
+
+
+def project_id_kwarg(kwarg):
+    """Project lookup for URLs that carry the project id themselves."""
+
+    async def aresolve(kwargs):
+        return kwargs[kwarg]
+
+    return ProjectLookup(lambda kwargs: kwargs[kwarg], aresolve)
+
+
+def _answerable(request):
+    """
+    Whether the request may be answered from validators at all: safe method
+    and no pending flash messages (rendering is what consumes them).
+    """
+    return request.method in ("GET", "HEAD") and not messages.get_messages(request)
+
+
+def _etag(request, user, project_id, generation, permissions):
+    # Callers have loaded request.access already, so this reads memory only
+    access = request.access
+    parts = [
+        request.get_full_path(),
+        user.pk,
+        generation,
+        access.is_owner(project_id),
+        access.can_manage(project_id),
+        request.META.get("CSRF_COOKIE"),
+        *sorted(permissions),
+    ]
+    digest = hashlib.md5(
+        ":".join(str(part) for part in parts).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _validator(request, lookup, kwargs, vary_on_perms):
+    """
+    ETag of the page, or None when the request must not be answered from
+    validators (see _answerable(), non-members, missing object).
+    """
+    if not _answerable(request):
+        return None
+    project_id = lookup.resolve(kwargs)
+    if project_id is None or not request.access.is_member(project_id):
+        return None
+    permissions = request.user.get_all_permissions() if vary_on_perms else ()
+    return _etag(
+        request,
+        request.user,
+        project_id,
+        get_generation(PROJECT, project_id),
+        permissions,
+    )
+
+
+async def _avalidator(request, lookup, kwargs, vary_on_perms):
+    """_validator() for async views."""
+    if not _answerable(request):
+        return None
+    project_id = await lookup.aresolve(kwargs)
+    if project_id is None or not await request.access.ais_member(project_id):
+        return None
+    user = await request.auser()
+    permissions = await user.aget_all_permissions() if vary_on_perms else ()
+    generation = await aget_generation(PROJECT, project_id)
+    return _etag(request, user, project_id, generation, permissions)
+
+
+def _finish(request, response, etag):
+    if request.method in ("GET", "HEAD"):
+        if etag:
+            response.headers.setdefault("ETag", etag)
+        # Let browsers keep the page but revalidate it on every visit
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def project_condition(lookup, vary_on_perms=False):
+    """
+    Answer GET/HEAD with 304 while the page's project is unchanged.
+
+    Args:
+        lookup: ProjectLookup from project_id_from() or project_id_kwarg()
+        vary_on_perms: Include the user's model permissions in the ETag, for
+            templates reading ``perms``
+
+    Returns:
+        Callable: View decorator, placed below the access decorators
+    """
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                etag = await _avalidator(request, lookup, kwargs, vary_on_perms)
+                response = get_conditional_response(request, etag=etag)
+                if response is None:
+                    response = await view_func(request, *args, **kwargs)
+                return _finish(request, response, etag)
+
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            etag = _validator(request, lookup, kwargs, vary_on_perms)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view_func(request, *args, **kwargs)
+            return _finish(request, response, etag)
+
+        return wrapper
+
+    return decorator
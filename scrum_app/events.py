@@ -0,0 +1,261 @@
+"""
+Board change events, streamed to open boards as Server-Sent Events.
+
+Writes to tasks, stories and comments publish small JSON events on a channel
+per user story (``story:<pk>``) and per sprint backlog
+(``sprint_backlog:<pk>``); see scrum_app.signals and the bulk paths in the
+services. ``board_events_view`` subscribes to one channel and streams what
+arrives, so open boards stay current without polling the database.
+
+Publishing goes through the backend named by ``settings.SCRUM_EVENTS_BACKEND``:
+
+* ``LocalBackend`` hands events straight to this process's subscribers. Fine
+  for a single worker.
+* ``OutboxBackend`` appends them to the BoardEvent table. Every worker tails
+  the table with one primary-key query per poll interval while it has
+  subscribers, however many streams are open, so all workers see every event.
+
+Events are published once the transaction commits and are not replayed: a
+client that reconnects reloads the state it needs.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from datetime import timedelta
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import BoardEvent
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per stream before the oldest are dropped
+SUBSCRIPTION_QUEUE_SIZE = 100
+
+
+def story_channel(user_story_id):
+    """Channel of a user story's Kanban board."""
+    return f"story:{user_story_id}"
+
+
+def sprint_backlog_channel(sprint_backlog_id):
+    """Channel of a sprint backlog page."""
+    return f"sprint_backlog:{sprint_backlog_id}"
+
+
+class Subscription:
+    """Events of some channels, queued for one stream."""
+
+    def __init__(self, channels, loop):
+        self.channels = frozenset(channels)
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=SUBSCRIPTION_QUEUE_SIZE)
+
+    def deliver(self, event):
+        """Queue ``event``; callable from any thread."""
+        self._loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        if self._queue.full():
+            # A stalled client loses its oldest events, not the newest
+            self._queue.get_nowait()
+        self._queue.put_nowait(event)
+
+    async def get(self, timeout):
+        """Next event, or None after ``timeout`` seconds without one."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class Hub:
+    """In-process fan-out from channels to subscriptions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = defaultdict(set)
+
+    def subscribe(self, *channels):
+        """Register a subscription on the running event loop."""
+        subscription = Subscription(channels, asyncio.get_running_loop())
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscriptions[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Stop delivering to ``subscription``."""
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscriptions.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscriptions[channel]
+
+    def has_subscriptions(self):
+        """True while any stream is open in this process."""
+        with self._lock:
+            return bool(self._subscriptions)
+
+    def dispatch(self, channel, event):
+        """Deliver ``event`` to every subscription of ``channel``."""
+        with self._lock:
+            subscribers = list(self._subscriptions.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+
+hub = Hub()
+
+
+class LocalBackend:
+    """Deliver events to subscribers of this process only."""
+
+    def publish(self, channel, event):
+        """Hand ``event`` to the local hub."""
+        hub.dispatch(channel, event)
+
+    async def listen(self):
+        """Called by every new stream; nothing to start in-process."""
+
+
+class OutboxBackend:
+    """Share events between workers through the BoardEvent table."""
+
+    def __init__(self):
+        self._poller = None
+        self._last_id = None
+        self._last_prune = None
+
+    def publish(self, channel, event):
+        """Append ``event`` to the outbox; pollers deliver it everywhere."""
+        BoardEvent.objects.create(channel=channel, payload=event)
+
+    async def listen(self):
+        """Make sure this process tails the outbox while streams are open."""
+        if self._poller is None or self._poller.done():
+            # Start from the newest row: whatever was published while nobody
+            # was listening is stale for the streams opening now
+            self._last_id = await sync_to_async(self._latest_id)()
+            self._poller = asyncio.create_task(self._poll())
+
+    @staticmethod
+    def _latest_id():
+        latest = BoardEvent.objects.order_by("-pk").values_list("pk", flat=True).first()
+        return latest or 0
+
+    def _fetch(self):
+        """Rows published since the last poll, pruning old rows now and then."""
+        rows = list(
+            BoardEvent.objects.filter(pk__gt=self._last_id)
+            .order_by("pk")
+            .values_list("pk", "channel", "payload")[:500]
+        )
+        now = timezone.now()
+        retention = timedelta(seconds=settings.SCRUM_EVENTS_OUTBOX_RETENTION)
+        if self._last_prune is None or now - self._last_prune > retention:
+            BoardEvent.objects.filter(created_at__lt=now - retention).delete()
+            self._last_prune = now
+        return rows
+
+    async def _poll(self):
+        while hub.has_subscriptions():
+            try:
+                rows = await sync_to_async(self._fetch)()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("board event outbox poll failed")
+                rows = []
+            for pk, channel, payload in rows:
+                hub.dispatch(channel, payload)
+                self._last_id = pk
+            await asyncio.sleep(settings.SCRUM_EVENTS_POLL_INTERVAL)
+
+
+@lru_cache(maxsize=None)
+def _load_backend(path):
+    return import_string(path)()
+
+
+def get_backend():
+    """The configured events backend (one instance per process)."""
+    return _load_backend(settings.SCRUM_EVENTS_BACKEND)
+
+
+def publish(channel, event_type, **data):
+    """
+    Publish an event on ``channel`` once the current transaction commits.
+
+    Args:
+        channel: From story_channel() or sprint_backlog_channel()
+        event_type: SSE event name ("tasks.saved", "story.deleted", ...)
+        **data: JSON-serializable payload
+    """
+    event = {"type": event_type, **data}
+
+    def send():
+        try:
+            get_backend().publish(channel, event)
+        except Exception:  # pylint: disable=broad-exception-caught
+            # Live updates are best effort; never fail the write
+            logger.exception("could not publish %s on %s", event_type, channel)
+
+    transaction.on_commit(send)
+
+
+def publish_tasks_saved(user_story_id, tasks):
+    """Publish the new status and version of ``tasks`` of one story."""
+    publish(
+        story_channel(user_story_id),
+        "tasks.saved",
+        tasks=[
+            {"id": task.pk, "status": task.status, "version": task.version}
+            for task in tasks
+        ],
+    )
+
+
+def publish_story_event(event_type, story, previous_sprint_backlog_id=None):
+    """
+    Publish ``event_type`` for ``story`` on its Kanban board and on the
+    sprint backlogs it is in or has just left.
+    """
+    data = {"id": story.pk, "status": story.status, "version": story.version}
+    publish(story_channel(story.pk), event_type, **data)
+    sprint_backlogs = {story.sprint_backlog_id, previous_sprint_backlog_id}
+    for sprint_backlog_id in sprint_backlogs - {None}:
+        publish(sprint_backlog_channel(sprint_backlog_id), event_type, **data)
+
+
+async def event_stream(*channels):
+    """
+    SSE body for ``channels``: events, keep-alives, then a clean close.
+
+    Streams end after ``SCRUM_EVENTS_STREAM_SECONDS`` so workers can recycle
+    connections; EventSource reconnects by itself after the ``retry`` delay.
+    """
+    loop = asyncio.get_running_loop()
+    subscription = hub.subscribe(*channels)
+    try:
+        await get_backend().listen()
+        yield f"retry: {settings.SCRUM_EVENTS_RETRY_MS}\n\n"
+        deadline = loop.time() + settings.SCRUM_EVENTS_STREAM_SECONDS
+        while (remaining := deadline - loop.time()) > 0:
+            event = await subscription.get(
+                min(settings.SCRUM_EVENTS_HEARTBEAT, remaining)
+            )
+            if event is None:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    finally:
+        hub.unsubscribe(subscription)
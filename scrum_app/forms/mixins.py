@@ -0,0 +1,35 @@
+"""Shared behaviour for model forms."""
+
+from django import forms
+
+
+class VersionCheckMixin(forms.Form):
+    """
+    Reject edits made on top of a stale copy of a versioned model.
+
+    The form carries the ``version`` the user started from in a hidden field;
+    if the row moved on meanwhile (someone dragged the card, edited the
+    story, ...) the edit is refused instead of silently overwriting it.
+    """
+
+    version = forms.IntegerField(required=False, widget=forms.HiddenInput)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.fields["version"].initial = self.instance.version
+
+    def clean(self):
+        cleaned_data = super().clean()
+        version = cleaned_data.pop("version", None)
+        if (
+            self.instance.pk
+            and version is not None
+            and version != self.instance.version
+        ):
+            raise forms.ValidationError(
+                "Este item foi alterado por outra pessoa enquanto você editava. "
+                "Recarregue a página e refaça suas alterações.",
+                code="stale",
+            )
+        return cleaned_data
@@ -4,8 +4,10 @@ from django import forms
 
 from scrum_app.models import Task, TaskComment
 
+from .mixins import VersionCheckMixin
 
-class TaskForm(forms.ModelForm):
+
+class TaskForm(VersionCheckMixin, forms.ModelForm):
     """Form for creating and editing tasks."""
 
     class Meta:
@@ -1,11 +1,15 @@
 """Forms for UserStory management."""
 
 from django import forms
+from django.core.exceptions import ValidationError
 
 from scrum_app.models import UserStory
+from scrum_app.services.user_story_service import STORY_BULK_LIMIT
 
+from .mixins import VersionCheckMixin
 
-class UserStoryForm(forms.ModelForm):
+
+class UserStoryForm(VersionCheckMixin, forms.ModelForm):
     """Form for creating and editing user stories."""
 
     # pylint: disable=missing-class-docstring
@@ -65,7 +69,7 @@ class UserStoryForm(forms.ModelForm):
         is not yet assigned).
         """
         # Skip the model validation that would normally happen here
-        # The service layer will call full_clean() after assigning the backlog
+        # The database constraints check the backlog when the service saves it
         pass
 
 
@@ -112,3 +116,55 @@ class MoveUserStoryForm(forms.Form):
             )
 
         return cleaned_data
+
+
+class StorySelectionField(forms.Field):
+    """Ids of the stories ticked on a backlog page (repeated values)."""
+
+    widget = forms.MultipleHiddenInput
+    default_error_messages = {
+        "required": "Selecione ao menos uma user story.",
+        "invalid": "Seleção de user stories inválida.",
+        "too_many": "Selecione no máximo %(limit)s user stories.",
+    }
+
+    def to_python(self, value):
+        if not value:
+            return []
+        try:
+            # Repeated ids are harmless: keep the first occurrence
+            return list(dict.fromkeys(int(pk) for pk in value))
+        except (TypeError, ValueError) as exc:
+            raise ValidationError(self.error_messages["invalid"], code="invalid") from exc
+
+    def validate(self, value):
+        super().validate(value)
+        if len(value) > STORY_BULK_LIMIT:
+            raise ValidationError(
+                self.error_messages["too_many"],
+                code="too_many",
+                params={"limit": STORY_BULK_LIMIT},
+            )
+
+
+class BulkMoveUserStoryForm(forms.Form):
+    """Form for moving the stories selected on a backlog page."""
+
+    PRODUCT = "product"
+
+    stories = StorySelectionField()
+    target = forms.ChoiceField(
+        label="Mover selecionadas para",
+        widget=forms.Select(attrs={"class": "form-select form-select-sm"}),
+    )
+
+    def __init__(self, *args, sprints=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sprints = {str(sprint.pk): sprint for sprint in sprints}
+        self.fields["target"].choices = [(self.PRODUCT, "Product Backlog")] + [
+            (pk, str(sprint)) for pk, sprint in self._sprints.items()
+        ]
+
+    def clean_target(self):
+        """The target Sprint, or None for the product backlog."""
+        return self._sprints.get(self.cleaned_data["target"])
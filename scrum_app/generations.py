@@ -0,0 +1,124 @@
+"""
+Cache generation counters.
+
+A generation is an integer stored in the cache for some scope (a project, a
+user story, a backlog, ...) and bumped whenever content under that scope
+changes. Cached content embeds the generation in its key, so invalidating
+everything under a scope is a single cache write and stale entries simply
+age out. Every model in scrum_app.models bumps its project's generation (see
+scrum_app.signals).
+
+The counters live in the shared cache (see CACHES in the settings), so a bump
+made by one worker process, or by a management command, invalidates what
+every other worker cached. A bump stores a new clock value rather than
+calling ``cache.incr()``: several backends implement incr() as a read and a
+rewrite, and two racing increments could bring a counter back to a value
+that stale fragments are still cached under.
+
+Bulk writers wrap their work in ``coalesced_bumps()`` so each scope is
+bumped once at the end instead of once per row.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core.cache import cache
+from django.db import transaction
+
+GENERATION_CACHE_PREFIX = "scrum_app:gen"
+
+# Scopes
+PROJECT = "project"
+STORY = "story"
+PRODUCT_BACKLOG = "product_backlog"
+SPRINT_BACKLOG = "sprint_backlog"
+
+
+def _generation_key(scope, pk):
+    return f"{GENERATION_CACHE_PREFIX}:{scope}:{pk}"
+
+
+# (scope, pk) pairs held back by coalesced_bumps(), None when not coalescing
+_pending_bumps = ContextVar("scrum_app_pending_bumps", default=None)
+
+
+def _new_generation():
+    # Never a value used before, even by another process or for a counter
+    # evicted from the cache: nothing can still be cached under it
+    return time.time_ns()
+
+
+def get_generation(scope, pk):
+    """Current generation of ``scope``/``pk``, creating it on first use."""
+    key = _generation_key(scope, pk)
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, _new_generation(), timeout=None)
+        value = cache.get(key)
+    return value
+
+
+async def aget_generation(scope, pk):
+    """get_generation() for async views."""
+    key = _generation_key(scope, pk)
+    value = await cache.aget(key)
+    if value is None:
+        await cache.aadd(key, _new_generation(), timeout=None)
+        value = await cache.aget(key)
+    return value
+
+
+def _renew(scope, pks):
+    cache.set_many(
+        {_generation_key(scope, pk): _new_generation() for pk in pks}, timeout=None
+    )
+
+
+def bump_generation(scope, *pks):
+    """
+    Invalidate everything cached under the given ``scope`` objects.
+
+    Bumps now and again once the transaction commits, so a request that
+    cached the pre-commit state in between is invalidated too.
+    """
+    pks = {pk for pk in pks if pk is not None}
+    if not pks:
+        return
+    pending = _pending_bumps.get()
+    if pending is not None:
+        pending.update((scope, pk) for pk in pks)
+        return
+    _renew(scope, pks)
+    transaction.on_commit(lambda: _renew(scope, pks))
+
+
+@contextmanager
+def coalesced_bumps():
+    """
+    Hold back generation bumps until the block exits, then bump each scope
+    once. Nested blocks join the outermost one.
+    """
+    if _pending_bumps.get() is not None:
+        yield
+        return
+
+    pending = set()
+    token = _pending_bumps.set(pending)
+    try:
+        yield
+    finally:
+        # Flush even on errors: part of the writes may already be committed
+        _pending_bumps.reset(token)
+        by_scope = {}
+        for scope, pk in pending:
+            by_scope.setdefault(scope, set()).add(pk)
+        for scope, pks in by_scope.items():
+            bump_generation(scope, *pks)
+
+
+def backlog_scope(product_backlog_id=None, sprint_backlog_id=None):
+    """(scope, pk) of the backlog holding a story."""
+    if product_backlog_id is not None:
+        return PRODUCT_BACKLOG, product_backlog_id
+    return SPRINT_BACKLOG, sprint_backlog_id
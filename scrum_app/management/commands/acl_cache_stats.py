@@ -0,0 +1,27 @@
+"""
+Django management command to inspect the project ACL cache counters.
+"""
+
+from django.core.management.base import BaseCommand
+
+from scrum_app.access import acl_cache_stats, reset_acl_cache_stats
+
+
+# pylint: disable=missing-class-docstring
+class Command(BaseCommand):
+    help = "Show hit/miss counters of the project ACL cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset", action="store_true", help="Zero the counters after printing"
+        )
+
+    def handle(self, *args, **options):
+        stats = acl_cache_stats()
+        self.stdout.write(
+            f"hits: {stats['hits']}  misses: {stats['misses']}  "
+            f"hit ratio: {stats['hit_ratio']:.1%}"
+        )
+        if options["reset"]:
+            reset_acl_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
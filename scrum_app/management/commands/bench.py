@@ -0,0 +1,461 @@
+"""
+Django management command benchmarking the pages and endpoints of urls.py.
+
+For each scale a populate_db dataset with a fixed seed is built once into its
+own SQLite file under ``--data-dir`` and reused by later runs. Every run works
+on a fresh copy of it, so the write endpoints never change the dataset and
+runs stay comparable. Routes are requested through the test ``Client`` (no
+server or network): one warm-up request, then ``--requests`` timed ones. Each
+route records p50/p95/p99 latency, queries and DB time per request (median)
+and the response size. Results go to a JSON file; ``--compare`` flags the
+routes that got slower or run more queries than in a saved result.
+
+Not benchmarked: the admin, login/logout/register, the delete endpoints
+(task_comment_delete included), sprint_close, project_add_member and
+project_remove_member (one-way changes that cannot alternate), the SSE
+streams (WSGI answers them with 204) and the forms' POSTs creating rows.
+"""
+
+import json
+import shutil
+import statistics
+import time
+from collections import Counter
+from io import StringIO
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count, Exists, OuterRef, Q
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from scrum_app.management.commands.populate_db import SCALES
+from scrum_app.models import Project, Sprint, Task, UserStory
+from scrum_app.querybudget import record_queries
+
+# Latency changes smaller than this are noise, whatever the ratio
+MIN_LATENCY_DELTA_MS = 1.0
+
+# Process-local cache the benchmark runs on, never the configured one
+BENCH_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "scrum-bench",
+    }
+}
+
+
+def _percentiles(samples):
+    """(p50, p95, p99) of ``samples`` in milliseconds."""
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return value, value, value
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000
+
+
+def find_fixture():
+    """
+    Objects the routes are requested on, from the current database.
+
+    The project with the largest product backlog (among those with a
+    sprint) and its owner, who browses as a member of every route's project.
+    Returns None when the database holds no such project.
+    """
+    project = (
+        Project.objects.filter(Exists(Sprint.objects.filter(project=OuterRef("pk"))))
+        .annotate(
+            stories=Count(
+                "user_stories", filter=Q(user_stories__product_backlog__isnull=False)
+            )
+        )
+        .select_related("owner")
+        .order_by("-stories", "pk")
+        .first()
+    )
+    if project is None:
+        return None
+
+    sprints = project.sprints.all()
+    sprint = sprints.filter(status=Sprint.Status.ACTIVE).first() or sprints.first()
+    story = (
+        UserStory.objects.filter(project=project)
+        .annotate(task_count=Count("tasks"))
+        .order_by("-task_count", "pk")
+        .first()
+    )
+    return {
+        "user": project.owner,
+        "project": project,
+        "sprint": sprint,
+        "story": story,
+        "tasks": list(
+            Task.objects.filter(user_story=story)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        ),
+        "backlog": list(
+            UserStory.objects.filter(product_backlog__project=project)
+            .order_by("position", "pk")
+            .values_list("pk", flat=True)
+        ),
+    }
+
+
+def build_routes(fixture):
+    """
+    (name, method, url, data) of every benchmarked route.
+
+    ``data`` is None for GETs, else a callable giving the POST data of the
+    n-th request; writes alternate between two states so every request
+    really writes.
+    """
+    project, sprint, story = fixture["project"], fixture["sprint"], fixture["story"]
+    tasks, backlog = fixture["tasks"], fixture["backlog"]
+    statuses = Task.Status.values
+
+    def get(name, *args):
+        return (name, "GET", reverse(name, args=args), None)
+
+    routes = [
+        get("home"),
+        get("project_list"),
+        get("project_create"),
+        get("project_detail", project.pk),
+        get("project_update", project.pk),
+        get("project_members", project.pk),
+        get("sprint_list", project.pk),
+        get("sprint_create", project.pk),
+        get("sprint_detail", sprint.pk),
+        get("sprint_update", sprint.pk),
+        get("product_backlog", project.pk),
+        get("user_story_create_product", project.pk),
+        get("sprint_backlog", sprint.pk),
+        get("user_story_create_sprint", sprint.pk),
+        get("user_story_detail", story.pk),
+        get("user_story_update", story.pk),
+        get("user_story_move", story.pk),
+        get("task_kanban", story.pk),
+        get("task_create", story.pk),
+    ]
+    routes.append(
+        (
+            "task_kanban_more",
+            "GET",
+            reverse("task_kanban_more", args=[story.pk, statuses[0]]) + "?offset=0",
+            None,
+        )
+    )
+    if tasks:
+        routes += [
+            get("task_detail", tasks[0]),
+            get("task_update", tasks[0]),
+            get("task_kanban_card", tasks[0]),
+            (
+                "task_update_status",
+                "POST",
+                reverse("task_update_status", args=[tasks[0]]),
+                lambda n: {"status": statuses[n % len(statuses)]},
+            ),
+            (
+                "task_bulk_update_status",
+                "POST",
+                reverse("task_bulk_update_status", args=[story.pk]),
+                lambda n: {
+                    "task": tasks[:2],
+                    "status": [statuses[(n + 1) % len(statuses)]] * len(tasks[:2]),
+                },
+            ),
+        ]
+    if len(backlog) >= 3:
+        # Toggle the second story between the start and the end of the
+        # backlog, and the third between the product backlog and the sprint
+        first, moved, last = backlog[0], backlog[1], backlog[-1]
+        routes += [
+            (
+                "user_story_reorder",
+                "POST",
+                reverse("user_story_reorder", args=[moved]),
+                lambda n: {"after": first} if n % 2 else {"before": last},
+            ),
+            (
+                "user_story_move",
+                "POST",
+                reverse("user_story_move", args=[backlog[2]]),
+                lambda n: (
+                    {"move_to": "product"}
+                    if n % 2
+                    else {"move_to": "sprint", "sprint": sprint.pk}
+                ),
+            ),
+        ]
+    if len(backlog) >= 5:
+        # Two more stories toggle between the backlogs as a selection, and
+        # the first two have their priority and points edited back and forth
+        selected, edited = backlog[3:5], backlog[:2]
+        routes += [
+            (
+                "user_story_bulk_move",
+                "POST",
+                reverse("user_story_bulk_move", args=[project.pk]),
+                lambda n: {
+                    "stories": selected,
+                    "target": "product" if n % 2 else sprint.pk,
+                },
+            ),
+            (
+                "user_story_bulk_edit",
+                "POST",
+                reverse("user_story_bulk_edit", args=[project.pk]),
+                lambda n: {
+                    f"{pk}-{name}": value
+                    for pk in edited
+                    for name, value in (
+                        ("priority", "HIGH" if n % 2 else "LOW"),
+                        ("story_points", 3 if n % 2 else 5),
+                    )
+                },
+            ),
+        ]
+    return routes
+
+
+def measure(client, method, url, data, requests):
+    """Time ``requests`` requests to one route after a warm-up request."""
+    send = client.post if method == "POST" else client.get
+
+    def request(n):
+        return send(url, data(n)) if data else send(url)
+
+    request(0)
+    samples, queries, db_time, sizes, statuses = [], [], [], [], Counter()
+    for n in range(1, requests + 1):
+        with record_queries() as recorder:
+            started = time.perf_counter()
+            response = request(n)
+            samples.append(time.perf_counter() - started)
+        queries.append(recorder.count)
+        db_time.append(recorder.duration)
+        sizes.append(len(response.content))
+        statuses[response.status_code] += 1
+
+    p50, p95, p99 = _percentiles(samples)
+    return {
+        "method": method,
+        "url": url,
+        "status": statuses.most_common(1)[0][0],
+        "errors": sum(count for status, count in statuses.items() if status >= 400),
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3),
+        "queries": statistics.median_low(queries),
+        "db_ms": round(statistics.median(db_time) * 1000, 3),
+        "bytes": statistics.median_low(sizes),
+    }
+
+
+def find_regressions(baseline, current, threshold):
+    """
+    (scale, route, problem) of every route worse than in ``baseline``.
+
+    A route regresses when its p95 grew by more than ``threshold`` (a
+    fraction) and MIN_LATENCY_DELTA_MS, or when it runs more queries.
+    """
+    regressions = []
+    for scale, results in current["scales"].items():
+        before = baseline.get("scales", {}).get(scale, {}).get("routes", {})
+        for name, result in results["routes"].items():
+            base = before.get(name)
+            if base is None:
+                continue
+            slower = result["p95_ms"] - base["p95_ms"]
+            if (
+                result["p95_ms"] > base["p95_ms"] * (1 + threshold)
+                and slower >= MIN_LATENCY_DELTA_MS
+            ):
+                problem = f"p95 {base['p95_ms']:.1f} -> {result['p95_ms']:.1f} ms"
+                regressions.append((scale, name, problem))
+            if result["queries"] > base["queries"]:
+                regressions.append(
+                    (scale, name, f"queries {base['queries']} -> {result['queries']}")
+                )
+    return regressions
+
+
+# pylint: disable=missing-class-docstring
+class Command(BaseCommand):
+    help = "Benchmark every page and endpoint on fixed-seed datasets of several sizes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scales",
+            default="small",
+            help="Comma-separated populate_db scales (default: small)",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=42, help="populate_db seed (default: 42)"
+        )
+        parser.add_argument(
+            "--requests", type=int, default=50, help="Timed requests per route"
+        )
+        parser.add_argument(
+            "--data-dir",
+            default=str(settings.BASE_DIR / ".bench"),
+            help="Where the datasets are built and kept (default: .bench)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="populate_db workers when a dataset must be built",
+        )
+        parser.add_argument(
+            "--output", default="bench.json", help="Results file (default: bench.json)"
+        )
+        parser.add_argument(
+            "--compare", help="Saved results to flag regressions against"
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Allowed p95 growth before flagging, as a fraction (default: 0.2)",
+        )
+
+    # The test client sends "Host: testserver". The datasets get a private
+    # cache: entries are keyed by primary key, and the configured one may be
+    # shared with the running site
+    @override_settings(ALLOWED_HOSTS=["testserver"], CACHES=BENCH_CACHES)
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("The benchmark datasets are SQLite files.")
+        scales = [scale.strip() for scale in options["scales"].split(",") if scale]
+        unknown = sorted(set(scales) - set(SCALES))
+        if unknown:
+            raise CommandError(f"Unknown scale(s): {', '.join(unknown)}")
+        baseline = None
+        if options["compare"]:
+            baseline = json.loads(Path(options["compare"]).read_text(encoding="utf-8"))
+
+        data_dir = Path(options["data_dir"])
+        data_dir.mkdir(parents=True, exist_ok=True)
+        results = {
+            "created_at": timezone.now().isoformat(),
+            "django": django.get_version(),
+            "seed": options["seed"],
+            "requests": max(options["requests"], 1),
+            "scales": {},
+        }
+        original = connection.settings_dict["NAME"]
+        try:
+            for scale in scales:
+                dataset = self.dataset(data_dir, scale, options)
+                run = data_dir / "run.sqlite3"
+                shutil.copyfile(dataset, run)
+                self.use_database(run)
+                results["scales"][scale] = self.bench(scale, results["requests"])
+                self.use_database(original)
+                run.unlink()
+        finally:
+            self.use_database(original)
+
+        Path(options["output"]).write_text(
+            json.dumps(results, indent=2) + "\n", encoding="utf-8"
+        )
+        self.stdout.write(f"\nResults written to {options['output']}")
+
+        if baseline is not None:
+            regressions = find_regressions(baseline, results, options["threshold"])
+            for scale, name, problem in regressions:
+                self.stderr.write(f"REGRESSION {scale} {name}: {problem}")
+            if regressions:
+                raise CommandError(
+                    f"{len(regressions)} regression(s) against {options['compare']}"
+                )
+            self.stdout.write(
+                self.style.SUCCESS(f"No regressions against {options['compare']}")
+            )
+
+    def use_database(self, name):
+        """Point the default connection at another SQLite file."""
+        connection.close()
+        connection.settings_dict["NAME"] = name
+        # Cached ACLs, generations and fragments describe the other file.
+        # Only BENCH_CACHES is active here (see handle())
+        cache.clear()
+
+    def dataset(self, data_dir, scale, options):
+        """Path of the ``scale`` dataset, building it on first use."""
+        path = data_dir / f"{scale}-seed{options['seed']}.sqlite3"
+        if path.exists():
+            return path
+
+        self.stdout.write(f"Building the {scale} dataset (seed {options['seed']})...")
+        building = path.with_suffix(".building")
+        building.unlink(missing_ok=True)
+        original = connection.settings_dict["NAME"]
+        self.use_database(building)
+        try:
+            call_command("migrate", verbosity=0)
+            call_command(
+                "populate_db",
+                scale=scale,
+                seed=options["seed"],
+                workers=options["workers"],
+                stdout=self.stdout if options["verbosity"] > 1 else StringIO(),
+            )
+        finally:
+            self.use_database(original)
+        building.rename(path)
+        return path
+
+    def bench(self, scale, requests):
+        """Measure every route on the current database."""
+        call_command("migrate", verbosity=0)
+        fixture = find_fixture()
+        if fixture is None:
+            raise CommandError(f"The {scale} dataset has no project with a sprint.")
+        user = fixture["user"]
+        # Every permission through a group, like the member/editor groups
+        group, _ = Group.objects.get_or_create(name="bench")
+        group.permissions.set(Permission.objects.all())
+        user.groups.add(group)
+
+        client = Client()
+        client.force_login(user)
+        routes = build_routes(fixture)
+        self.stdout.write(
+            f"\n{scale}: {len(routes)} routes, {requests} requests each, "
+            f"as {user.username}"
+        )
+        self.stdout.write(
+            f"{'route':<30} {'p50':>8} {'p95':>8} {'p99':>8} "
+            f"{'queries':>7} {'db':>8} {'KB':>7}"
+        )
+        measured = {}
+        for name, method, url, data in routes:
+            key = f"{name} {method}" if method == "POST" else name
+            result = measured[key] = measure(client, method, url, data, requests)
+            if result["errors"]:
+                self.stderr.write(f"{key}: {result['errors']} answers >= 400")
+            self.stdout.write(
+                f"{key:<30} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+                f"{result['p99_ms']:>8.1f} {result['queries']:>7} "
+                f"{result['db_ms']:>8.1f} {result['bytes'] / 1024:>7.1f}"
+            )
+        return {
+            "rows": {
+                "projects": Project.objects.count(),
+                "user_stories": UserStory.objects.count(),
+                "tasks": Task.objects.count(),
+            },
+            "routes": measured,
+        }
@@ -0,0 +1,156 @@
+"""
+Django management command comparing the read views under ASGI and WSGI.
+
+Every URL is requested through Django's WSGI and ASGI handlers (the test
+``Client`` and ``AsyncClient``, so no server or network is involved) with the
+same number of requests in flight: WSGI requests run on a thread pool, as a
+threaded WSGI server would, and ASGI requests run as tasks on one event loop.
+The async views run natively under ASGI and through ``async_to_sync`` under
+WSGI. Run it against a populated database (see populate_db).
+"""
+
+import asyncio
+import copy
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.db.models import Q
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from scrum_app.models import Project, Task, UserStory
+
+VIEW_PERMISSIONS = ("scrum_app.view_project", "scrum_app.view_sprint")
+
+
+def _percentiles(samples):
+    """(p50, p99) of ``samples`` in milliseconds."""
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return value, value
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return cuts[49] * 1000, cuts[98] * 1000
+
+
+def _bench_wsgi(cookies, url, requests, concurrency):
+    def timed(_):
+        # Clients are not thread-safe: one per request, sharing the session
+        client = Client()
+        client.cookies = copy.copy(cookies)
+        started = time.perf_counter()
+        response = client.get(url)
+        elapsed = time.perf_counter() - started
+        close_old_connections()
+        return response.status_code, elapsed
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(timed, range(requests)))
+
+
+async def _bench_asgi(client, url, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(url)
+            return response.status_code, time.perf_counter() - started
+
+    return await asyncio.gather(*(timed() for _ in range(requests)))
+
+
+# pylint: disable=missing-class-docstring
+class Command(BaseCommand):
+    help = "Compare p50/p99 latency of the async read views under ASGI and WSGI"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user", help="Username to browse as (default: owner of the first project)"
+        )
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per URL and handler"
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=10, help="Requests in flight"
+        )
+
+    def urls(self, user):
+        """(label, url) of every async read view, on the user's first project."""
+        project = (
+            Project.objects.filter(Q(owner=user) | Q(members__user=user))
+            .order_by("pk")
+            .first()
+        )
+        if project is None:
+            raise CommandError(f'"{user.username}" has no project to browse.')
+        sprint = project.sprints.order_by("pk").first()
+        story = UserStory.objects.filter(project=project).order_by("pk").first()
+        task = Task.objects.filter(project=project).order_by("pk").first()
+
+        urls = [
+            ("project list", reverse("project_list")),
+            ("project detail", reverse("project_detail", args=[project.pk])),
+            ("product backlog", reverse("product_backlog", args=[project.pk])),
+        ]
+        if sprint is not None:
+            urls += [
+                ("sprint detail", reverse("sprint_detail", args=[sprint.pk])),
+                ("sprint backlog", reverse("sprint_backlog", args=[sprint.pk])),
+            ]
+        if story is not None:
+            urls.append(("kanban", reverse("task_kanban", args=[story.pk])))
+        if task is not None:
+            urls.append(("task detail", reverse("task_detail", args=[task.pk])))
+        return urls
+
+    # The test clients send "Host: testserver"
+    @override_settings(ALLOWED_HOSTS=["testserver"])
+    def handle(self, *args, **options):
+        if options["user"]:
+            user = User.objects.filter(username=options["user"]).first()
+        else:
+            first = Project.objects.select_related("owner").order_by("pk").first()
+            user = first.owner if first else None
+        if user is None:
+            raise CommandError("No user to browse as; run populate_db first.")
+        if not user.has_perms(VIEW_PERMISSIONS):
+            raise CommandError(
+                f'"{user.username}" needs {", ".join(VIEW_PERMISSIONS)} '
+                "(e.g. through the member group)."
+            )
+
+        requests = max(options["requests"], 1)
+        concurrency = max(options["concurrency"], 1)
+
+        wsgi = Client()
+        wsgi.force_login(user)
+        asgi = AsyncClient()
+        asgi.cookies = wsgi.cookies
+
+        self.stdout.write(
+            f"{requests} requests per URL, {concurrency} in flight, as {user.username}"
+        )
+        self.stdout.write(
+            f"{'view':<16} {'WSGI p50':>9} {'p99':>9} {'ASGI p50':>9} {'p99':>9}  (ms)"
+        )
+        for label, url in self.urls(user):
+            # Warm the ACL, generation and fragment caches
+            wsgi.get(url)
+            results = {
+                "wsgi": _bench_wsgi(wsgi.cookies, url, requests, concurrency),
+                "asgi": asyncio.run(_bench_asgi(asgi, url, requests, concurrency)),
+            }
+            row = []
+            for name, samples in results.items():
+                failed = sum(1 for status, _ in samples if status != 200)
+                if failed:
+                    self.stderr.write(f"{label}: {failed} non-200 answers under {name}")
+                row.extend(_percentiles([elapsed for _, elapsed in samples]))
+            self.stdout.write(
+                f"{label:<16} {row[0]:>9.1f} {row[1]:>9.1f} {row[2]:>9.1f} {row[3]:>9.1f}"
+            )
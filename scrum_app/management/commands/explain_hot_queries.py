@@ -0,0 +1,209 @@
+"""
+Django management command to print the query plans of the hot request paths.
+
+Each query is built by the same code the views use, then run through
+``QuerySet.explain()``. Plans that scan a whole table or sort through a
+temporary B-tree are flagged, since every hot path is expected to be answered
+by one of the composite indexes. The few ORDER BY sorts no index can serve
+are still printed as warnings, together with the reason they are accepted,
+but do not count as flagged.
+"""
+
+import re
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from scrum_app.access import ProjectAccess
+from scrum_app.models import Project, Sprint, Task, TaskComment, UserStory
+from scrum_app.pagination import KeysetPaginator
+from scrum_app.services.project_service import ProjectService
+from scrum_app.services.task_service import TaskService
+from scrum_app.services.user_story_service import UserStoryService
+
+# Plan steps that mean an index did not cover the query
+FULL_SCAN = re.compile(r"\bSCAN (?P<source>\S+)(?!.*\bUSING\b)")
+# Intermediate results (subqueries, window passes) may be scanned freely
+INTERMEDIATE = re.compile(r"\b(?:CO-ROUTINE|MATERIALIZE) (?P<source>\S+)")
+TEMP_SORT = "USE TEMP B-TREE FOR"
+
+
+def _first(model):
+    """Some existing row (or an unsaved stand-in with pk=1)."""
+    return model.objects.order_by("pk").first() or model(pk=1)
+
+
+def _deep_queryset(queryset, ordering):
+    """Seek query for the page after the first row, as a later page runs."""
+    paginator = KeysetPaginator(queryset, ordering)
+    anchor = paginator.build_queryset().first()
+    cursor = paginator.cursor_for(anchor) if anchor else None
+    return paginator.build_queryset(cursor)
+
+
+def _explain(queryset):
+    """
+    Query plan of ``queryset``.
+
+    Runs the compiled SQL under the backend's EXPLAIN prefix instead of
+    ``QuerySet.explain()``, which cannot wrap queries that filter on a window
+    function (the Kanban board).
+    """
+    connection = connections[queryset.db]
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+        return "\n".join(
+            " ".join(str(column) for column in row) for row in cursor.fetchall()
+        )
+
+
+def _plan_warnings(plan, sort_reason=None):
+    """(flagged steps, accepted sort steps) of ``plan``."""
+    flagged, accepted = [], []
+    intermediate = {match["source"] for match in INTERMEDIATE.finditer(plan)}
+    for step in plan.splitlines():
+        scan = FULL_SCAN.search(step)
+        if scan and scan["source"] not in intermediate:
+            flagged.append(step)
+        elif TEMP_SORT in step:
+            if sort_reason and "ORDER BY" in step:
+                accepted.append(step)
+            else:
+                flagged.append(step)
+    return flagged, accepted
+
+
+# pylint: disable=missing-class-docstring
+class Command(BaseCommand):
+    help = "EXPLAIN the hot queries and flag full scans and temporary sorts"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--strict",
+            action="store_true",
+            help="Exit with an error when any plan is flagged",
+        )
+
+    def hot_queries(self):
+        """
+        (label, queryset, sort_reason) for every hot path.
+
+        ``sort_reason`` explains why the query's ORDER BY may sort through a
+        temporary B-tree: no index can produce its order, and it only ever
+        sorts a small, already filtered set. None for every other query.
+        """
+        user = _first(User)
+        project = _first(Project)
+        sprint = _first(Sprint)
+        story = _first(UserStory)
+        task = _first(Task)
+
+        product_backlog = getattr(project, "product_backlog", None)
+        sprint_backlog = getattr(sprint, "sprint_backlog", None)
+
+        queries = [
+            (
+                "project list",
+                ProjectService.get_user_projects(user),
+                "sorts only the user's own projects, gathered from two indexes",
+            ),
+            ("project ACL", ProjectAccess(user)._rows_query(), None),
+            (
+                "project members page",
+                _deep_queryset(
+                    project.members.select_related("user"), ["joined_at", "id"]
+                ),
+                None,
+            ),
+            (
+                "sprint list page",
+                _deep_queryset(
+                    project.sprints.all(), ["-start_date", "-created_at", "-id"]
+                ),
+                None,
+            ),
+            (
+                "active sprint check",
+                Sprint.objects.filter(
+                    project=project, status=Sprint.Status.ACTIVE
+                ).order_by(),
+                None,
+            ),
+            (
+                "kanban board",
+                TaskService.kanban_board_queryset(story),
+                "the window functions sort the tasks of one user story only",
+            ),
+            (
+                "kanban column",
+                TaskService.kanban_column_queryset(story, Task.Status.TODO),
+                None,
+            ),
+            (
+                "task comments",
+                TaskComment.objects.filter(task=task).order_by("created_at"),
+                None,
+            ),
+        ]
+        if product_backlog is not None:
+            queries.append(
+                (
+                    "product backlog page",
+                    _deep_queryset(
+                        product_backlog.user_stories.all(),
+                        UserStoryService.BACKLOG_ORDERING,
+                    ),
+                    None,
+                )
+            )
+            queries.append(
+                (
+                    "product backlog page (manual order)",
+                    _deep_queryset(
+                        product_backlog.user_stories.all(),
+                        UserStoryService.POSITION_ORDERING,
+                    ),
+                    None,
+                )
+            )
+        if sprint_backlog is not None:
+            queries.append(
+                (
+                    "sprint backlog page",
+                    _deep_queryset(
+                        sprint_backlog.user_stories.all(),
+                        UserStoryService.BACKLOG_ORDERING,
+                    ),
+                    None,
+                )
+            )
+        return queries
+
+    def handle(self, *args, **options):
+        flagged = 0
+        accepted_sorts = 0
+        for label, queryset, sort_reason in self.hot_queries():
+            plan = _explain(queryset)
+            warnings, accepted = _plan_warnings(plan, sort_reason)
+            flagged += bool(warnings)
+            accepted_sorts += bool(accepted)
+
+            style = self.style.WARNING if warnings or accepted else self.style.SUCCESS
+            self.stdout.write(style(f"== {label}"))
+            self.stdout.write(plan)
+            for warning in warnings:
+                self.stdout.write(self.style.WARNING(f"   !! {warning}"))
+            for step in accepted:
+                self.stdout.write(
+                    self.style.WARNING(f"   ~~ {step} (accepted: {sort_reason})")
+                )
+            self.stdout.write("")
+
+        if flagged and options["strict"]:
+            raise CommandError(f"{flagged} hot queries are not fully indexed.")
+        self.stdout.write(
+            f"{flagged} hot queries flagged, "
+            f"{accepted_sorts} with an accepted temporary sort."
+        )
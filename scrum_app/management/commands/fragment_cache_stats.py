@@ -0,0 +1,31 @@
+"""
+Django management command to inspect the template fragment cache counters.
+"""
+
+from django.core.management.base import BaseCommand
+
+from scrum_app.templatetags.fragment_cache import (
+    fragment_cache_stats,
+    reset_fragment_cache_stats,
+)
+
+
+# pylint: disable=missing-class-docstring
+class Command(BaseCommand):
+    help = "Show hit/miss counters and render time saved by the fragment cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset", action="store_true", help="Zero the counters after printing"
+        )
+
+    def handle(self, *args, **options):
+        stats = fragment_cache_stats()
+        self.stdout.write(
+            f"hits: {stats['hits']}  misses: {stats['misses']}  "
+            f"hit ratio: {stats['hit_ratio']:.1%}  "
+            f"render time saved: {stats['saved_seconds']:.3f}s"
+        )
+        if options["reset"]:
+            reset_fragment_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
@@ -0,0 +1,526 @@
+"""
+Django management command putting the WSGI application under concurrent load.
+
+Workers (threads, or processes with their own database connections, like
+the workers of a WSGI server) call ``scrum_flow.wsgi.application`` directly
+with hand-built WSGI environs: no server and no network, but the whole
+middleware stack, sessions and CSRF included. Each worker draws requests
+from the ``--mix`` of read and write operations with a random generator
+seeded from ``(--seed, worker)``, so a seed always replays the same request
+sequence. Run it against a populated database (see populate_db); the writes
+are real.
+
+Reported: requests per second, latency per operation and as a histogram,
+errors by kind and the time SQL statements spent in the database, split into
+reads and writes. Executing a write statement takes microseconds, so the
+write time is almost all SQLite's busy handler waiting for another
+connection's lock.
+"""
+
+import json
+import random
+import re
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO, StringIO
+from urllib.parse import urlencode
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import Group, Permission
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import got_request_exception
+from django.db import OperationalError, connection, connections
+from django.db.models import Count, Exists, OuterRef
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils.crypto import get_random_string
+
+from scrum_app.models import Project, Sprint, Task, UserStory
+
+HOST = "testserver"
+CSRF_TOKEN = get_random_string(32)
+
+DEFAULT_MIX = (
+    "kanban=25,task_detail=15,product_backlog=15,sprint_backlog=10,"
+    "project_detail=5,drag_card=20,comment=7,reorder=3"
+)
+# Upper bounds (ms) of the latency histogram buckets
+HISTOGRAM_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_WRITE_SQL = re.compile(r"\s*(INSERT|UPDATE|DELETE|REPLACE|BEGIN\s+IMMEDIATE)\b", re.I)
+
+
+# Operations: (method, path, POST data) of one request on a target project
+
+
+def _kanban(rng, target):
+    return "GET", reverse("task_kanban", args=[rng.choice(target["stories"])]), None
+
+
+def _task_detail(rng, target):
+    return "GET", reverse("task_detail", args=[rng.choice(target["tasks"])]), None
+
+
+def _product_backlog(rng, target):
+    return "GET", reverse("product_backlog", args=[target["project"]]), None
+
+
+def _sprint_backlog(rng, target):
+    return "GET", reverse("sprint_backlog", args=[rng.choice(target["sprints"])]), None
+
+
+def _project_detail(rng, target):
+    return "GET", reverse("project_detail", args=[target["project"]]), None
+
+
+def _drag_card(rng, target):
+    url = reverse("task_update_status", args=[rng.choice(target["tasks"])])
+    return "POST", url, {"status": rng.choice(Task.Status.values)}
+
+
+def _comment(rng, target):
+    url = reverse("task_detail", args=[rng.choice(target["tasks"])])
+    return "POST", url, {"content": f"Comentário de carga {rng.randrange(10**6)}"}
+
+
+def _reorder(rng, target):
+    story, neighbour = rng.sample(target["backlog"], 2)
+    url = reverse("user_story_reorder", args=[story])
+    return "POST", url, {rng.choice(("before", "after")): neighbour}
+
+
+# name -> (operation, is a write, permission it needs)
+OPERATIONS = {
+    "kanban": (_kanban, False, None),
+    "task_detail": (_task_detail, False, None),
+    "product_backlog": (_product_backlog, False, None),
+    "sprint_backlog": (_sprint_backlog, False, None),
+    "project_detail": (_project_detail, False, "scrum_app.view_project"),
+    "drag_card": (_drag_card, True, None),
+    "comment": (_comment, True, None),
+    "reorder": (_reorder, True, None),
+}
+
+
+def parse_mix(text):
+    """``"name=weight,..."`` -> list of (operation name, weight)."""
+    mix = []
+    for item in text.split(","):
+        name, _, weight = item.strip().partition("=")
+        if name not in OPERATIONS:
+            raise CommandError(
+                f'Unknown operation "{name}"; choose from {", ".join(OPERATIONS)}'
+            )
+        try:
+            mix.append((name, float(weight or 1)))
+        except ValueError as exc:
+            raise CommandError(f'Invalid weight in "{item}"') from exc
+    if not any(weight > 0 for _, weight in mix):
+        raise CommandError("The mix needs an operation with a positive weight.")
+    return mix
+
+
+class SqlTimer:
+    """``execute_wrapper`` adding up statement time, reads and writes apart."""
+
+    def __init__(self):
+        self.read = 0.0
+        self.write = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            if _WRITE_SQL.match(sql):
+                self.write += elapsed
+            else:
+                self.read += elapsed
+
+
+# The exception of the request being handled by each thread
+_failures = threading.local()
+
+
+def _remember_exception(sender, request=None, **kwargs):
+    """got_request_exception receiver; it runs inside the handler's except block."""
+    exc = sys.exc_info()[1]
+    if isinstance(exc, OperationalError) and "locked" in str(exc):
+        _failures.error = "database is locked"
+    else:
+        _failures.error = type(exc).__name__ if exc is not None else "unknown"
+
+
+def _environ(method, path, session, data, processes):
+    body = urlencode(data or {}, doseq=True).encode()
+    return {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": HOST,
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "REMOTE_ADDR": "127.0.0.1",
+        "HTTP_HOST": HOST,
+        "HTTP_COOKIE": (
+            f"{settings.SESSION_COOKIE_NAME}={session}; "
+            f"{settings.CSRF_COOKIE_NAME}={CSRF_TOKEN}"
+        ),
+        settings.CSRF_HEADER_NAME: CSRF_TOKEN,
+        "CONTENT_TYPE": "application/x-www-form-urlencoded",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": StringIO(),
+        "wsgi.multithread": not processes,
+        "wsgi.multiprocess": processes,
+        "wsgi.run_once": False,
+    }
+
+
+def _call(application, environ):
+    """Status code of ``application``'s answer to ``environ``, body consumed."""
+    status = []
+
+    def start_response(line, headers, exc_info=None):
+        status.append(int(line.split(" ", 1)[0]))
+
+    result = application(environ, start_response)
+    try:
+        for _ in result:
+            pass
+    finally:
+        if hasattr(result, "close"):
+            result.close()
+    return status[0]
+
+
+def run_worker(worker, plan, deadline):
+    """
+    Send requests until ``deadline`` (a time.time() value).
+
+    Returns:
+        list: (operation, status, seconds, read SQL seconds, write SQL
+        seconds, error kind or None) of every request
+    """
+    # Imported here: building the application runs django.setup()
+    from scrum_flow.wsgi import application  # pylint: disable=import-outside-toplevel
+
+    if plan["processes"]:
+        # This process runs no other code: the override can stay on
+        override_settings(ALLOWED_HOSTS=[HOST]).enable()
+    got_request_exception.connect(
+        _remember_exception, weak=False, dispatch_uid="load_test_errors"
+    )
+    rng = random.Random(f"{plan['seed']}:{worker}")
+    names = [name for name, _ in plan["mix"]]
+    weights = [weight for _, weight in plan["mix"]]
+    timer = SqlTimer()
+    samples = []
+    with connection.execute_wrapper(timer):
+        while time.time() < deadline:
+            name = rng.choices(names, weights)[0]
+            target = rng.choice(plan["targets"])
+            method, path, data = OPERATIONS[name][0](rng, target)
+            environ = _environ(method, path, target["session"], data, plan["processes"])
+
+            _failures.error = None
+            read, write = timer.read, timer.write
+            started = time.perf_counter()
+            status = _call(application, environ)
+            elapsed = time.perf_counter() - started
+            samples.append(
+                (
+                    name,
+                    status,
+                    elapsed,
+                    timer.read - read,
+                    timer.write - write,
+                    _failures.error,
+                )
+            )
+    connection.close()
+    return samples
+
+
+def _percentiles(samples):
+    """(p50, p95, p99) of ``samples`` in milliseconds."""
+    if len(samples) < 2:
+        value = samples[0] * 1000 if samples else 0.0
+        return value, value, value
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000
+
+
+def bound_label(bound):
+    """Histogram bucket label of an upper bound in ms (None: the last one)."""
+    if bound is None:
+        return f"> {HISTOGRAM_BUCKETS[-1]} ms"
+    return f"<= {bound} ms"
+
+
+def summarize(samples, wall_seconds):
+    """Aggregate run_worker() samples into the reported figures."""
+    latencies = [elapsed for _, _, elapsed, *_ in samples]
+    histogram = Counter()
+    for elapsed in latencies:
+        ms = elapsed * 1000
+        bucket = next((bound for bound in HISTOGRAM_BUCKETS if ms <= bound), None)
+        histogram[bound_label(bucket)] += 1
+
+    errors = Counter()
+    for _, status, _, _, _, error in samples:
+        if error is not None:
+            errors[error] += 1
+        elif status == 409:
+            errors["409 version conflict"] += 1
+        elif status >= 400:
+            errors[f"HTTP {status}"] += 1
+
+    operations = {}
+    for name in sorted({sample[0] for sample in samples}):
+        rows = [sample for sample in samples if sample[0] == name]
+        p50, p95, p99 = _percentiles([row[2] for row in rows])
+        operations[name] = {
+            "requests": len(rows),
+            "write": OPERATIONS[name][1],
+            "p50_ms": round(p50, 3),
+            "p95_ms": round(p95, 3),
+            "p99_ms": round(p99, 3),
+            "errors": sum(1 for row in rows if row[5] is not None or row[1] >= 400),
+        }
+
+    p50, p95, p99 = _percentiles(latencies)
+    return {
+        "requests": len(samples),
+        "seconds": round(wall_seconds, 3),
+        "requests_per_second": round(len(samples) / wall_seconds, 2),
+        "p50_ms": round(p50, 3),
+        "p95_ms": round(p95, 3),
+        "p99_ms": round(p99, 3),
+        "read_sql_seconds": round(sum(sample[3] for sample in samples), 3),
+        "write_sql_seconds": round(sum(sample[4] for sample in samples), 3),
+        "errors": dict(errors.most_common()),
+        "histogram": {
+            label: histogram[label]
+            for label in map(bound_label, (*HISTOGRAM_BUCKETS, None))
+        },
+        "operations": operations,
+    }
+
+
+# pylint: disable=missing-class-docstring
+class Command(BaseCommand):
+    help = "Run a concurrent read/write load against the WSGI application"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, default=8, help="Concurrent workers (default: 8)"
+        )
+        parser.add_argument(
+            "--processes",
+            action="store_true",
+            help="Run the workers as processes instead of threads",
+        )
+        parser.add_argument(
+            "--duration", type=float, default=10, help="Seconds of load (default: 10)"
+        )
+        parser.add_argument(
+            "--mix",
+            default=DEFAULT_MIX,
+            help=f"Operation weights, name=weight,... (default: {DEFAULT_MIX})",
+        )
+        parser.add_argument(
+            "--projects",
+            type=int,
+            default=10,
+            help="Projects the load is spread over, largest first (default: 10)",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=42, help="Request sequence seed (default: 42)"
+        )
+        parser.add_argument(
+            "--grant",
+            action="store_true",
+            help='Give the project owners every permission through a "loadtest" group',
+        )
+        parser.add_argument("--output", help="Also write the results to this JSON file")
+
+    # The environs carry "Host: testserver"
+    @override_settings(ALLOWED_HOSTS=[HOST])
+    def handle(self, *args, **options):
+        mix = parse_mix(options["mix"])
+        workers = max(options["workers"], 1)
+        targets = self.targets(options["projects"])
+        self.check_permissions(targets, mix, options["grant"])
+
+        plan = {
+            "seed": options["seed"],
+            "mix": mix,
+            "processes": options["processes"],
+            "targets": [
+                {key: value for key, value in target.items() if key != "user"}
+                for target in targets
+            ],
+        }
+        mode = "processes" if options["processes"] else "threads"
+        self.stdout.write(
+            f"{workers} {mode}, {options['duration']:g}s, "
+            f"{len(targets)} projects, mix {options['mix']}"
+        )
+
+        # Workers open their own connections
+        connections.close_all()
+        deadline = time.time() + options["duration"]
+        started = time.perf_counter()
+        if options["processes"]:
+            # django.setup() for workers started with "spawn" instead of "fork"
+            executor = ProcessPoolExecutor(
+                max_workers=workers, initializer=django.setup
+            )
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers)
+        with executor:
+            runs = executor.map(
+                run_worker, range(workers), [plan] * workers, [deadline] * workers
+            )
+            samples = [sample for run in runs for sample in run]
+        summary = summarize(samples, time.perf_counter() - started)
+        summary["config"] = {
+            "workers": workers,
+            "mode": mode,
+            "duration": options["duration"],
+            "mix": options["mix"],
+            "seed": options["seed"],
+            "database": {
+                key: str(value)
+                for key, value in connection.settings_dict.items()
+                if key in ("ENGINE", "NAME", "CONN_MAX_AGE", "OPTIONS")
+            },
+        }
+        self.report(summary)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                json.dump(summary, output, indent=2)
+                output.write("\n")
+            self.stdout.write(f"\nResults written to {options['output']}")
+
+    def targets(self, count):
+        """
+        The ``count`` projects with most tasks that every operation can use,
+        each with a logged-in session of its owner.
+        """
+        projects = (
+            Project.objects.filter(
+                Exists(Sprint.objects.filter(project=OuterRef("pk")))
+            )
+            .annotate(task_count=Count("tasks"))
+            .filter(task_count__gt=0)
+            .select_related("owner")
+            .order_by("-task_count", "pk")[:count]
+        )
+        targets = []
+        for project in projects:
+            backlog = list(
+                UserStory.objects.filter(product_backlog__project=project)
+                .order_by()
+                .values_list("pk", flat=True)
+            )
+            if len(backlog) < 2:
+                continue
+            client = Client()
+            client.force_login(project.owner)
+            targets.append(
+                {
+                    "user": project.owner,
+                    "session": client.cookies[settings.SESSION_COOKIE_NAME].value,
+                    "project": project.pk,
+                    "sprints": list(
+                        project.sprints.order_by().values_list("pk", flat=True)
+                    ),
+                    "stories": list(
+                        Task.objects.filter(project=project)
+                        .order_by()
+                        .values_list("user_story_id", flat=True)
+                        .distinct()
+                    ),
+                    "tasks": list(
+                        Task.objects.filter(project=project)
+                        .order_by()
+                        .values_list("pk", flat=True)
+                    ),
+                    "backlog": backlog,
+                }
+            )
+        if not targets:
+            raise CommandError(
+                "No project with sprints, tasks and a product backlog; "
+                "run populate_db first."
+            )
+        return targets
+
+    def check_permissions(self, targets, mix, grant):
+        """Make sure every target owner may run every operation of the mix."""
+        needed = {OPERATIONS[name][2] for name, _ in mix} - {None}
+        if not needed:
+            return
+        users = {target["user"].pk: target["user"] for target in targets}
+        if grant:
+            group, _ = Group.objects.get_or_create(name="loadtest")
+            group.permissions.set(
+                Permission.objects.filter(content_type__app_label="scrum_app")
+            )
+            group.user_set.add(*users.values())
+            return
+        missing = [
+            user.username for user in users.values() if not user.has_perms(needed)
+        ]
+        if missing:
+            raise CommandError(
+                f"{', '.join(missing)} need {', '.join(sorted(needed))}; "
+                "pass --grant or add them to a group with it."
+            )
+
+    def report(self, summary):
+        self.stdout.write(
+            f"\n{summary['requests']} requests in {summary['seconds']:.1f}s: "
+            f"{summary['requests_per_second']:.1f} req/s, "
+            f"p50 {summary['p50_ms']:.1f} ms, p95 {summary['p95_ms']:.1f} ms, "
+            f"p99 {summary['p99_ms']:.1f} ms"
+        )
+        self.stdout.write(
+            f"SQL time: reads {summary['read_sql_seconds']:.2f}s, "
+            f"writes {summary['write_sql_seconds']:.2f}s (mostly lock wait)"
+        )
+
+        self.stdout.write(
+            f"\n{'operation':<16} {'requests':>8} {'p50':>8} {'p95':>8} {'p99':>8} "
+            f"{'errors':>7}  (ms)"
+        )
+        for name, row in summary["operations"].items():
+            label = f"{name}{' (w)' if row['write'] else ''}"
+            self.stdout.write(
+                f"{label:<16} {row['requests']:>8} {row['p50_ms']:>8.1f} "
+                f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['errors']:>7}"
+            )
+
+        self.stdout.write("\nLatency histogram")
+        largest = max(summary["histogram"].values()) or 1
+        for label, count in summary["histogram"].items():
+            bar = "#" * round(40 * count / largest)
+            self.stdout.write(f"{label:>10} {count:>7} {bar}".rstrip())
+
+        if summary["errors"]:
+            self.stdout.write("\nErrors")
+            for kind, count in summary["errors"].items():
+                self.stdout.write(self.style.ERROR(f"  {kind}: {count}"))
+        else:
+            self.stdout.write(self.style.SUCCESS("\nNo errors"))
@@ -1,14 +1,37 @@
 """
 Django management command to populate database with fake data for testing.
+
+Rows are generated in memory, a chunk of projects at a time, and written with
+``bulk_create`` in one transaction per chunk. ``bulk_create`` skips ``save()``
+and the signals, so the denormalized columns (``project``, ``priority_rank``,
+``position``) are filled in here and the caches are invalidated at the end.
+
+Generation is CPU-bound (Faker), so ``--workers`` spreads it over a process
+pool while this process stays the only writer. The projects are cut into
+fixed shards, each generated by a Faker seeded from ``(--seed, shard)`` and
+written in shard order. Dates and timestamps are drawn from the same seeded
+Faker and count back from ``--epoch`` instead of the clock, so the same seed
+and epoch give the same rows, timestamps included, whatever the number of
+workers.
 """
 
-from datetime import timedelta
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import UTC, date, datetime, time, timedelta
+from functools import cache
 
+import django
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
 from django.core.management.base import BaseCommand
-from django.utils import timezone
+from django.core.management.color import no_style
+from django.db import connection, transaction
 from faker import Faker
 
+from scrum_app.access import invalidate_user_acl
+from scrum_app.generations import PROJECT, bump_generation, coalesced_bumps
 from scrum_app.models import (
     ProductBacklog,
     Project,
@@ -19,6 +42,280 @@ from scrum_app.models import (
     TaskComment,
     UserStory,
 )
+from scrum_app.positions import keys_between
+
+PASSWORD = "senha123"
+
+# Dataset sizes; explicit --users/--projects/... options override them.
+# "large" is about 1000 projects, 170k user stories and 1M tasks.
+SCALES = {
+    "small": {
+        "users": 10,
+        "projects": 5,
+        "sprints": 3,
+        "stories": 5,
+        "tasks": 5,
+        "comments": 3,
+    },
+    "medium": {
+        "users": 30,
+        "projects": 5,
+        "sprints": 6,
+        "stories": 40,
+        "tasks": 8,
+        "comments": 3,
+    },
+    "large": {
+        "users": 100,
+        "projects": 10,
+        "sprints": 10,
+        "stories": 80,
+        "tasks": 10,
+        "comments": 3,
+    },
+}
+
+# Projects per shard: generated by one worker, written in one transaction
+CHUNK_PROJECTS = 25
+
+# Default --epoch: the generated history ends at midnight (UTC) of this day
+EPOCH = date(2026, 1, 5)
+
+# Cleared by --clear, children first
+POPULATED_MODELS = (
+    TaskComment,
+    Task,
+    UserStory,
+    SprintBacklog,
+    ProductBacklog,
+    Sprint,
+    ProjectMember,
+    Project,
+)
+
+USER_STORY_TITLES = [
+    "Login de usuário",
+    "Cadastro de novo usuário",
+    "Recuperação de senha",
+    "Atualização de perfil",
+    "Upload de avatar",
+    "Busca avançada",
+    "Filtros personalizados",
+    "Exportação de dados",
+    "Notificações por email",
+    "Dashboard interativo",
+    "Relatórios gerenciais",
+    "Integração com API",
+    "Sistema de comentários",
+    "Avaliação por estrelas",
+    "Compartilhamento social",
+]
+
+TASK_TITLES = [
+    "Criar interface",
+    "Implementar lógica",
+    "Escrever testes",
+    "Documentar código",
+    "Revisar código",
+    "Corrigir bugs",
+    "Otimizar performance",
+    "Adicionar validações",
+    "Configurar ambiente",
+    "Deploy em produção",
+]
+
+
+@cache
+def _faker():
+    """This process's Faker; reseeded for every shard."""
+    return Faker("pt_BR")
+
+
+def _moment(fake, start, end):
+    """A seeded point in time between ``start`` and ``end``, to the second."""
+    span = max(int((end - start).total_seconds()), 0)
+    return start + timedelta(seconds=fake.random_int(min=0, max=span))
+
+
+def _timestamps(fake, start, now):
+    """created_at/updated_at of a row created after ``start``."""
+    created_at = _moment(fake, start, now)
+    return {"created_at": created_at, "updated_at": _moment(fake, created_at, now)}
+
+
+def history_start(now, limits):
+    """Earliest project creation time: before the oldest possible sprint."""
+    return now - timedelta(days=30 * limits["sprints"] + 60)
+
+
+def generate_shard(seed, shard, owners, user_count, limits, now):
+    """
+    generate_project() trees of one shard, one per entry of ``owners``.
+
+    Runs in the worker processes; the output depends only on the arguments.
+    """
+    fake = _faker()
+    fake.seed_instance(f"{seed}:{shard}")
+    return [
+        generate_project(fake, owner, user_count, limits, now) for owner in owners
+    ]
+
+
+def generate_project(fake, owner, user_count, limits, now):
+    """
+    Plain-data tree of one project and everything under it.
+
+    Users are referenced by their index in the list of created users, so
+    the tree can be generated before any row exists. Every timestamp falls
+    between the project's creation and ``now``.
+    """
+    today = now.date()
+    created_at = _moment(
+        fake, history_start(now, limits), now - timedelta(days=30 * limits["sprints"])
+    )
+    candidates = [index for index in range(user_count) if index != owner]
+    members = [
+        {"user": user, "joined_at": _moment(fake, created_at, now)}
+        for user in fake.random_elements(
+            elements=candidates,
+            length=fake.random_int(min=0, max=min(3, len(candidates))),
+            unique=True,
+        )
+    ]
+    people = [owner, *(member["user"] for member in members)]
+
+    sprints = []
+    # Create sprints for 60% of projects randomly
+    if fake.boolean(chance_of_getting_true=60):
+        num_sprints = fake.random_int(min=1, max=limits["sprints"])
+        has_active = False
+        for i in range(num_sprints):
+            # Older sprints further in the past
+            start_date = today + timedelta(days=-30 * (num_sprints - i - 1))
+            end_date = start_date + timedelta(days=fake.random_int(min=7, max=21))
+
+            if end_date < today:
+                status = Sprint.Status.CLOSED
+            elif start_date <= today and not has_active:
+                status = Sprint.Status.ACTIVE
+                has_active = True
+            else:
+                status = Sprint.Status.PLANNING
+
+            sprint_times = _timestamps(fake, created_at, now)
+            sprints.append(
+                {
+                    "fields": {
+                        "name": f"Sprint {i + 1}",
+                        "description": fake.sentence(nb_words=10),
+                        "start_date": start_date,
+                        "end_date": end_date,
+                        "status": status,
+                        **sprint_times,
+                    },
+                    "stories": _generate_stories(
+                        fake, people, limits, sprint_times["created_at"], now
+                    ),
+                }
+            )
+
+    return {
+        "fields": {
+            "name": fake.catch_phrase(),
+            "description": fake.text(max_nb_chars=200),
+            "created_at": created_at,
+        },
+        "owner": owner,
+        "members": members,
+        "stories": _generate_stories(fake, people, limits, created_at, now),
+        "sprints": sprints,
+    }
+
+
+def _generate_stories(fake, people, limits, start, now):
+    """User stories of one backlog, with their tasks and comments."""
+    stories = []
+    for _ in range(fake.random_int(min=1, max=limits["stories"])):
+        title = fake.random_element(elements=USER_STORY_TITLES)
+        story_times = _timestamps(fake, start, now)
+        stories.append(
+            {
+                "fields": {
+                    "title": f"{title} - {fake.word()}",
+                    "description": fake.text(max_nb_chars=200),
+                    "as_a": f"Como {fake.job()}",
+                    "i_want": f"Eu quero {fake.sentence(nb_words=5)}",
+                    "so_that": f"Para que eu possa {fake.sentence(nb_words=6)}",
+                    "acceptance_criteria": fake.text(max_nb_chars=150),
+                    "story_points": fake.random_element(elements=[1, 2, 3, 5, 8, 13]),
+                    "priority": fake.random_element(elements=UserStory.Priority.values),
+                    "status": fake.random_element(elements=UserStory.Status.values),
+                    **story_times,
+                },
+                "tasks": [
+                    _generate_task(fake, people, limits, story_times["created_at"], now)
+                    for _ in range(fake.random_int(min=1, max=limits["tasks"]))
+                ],
+            }
+        )
+    return stories
+
+
+def _generate_task(fake, people, limits, start, now):
+    task_times = _timestamps(fake, start, now)
+    return {
+        "fields": {
+            "title": fake.random_element(elements=TASK_TITLES),
+            "description": fake.text(max_nb_chars=150),
+            "status": fake.random_element(elements=Task.Status.values),
+            "priority": fake.random_element(elements=Task.Priority.values),
+            "estimated_hours": (
+                fake.random_element(elements=[0.5, 1, 2, 3, 4, 5, 8])
+                if fake.boolean(chance_of_getting_true=80)
+                else None
+            ),
+            **task_times,
+        },
+        "assignee": (
+            fake.random_element(elements=people)
+            if fake.boolean(chance_of_getting_true=70)
+            else None
+        ),
+        "comments": [
+            {
+                "fields": {
+                    "content": fake.text(max_nb_chars=100),
+                    **_timestamps(fake, task_times["created_at"], now),
+                },
+                "author": fake.random_element(elements=people),
+            }
+            for _ in range(fake.random_int(min=0, max=limits["comments"]))
+        ],
+    }
+
+
+@contextmanager
+def _explicit_timestamps():
+    """
+    Let bulk_create() keep the generated created_at/updated_at values.
+
+    auto_now and auto_now_add overwrite them with the clock, so they are
+    switched off on the populated models for the duration of the block.
+    """
+    fields = [
+        field
+        for model in POPULATED_MODELS
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+    flags = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in flags:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
 
 
 # pylint: disable=no-member, missing-class-docstring
@@ -26,324 +323,313 @@ class Command(BaseCommand):
     help = "Populate database with fake users and projects for testing"
 
     def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            choices=sorted(SCALES),
+            default="small",
+            help="Dataset size profile (default: small); the options below override it",
+        )
         parser.add_argument(
             "--users",
             type=int,
-            default=10,
-            help="Number of users to create (default: 10)",
+            help="Number of users to create (small: 10)",
         )
         parser.add_argument(
             "--projects",
             type=int,
-            default=5,
-            help="Number of projects per user (default: 5)",
+            help="Number of projects per user (small: 5)",
         )
         parser.add_argument(
             "--sprints",
             type=int,
-            default=3,
-            help="Maximum number of sprints per project (default: 3)",
+            help="Maximum number of sprints per project (small: 3)",
         )
         parser.add_argument(
             "--stories",
             type=int,
-            default=5,
-            help="Maximum number of user stories per backlog (default: 5)",
+            help="Maximum number of user stories per backlog (small: 5)",
         )
         parser.add_argument(
             "--tasks",
             type=int,
-            default=5,
-            help="Maximum number of tasks per user story (default: 5)",
+            help="Maximum number of tasks per user story (small: 5)",
         )
         parser.add_argument(
             "--comments",
             type=int,
-            default=3,
-            help="Maximum number of comments per task (default: 3)",
+            help="Maximum number of comments per task (small: 3)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows per INSERT statement (default: 1000)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Processes generating the data (default: 1, no pool)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="Seed for a reproducible dataset (default: random, printed)",
+        )
+        parser.add_argument(
+            "--epoch",
+            type=date.fromisoformat,
+            default=EPOCH,
+            help=(
+                "Day the generated history ends at, as YYYY-MM-DD; sprint "
+                f"statuses are relative to it (default: {EPOCH.isoformat()})"
+            ),
         )
         parser.add_argument(
             "--clear", action="store_true", help="Clear existing data before populating"
         )
 
     def handle(self, *args, **options):
-        fake = Faker("pt_BR")
-        num_users = options["users"]
-        num_projects = options["projects"]
-        max_sprints = options["sprints"]
-        max_stories = options["stories"]
-        max_tasks = options["tasks"]
-        max_comments = options["comments"]
+        # One cache generation bump per touched scope instead of one per row
+        with coalesced_bumps(), _explicit_timestamps():
+            self.populate(**options)
+
+    def populate(self, **options):
+        """Create the fake data described by ``options``."""
+        limits = {
+            name: options[name] if options[name] is not None else default
+            for name, default in SCALES[options["scale"]].items()
+        }
+        self.batch_size = max(options["batch_size"], 1)
+        self.totals = dict.fromkeys(
+            ("projects", "sprints", "stories", "tasks", "comments"), 0
+        )
+        seed = options["seed"]
+        if seed is None:
+            seed = random.randrange(2**32)
+        epoch = options["epoch"]
+        self.stdout.write(f"Seed: {seed}  Epoch: {epoch.isoformat()}")
+        now = datetime.combine(epoch, time.min, tzinfo=UTC)
+        fake = _faker()
+        fake.seed_instance(f"{seed}:users")
 
         if options["clear"]:
             self.stdout.write(self.style.WARNING("Clearing existing data..."))
-            TaskComment.objects.all().delete()
-            Task.objects.all().delete()
-            UserStory.objects.all().delete()
-            SprintBacklog.objects.all().delete()
-            ProductBacklog.objects.all().delete()
-            Sprint.objects.all().delete()
-            ProjectMember.objects.all().delete()
-            Project.objects.all().delete()
-            User.objects.filter(is_superuser=False).delete()
+            self.clear()
             self.stdout.write(self.style.SUCCESS("Data cleared!"))
 
-        # Create users
-        self.stdout.write(f"Creating {num_users} fake users...")
-        users = []
-        for _ in range(num_users):
-            username = fake.user_name()
-            # Ensure unique username
-            while User.objects.filter(username=username).exists():
-                username = fake.user_name()
+        self.stdout.write(f"Creating {limits['users']} fake users...")
+        users = self.create_users(fake, limits["users"], history_start(now, limits))
 
-            user = User.objects.create_user(
-                username=username,
-                email=fake.email(),
-                first_name=fake.first_name(),
-                last_name=fake.last_name(),
-                password="senha123",
+        total = len(users) * limits["projects"]
+        self.stdout.write(f"\nCreating {total} projects...")
+        owners = [
+            index for index in range(len(users)) for _ in range(limits["projects"])
+        ]
+        shards = [
+            (seed, shard, chunk, len(users), limits, now)
+            for shard, chunk in enumerate(
+                owners[start : start + CHUNK_PROJECTS]
+                for start in range(0, total, CHUNK_PROJECTS)
             )
-            users.append(user)
-            self.stdout.write(f"  ✓ Created user: {user.username}")
-
-        # Create projects
-        self.stdout.write(f"\nCreating {num_projects} projects per user...")
-        total_projects = 0
-        projects_list = []
-        for user in users:
-            for _ in range(num_projects):
-                project = Project.objects.create(
-                    name=fake.catch_phrase(),
-                    description=fake.text(max_nb_chars=200),
-                    owner=user,
-                )
-                total_projects += 1
-                projects_list.append(project)
-
-                # Add some random members to the project
-                num_members = fake.random_int(min=0, max=min(3, len(users) - 1))
-                available_users = [u for u in users if u != user]
-                members = fake.random_elements(
-                    elements=available_users, length=num_members, unique=True
-                )
+        ]
+        done = 0
+        for trees in self.generate(shards, options["workers"]):
+            self.write_projects(trees, users)
+            done += len(trees)
+            self.stdout.write(f"  ✓ {done}/{total} projects")
 
-                for member in members:
-                    ProjectMember.objects.create(project=project, user=member)
+        totals = self.totals
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\n✅ Successfully created {len(users)} users, "
+                f"{totals['projects']} projects, "
+                f"{totals['sprints']} sprints, {totals['stories']} user stories, "
+                f"{totals['tasks']} tasks, and {totals['comments']} comments!"
+            )
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"You can login with any username and password: {PASSWORD}"
+            )
+        )
 
-                self.stdout.write(
-                    f'  ✓ Created project "{project.name}" for {user.username} '
-                    f"with {num_members} member(s)"
+    def generate(self, shards, workers):
+        """
+        Yield the generate_shard() output of each of ``shards``, in order.
+
+        With several workers at most two shards per worker are in flight, so
+        generated rows wait in memory only while the writer catches up.
+        """
+        if workers <= 1:
+            for shard in shards:
+                yield generate_shard(*shard)
+            return
+
+        # django.setup() for workers started with "spawn" instead of "fork"
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+            pending = deque()
+            for shard in shards:
+                pending.append(pool.submit(generate_shard, *shard))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def clear(self):
+        """Delete the populated tables without loading their rows."""
+        user_ids = list(User.objects.values_list("pk", flat=True))
+        tables = [model._meta.db_table for model in POPULATED_MODELS]
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sql_flush(no_style(), tables):
+                    cursor.execute(sql)
+            User.objects.filter(is_superuser=False).delete()
+        # The flush sent no signals: drop every cached project ACL
+        invalidate_user_acl(*user_ids)
+
+    def create_users(self, fake, count, joined_before):
+        """Insert ``count`` users sharing one password hash."""
+        # Salted from the seeded Faker too, so the rows are reproducible
+        password = make_password(PASSWORD, salt=fake.lexify("?" * 22))
+        taken = set(User.objects.values_list("username", flat=True))
+        users = []
+        for _ in range(count):
+            username = fake.user_name()
+            while username in taken:
+                username = fake.user_name()
+            taken.add(username)
+            users.append(
+                User(
+                    username=username,
+                    email=fake.email(),
+                    first_name=fake.first_name(),
+                    last_name=fake.last_name(),
+                    password=password,
+                    date_joined=_moment(
+                        fake, joined_before - timedelta(days=365), joined_before
+                    ),
                 )
-
-        # Create sprints for some projects
-        self.stdout.write("\nCreating sprints for projects...")
-        total_sprints = 0
-
-        for project in projects_list:
-            # Create sprints for 60% of projects randomly
-            if fake.boolean(chance_of_getting_true=60):
-                num_sprints = fake.random_int(min=1, max=max_sprints)
-
-                for i in range(num_sprints):
-                    # Generate dates for sprints
-                    # Past sprints for closed/active, future for planning
-                    days_offset = -30 * (
-                        num_sprints - i - 1
-                    )  # Older sprints further in the past
-                    start_date = timezone.now().date() + timedelta(days=days_offset)
-                    end_date = start_date + timedelta(
-                        days=fake.random_int(min=7, max=21)
-                    )
-
-                    # Determine status based on dates
-                    today = timezone.now().date()
-                    if end_date < today:
-                        status = Sprint.Status.CLOSED
-                    elif start_date <= today <= end_date:
-                        status = Sprint.Status.ACTIVE
-                    else:
-                        status = Sprint.Status.PLANNING
-
-                    # Ensure only one active sprint per project
-                    if status == Sprint.Status.ACTIVE:
-                        if Sprint.objects.filter(
-                            project=project, status=Sprint.Status.ACTIVE
-                        ).exists():
-                            status = Sprint.Status.PLANNING
-
-                    Sprint.objects.create(
+            )
+        with transaction.atomic():
+            users = User.objects.bulk_create(users, batch_size=self.batch_size)
+        # Primary keys can be reused after a rollback; never trust old entries
+        invalidate_user_acl(*(user.pk for user in users))
+        return users
+
+    def write_projects(self, trees, users):
+        """Insert a chunk of generate_project() trees in one transaction."""
+        batch_size = self.batch_size
+        with transaction.atomic():
+            projects = Project.objects.bulk_create(
+                [
+                    Project(owner=users[tree["owner"]], **tree["fields"])
+                    for tree in trees
+                ],
+                batch_size=batch_size,
+            )
+            ProjectMember.objects.bulk_create(
+                [
+                    ProjectMember(
                         project=project,
-                        name=f"Sprint {i + 1}",
-                        description=fake.sentence(nb_words=10),
-                        start_date=start_date,
-                        end_date=end_date,
-                        status=status,
+                        user=users[member["user"]],
+                        joined_at=member["joined_at"],
                     )
-                    total_sprints += 1
-
-                self.stdout.write(
-                    f'  ✓ Created {num_sprints} sprint(s) for project "{project.name}"'
-                )
-
-        # Create user stories for product backlogs and sprint backlogs
-        self.stdout.write("\nCreating user stories for backlogs...")
-        total_stories = 0
-
-        user_story_titles = [
-            "Login de usuário",
-            "Cadastro de novo usuário",
-            "Recuperação de senha",
-            "Atualização de perfil",
-            "Upload de avatar",
-            "Busca avançada",
-            "Filtros personalizados",
-            "Exportação de dados",
-            "Notificações por email",
-            "Dashboard interativo",
-            "Relatórios gerenciais",
-            "Integração com API",
-            "Sistema de comentários",
-            "Avaliação por estrelas",
-            "Compartilhamento social",
-        ]
-
-        priorities = [choice[0] for choice in UserStory.Priority.choices]
-        statuses = [choice[0] for choice in UserStory.Status.choices]
-
-        for project in projects_list:
-            # Create product backlog and user stories
-            product_backlog, _ = ProductBacklog.objects.get_or_create(project=project)
-            num_product_stories = fake.random_int(min=1, max=max_stories)
-
-            for _ in range(num_product_stories):
-                title = fake.random_element(elements=user_story_titles)
-                UserStory.objects.create(
-                    title=f"{title} - {fake.word()}",
-                    description=fake.text(max_nb_chars=200),
-                    as_a=f"Como {fake.job()}",
-                    i_want=f"Eu quero {fake.sentence(nb_words=5)}",
-                    so_that=f"Para que eu possa {fake.sentence(nb_words=6)}",
-                    acceptance_criteria=fake.text(max_nb_chars=150),
-                    story_points=fake.random_element(elements=[1, 2, 3, 5, 8, 13]),
-                    priority=fake.random_element(elements=priorities),
-                    status=fake.random_element(elements=statuses),
-                    product_backlog=product_backlog,
-                )
-                total_stories += 1
-
-            # pylint: disable=line-too-long
-            self.stdout.write(
-                f'  ✓ Created {num_product_stories} user stories for product backlog of "{project.name}"'
+                    for project, tree in zip(projects, trees)
+                    for member in tree["members"]
+                ],
+                batch_size=batch_size,
+            )
+            sprints = Sprint.objects.bulk_create(
+                [
+                    Sprint(project=project, **sprint["fields"])
+                    for project, tree in zip(projects, trees)
+                    for sprint in tree["sprints"]
+                ],
+                batch_size=batch_size,
+            )
+            product_backlogs = ProductBacklog.objects.bulk_create(
+                [
+                    ProductBacklog(project=project, created_at=project.created_at)
+                    for project in projects
+                ],
+                batch_size=batch_size,
+            )
+            sprint_backlogs = SprintBacklog.objects.bulk_create(
+                [
+                    SprintBacklog(sprint=sprint, created_at=sprint.created_at)
+                    for sprint in sprints
+                ],
+                batch_size=batch_size,
             )
 
-            # Create user stories for sprint backlogs
-            sprints = project.sprints.all()
-            for sprint in sprints:
-                sprint_backlog, _ = SprintBacklog.objects.get_or_create(sprint=sprint)
-                num_sprint_stories = fake.random_int(min=1, max=max_stories)
-
-                for _ in range(num_sprint_stories):
-                    title = fake.random_element(elements=user_story_titles)
-                    UserStory.objects.create(
-                        title=f"{title} - {fake.word()}",
-                        description=fake.text(max_nb_chars=200),
-                        as_a=f"Como {fake.job()}",
-                        i_want=f"Eu quero {fake.sentence(nb_words=5)}",
-                        so_that=f"Para que eu possa {fake.sentence(nb_words=6)}",
-                        acceptance_criteria=fake.text(max_nb_chars=150),
-                        story_points=fake.random_element(elements=[1, 2, 3, 5, 8, 13]),
-                        priority=fake.random_element(elements=priorities),
-                        status=fake.random_element(elements=statuses),
-                        sprint_backlog=sprint_backlog,
-                    )
-                    total_stories += 1
-
-                # pylint: disable=line-too-long
-                self.stdout.write(
-                    f'  ✓ Created {num_sprint_stories} user stories for sprint backlog of "{sprint.name}"'
-                )
-
-        # Create tasks for user stories
-        self.stdout.write("\nCreating tasks for user stories...")
-        total_tasks = 0
-        total_comments = 0
-
-        task_titles = [
-            "Criar interface",
-            "Implementar lógica",
-            "Escrever testes",
-            "Documentar código",
-            "Revisar código",
-            "Corrigir bugs",
-            "Otimizar performance",
-            "Adicionar validações",
-            "Configurar ambiente",
-            "Deploy em produção",
-        ]
-
-        task_priorities = [choice[0] for choice in Task.Priority.choices]
-        task_statuses = [choice[0] for choice in Task.Status.choices]
-
-        all_user_stories = UserStory.objects.all()
-
-        for user_story in all_user_stories:
-            # Get project to assign tasks to members
-            if user_story.product_backlog:
-                project = user_story.product_backlog.project
-            else:
-                project = user_story.sprint_backlog.sprint.project
-
-            # Get project members
-            member_ids = list(project.members.values_list("user_id", flat=True)) + [
-                project.owner.id
-            ]
-            project_members = User.objects.filter(id__in=member_ids)
-
-            # Create tasks per user story
-            num_tasks = fake.random_int(min=1, max=max_tasks)
-
-            for _ in range(num_tasks):
-                task = Task.objects.create(
-                    user_story=user_story,
-                    title=fake.random_element(elements=task_titles),
-                    description=fake.text(max_nb_chars=150),
-                    assigned_to=(
-                        fake.random_element(elements=list(project_members))
-                        if fake.boolean(chance_of_getting_true=70)
-                        else None
-                    ),
-                    status=fake.random_element(elements=task_statuses),
-                    priority=fake.random_element(elements=task_priorities),
-                    estimated_hours=(
-                        fake.random_element(elements=[0.5, 1, 2, 3, 4, 5, 8])
-                        if fake.boolean(chance_of_getting_true=80)
-                        else None
-                    ),
+            # (backlog kwargs, project, story trees) of every backlog
+            backlogs = []
+            sprint_backlog_iter = iter(sprint_backlogs)
+            for project, backlog, tree in zip(projects, product_backlogs, trees):
+                backlogs.append(
+                    ({"product_backlog": backlog}, project, tree["stories"])
                 )
-                total_tasks += 1
-
-                # Add comments to each task
-                num_comments = fake.random_int(min=0, max=max_comments)
-                for _ in range(num_comments):
-                    TaskComment.objects.create(
-                        task=task,
-                        author=fake.random_element(elements=list(project_members)),
-                        content=fake.text(max_nb_chars=100),
+                for sprint in tree["sprints"]:
+                    backlog = next(sprint_backlog_iter)
+                    backlogs.append(
+                        ({"sprint_backlog": backlog}, project, sprint["stories"])
                     )
-                    total_comments += 1
 
-        self.stdout.write(
-            f"  ✓ Created {total_tasks} tasks with {total_comments} comments"
-        )
+            story_rows = []
+            story_trees = []
+            for backlog, project, stories in backlogs:
+                positions = keys_between(None, None, len(stories))
+                for position, story in zip(positions, stories):
+                    fields = story["fields"]
+                    story_rows.append(
+                        UserStory(
+                            project=project,
+                            position=position,
+                            priority_rank=UserStory.PRIORITY_RANKS[fields["priority"]],
+                            **backlog,
+                            **fields,
+                        )
+                    )
+                    story_trees.append(story)
+            stories = UserStory.objects.bulk_create(story_rows, batch_size=batch_size)
+
+            task_rows = []
+            task_trees = []
+            for story, tree in zip(stories, story_trees):
+                for task in tree["tasks"]:
+                    fields = task["fields"]
+                    assignee = task["assignee"]
+                    task_rows.append(
+                        Task(
+                            user_story=story,
+                            project_id=story.project_id,
+                            assigned_to=None if assignee is None else users[assignee],
+                            priority_rank=Task.PRIORITY_RANKS[fields["priority"]],
+                            **fields,
+                        )
+                    )
+                    task_trees.append(task)
+            tasks = Task.objects.bulk_create(task_rows, batch_size=batch_size)
 
-        self.stdout.write(
-            self.style.SUCCESS(
-                f"\n✅ Successfully created {len(users)} users, {total_projects} projects, "
-                f"{total_sprints} sprints, {total_stories} user stories, "
-                f"{total_tasks} tasks, and {total_comments} comments!"
+            comments = TaskComment.objects.bulk_create(
+                [
+                    TaskComment(
+                        task=task, author=users[comment["author"]], **comment["fields"]
+                    )
+                    for task, tree in zip(tasks, task_trees)
+                    for comment in tree["comments"]
+                ],
+                batch_size=batch_size,
             )
-        )
-        self.stdout.write(
-            self.style.SUCCESS("You can login with any username and password: senha123")
-        )
+
+        bump_generation(PROJECT, *(project.pk for project in projects))
+        people = {tree["owner"] for tree in trees}
+        people.update(member["user"] for tree in trees for member in tree["members"])
+        invalidate_user_acl(*(users[index].pk for index in people))
+        totals = self.totals
+        totals["projects"] += len(projects)
+        totals["sprints"] += len(sprints)
+        totals["stories"] += len(stories)
+        totals["tasks"] += len(tasks)
+        totals["comments"] += len(comments)
@@ -0,0 +1,37 @@
+"""
+Django management command to respace backlog position keys.
+
+Reorders grow the fractional-index keys of scrum_app.positions; a reorder
+that produces a long key already rebalances its own backlog after commit.
+This command is the periodic sweep for anything that slipped through.
+"""
+
+from django.core.management.base import BaseCommand
+
+from scrum_app.positions import REBALANCE_LENGTH
+from scrum_app.services.user_story_service import UserStoryService
+
+
+# pylint: disable=missing-class-docstring
+class Command(BaseCommand):
+    help = "Respace backlog position keys that grew too long"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-length",
+            type=int,
+            default=REBALANCE_LENGTH,
+            help=f"Rebalance backlogs with keys longer than this (default: {REBALANCE_LENGTH})",
+        )
+
+    def handle(self, *args, **options):
+        backlogs = UserStoryService.backlogs_needing_rebalance(options["min_length"])
+        rewritten = 0
+        for lookup in backlogs:
+            rewritten += UserStoryService.rebalance_backlog(**lookup)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebalanced {len(backlogs)} backlogs ({rewritten} stories rewritten)."
+            )
+        )
@@ -0,0 +1,81 @@
+"""Custom middleware for scrum_app."""
+
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .access import ProjectAccess
+from .querybudget import record_queries
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectAccessMiddleware:
+    """
+    Attach a ProjectAccess to every request as ``request.access``.
+
+    Must come after AuthenticationMiddleware. Nothing is queried until a view
+    actually asks an access question. Works in both sync and async chains so
+    async views are not pushed through a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request.access = ProjectAccess(request.user, auser=request.auser)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        request.access = ProjectAccess(request.user, auser=request.auser)
+        return await self.get_response(request)
+
+
+class QueryBudgetMiddleware:
+    """
+    Log query count and DB time per request, flagging N+1 patterns.
+
+    Opt-in through ``SCRUM_QUERY_INSPECTOR``. Requests whose URL name has a
+    budget in ``SCRUM_QUERY_BUDGETS`` and exceed it, or that repeat a query
+    shape ``SCRUM_N_PLUS_ONE_THRESHOLD`` times, are logged as warnings with
+    the template line or view frame issuing the repeated query.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SCRUM_QUERY_INSPECTOR:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with record_queries() as recorder:
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        url_name = match.view_name if match else None
+        budget = settings.SCRUM_QUERY_BUDGETS.get(url_name)
+        over_budget = budget is not None and recorder.count > budget
+
+        level = logging.WARNING if over_budget or recorder.repeated() else logging.DEBUG
+        logger.log(
+            level,
+            "%s %s [%s] budget=%s %s",
+            request.method,
+            request.path,
+            url_name,
+            budget,
+            recorder.report(),
+        )
+
+        if settings.DEBUG:
+            response["X-Query-Count"] = str(recorder.count)
+            response["X-Query-Time-Ms"] = f"{recorder.duration * 1000:.1f}"
+        return response
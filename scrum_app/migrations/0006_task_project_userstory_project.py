@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-16 10:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scrum_app', '0005_task_taskcomment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='project',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tasks', to='scrum_app.project', verbose_name='Projeto'),
+        ),
+        migrations.AddField(
+            model_name='userstory',
+            name='project',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='user_stories', to='scrum_app.project', verbose_name='Projeto'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+"""Backfill UserStory.project and Task.project from the backlog chain."""
+
+from django.db import migrations
+from django.db.models import Max, OuterRef, Subquery
+
+BATCH_SIZE = 1000
+
+
+def _id_batches(queryset):
+    """Yield (low, high) primary-key windows covering the queryset."""
+    last_id = queryset.aggregate(last=Max("pk"))["last"] or 0
+    for low in range(0, last_id + 1, BATCH_SIZE):
+        yield low, low + BATCH_SIZE
+
+
+def backfill_projects(apps, schema_editor):
+    UserStory = apps.get_model("scrum_app", "UserStory")
+    Task = apps.get_model("scrum_app", "Task")
+    ProductBacklog = apps.get_model("scrum_app", "ProductBacklog")
+    SprintBacklog = apps.get_model("scrum_app", "SprintBacklog")
+
+    product_project = ProductBacklog.objects.filter(
+        pk=OuterRef("product_backlog_id")
+    ).values("project_id")[:1]
+    sprint_project = SprintBacklog.objects.filter(
+        pk=OuterRef("sprint_backlog_id")
+    ).values("sprint__project_id")[:1]
+    story_project = UserStory.objects.filter(pk=OuterRef("user_story_id")).values(
+        "project_id"
+    )[:1]
+
+    # Each batch is a single UPDATE committed on its own (atomic = False),
+    # so the SQLite write lock is never held for the whole table.
+    for low, high in _id_batches(UserStory.objects.all()):
+        window = UserStory.objects.filter(pk__gte=low, pk__lt=high, project__isnull=True)
+        window.filter(product_backlog__isnull=False).update(
+            project_id=Subquery(product_project)
+        )
+        window.filter(sprint_backlog__isnull=False).update(
+            project_id=Subquery(sprint_project)
+        )
+
+    for low, high in _id_batches(Task.objects.all()):
+        Task.objects.filter(pk__gte=low, pk__lt=high, project__isnull=True).update(
+            project_id=Subquery(story_project)
+        )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('scrum_app', '0006_task_project_userstory_project'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_projects, migrations.RunPython.noop),
+    ]
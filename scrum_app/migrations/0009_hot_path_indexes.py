@@ -0,0 +1,43 @@
+# Generated by Django 6.0 on 2026-10-16 11:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scrum_app', '0008_alter_task_project_alter_userstory_project'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projectmember',
+            index=models.Index(fields=['project', 'joined_at'], name='member_project_joined_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sprint',
+            index=models.Index(fields=['project', 'start_date', 'created_at'], name='sprint_project_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sprint',
+            index=models.Index(fields=['project', 'status'], name='sprint_project_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user_story', 'status', 'priority', 'created_at'], name='task_story_status_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskcomment',
+            index=models.Index(fields=['task', 'created_at'], name='comment_task_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userstory',
+            index=models.Index(fields=['product_backlog', 'priority', 'created_at'], name='story_product_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userstory',
+            index=models.Index(fields=['sprint_backlog', 'priority', 'created_at'], name='story_sprint_order_idx'),
+        ),
+    ]
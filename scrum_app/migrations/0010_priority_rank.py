@@ -0,0 +1,71 @@
+# Generated by Django 6.0 on 2026-10-16 13:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Frozen copy of {UserStory,Task}.PRIORITY_RANKS (MEDIUM is the column default)
+PRIORITY_RANKS = {"LOW": 1, "MEDIUM": 2, "HIGH": 3, "CRITICAL": 4}
+
+
+def backfill_priority_rank(apps, schema_editor):
+    # One UPDATE per priority value, before the rank indexes are built
+    for model_name in ("UserStory", "Task"):
+        model = apps.get_model("scrum_app", model_name)
+        for priority, rank in PRIORITY_RANKS.items():
+            model.objects.filter(priority=priority).exclude(
+                priority_rank=rank
+            ).update(priority_rank=rank)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scrum_app', '0009_hot_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='task',
+            options={'ordering': ['-priority_rank', 'status', '-created_at'], 'verbose_name': 'Task', 'verbose_name_plural': 'Tasks'},
+        ),
+        migrations.AlterModelOptions(
+            name='userstory',
+            options={'ordering': ['-priority_rank', '-created_at'], 'verbose_name': 'User Story', 'verbose_name_plural': 'User Stories'},
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_story_status_order_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='userstory',
+            name='story_product_order_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='userstory',
+            name='story_sprint_order_idx',
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='priority_rank',
+            field=models.PositiveSmallIntegerField(default=2, editable=False, verbose_name='Ordem de prioridade'),
+        ),
+        migrations.AddField(
+            model_name='userstory',
+            name='priority_rank',
+            field=models.PositiveSmallIntegerField(default=2, editable=False, verbose_name='Ordem de prioridade'),
+        ),
+        migrations.RunPython(backfill_priority_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user_story', 'status', 'priority_rank', 'created_at'], name='task_story_status_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userstory',
+            index=models.Index(fields=['product_backlog', 'priority_rank', 'created_at'], name='story_product_rank_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userstory',
+            index=models.Index(fields=['sprint_backlog', 'priority_rank', 'created_at'], name='story_sprint_rank_idx'),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 6.0 on 2026-10-16 14:10
+
+from django.db import migrations, models
+
+# Frozen copy of scrum_app.positions.keys_between() and its helpers
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+
+def _midpoint(low, high):
+    if high is not None:
+        shared = 0
+        while shared < len(high) and (
+            low[shared] if shared < len(low) else "0"
+        ) == high[shared]:
+            shared += 1
+        if shared:
+            return high[:shared] + _midpoint(low[shared:], high[shared:])
+
+    low_digit = DIGITS.index(low[0]) if low else 0
+    high_digit = DIGITS.index(high[0]) if high is not None else BASE
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit + 1) // 2]
+    if high is not None and len(high) > 1:
+        return high[:1]
+    return DIGITS[low_digit] + _midpoint(low[1:], None)
+
+
+def keys_between(before, after, count):
+    if count <= 0:
+        return []
+    middle = _midpoint(before or "", after)
+    left = count // 2
+    return (
+        keys_between(before, middle, left)
+        + [middle]
+        + keys_between(middle, after, count - left - 1)
+    )
+
+
+def backfill_positions(apps, schema_editor):
+    """Seed each backlog's manual order from its current priority order."""
+    UserStory = apps.get_model("scrum_app", "UserStory")
+
+    for backlog_field in ("product_backlog", "sprint_backlog"):
+        backlog_ids = (
+            UserStory.objects.filter(**{f"{backlog_field}__isnull": False})
+            .order_by()
+            .values_list(backlog_field, flat=True)
+            .distinct()
+        )
+        for backlog_id in backlog_ids:
+            stories = list(
+                UserStory.objects.filter(**{backlog_field: backlog_id})
+                .order_by("-priority_rank", "-created_at", "-id")
+                .only("pk")
+            )
+            for story, key in zip(stories, keys_between(None, None, len(stories))):
+                story.position = key
+            UserStory.objects.bulk_update(stories, ["position"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scrum_app', '0010_priority_rank'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userstory',
+            name='position',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255, verbose_name='Posição'),
+        ),
+        migrations.RunPython(backfill_positions, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='userstory',
+            index=models.Index(fields=['product_backlog', 'position'], name='story_product_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userstory',
+            index=models.Index(fields=['sprint_backlog', 'position'], name='story_sprint_position_idx'),
+        ),
+    ]
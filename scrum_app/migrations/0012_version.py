@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-16 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scrum_app', '0011_userstory_position'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='Versão'),
+        ),
+        migrations.AddField(
+            model_name='userstory',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='Versão'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-16 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scrum_app', '0012_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(max_length=50, verbose_name='Canal')),
+                ('payload', models.JSONField(verbose_name='Dados')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Data de criação')),
+            ],
+            options={
+                'verbose_name': 'Evento de quadro',
+                'verbose_name_plural': 'Eventos de quadro',
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 6.0 on 2026-10-17 00:08
+
+from django.db import migrations, models
+
+
+def repair_invariants(apps, schema_editor):
+    """Fix rows the old Python-side checks let through before constraining."""
+    Sprint = apps.get_model("scrum_app", "Sprint")
+    UserStory = apps.get_model("scrum_app", "UserStory")
+
+    # Keep the most recent ACTIVE sprint of each project, demote the rest
+    kept = set()
+    extra = []
+    active = Sprint.objects.filter(status="ACTIVE").order_by(
+        "project_id", "-start_date", "-created_at", "-pk"
+    )
+    for pk, project_id in active.values_list("pk", "project_id"):
+        if project_id in kept:
+            extra.append(pk)
+        kept.add(project_id)
+    Sprint.objects.filter(pk__in=extra).update(status="PLANNING")
+
+    # A story in both backlogs stays in the sprint it was committed to
+    UserStory.objects.filter(
+        product_backlog__isnull=False, sprint_backlog__isnull=False
+    ).update(product_backlog=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scrum_app', '0013_boardevent'),
+    ]
+
+    operations = [
+        migrations.RunPython(repair_invariants, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='sprint',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'ACTIVE')), fields=('project',), name='sprint_one_active_per_project', violation_error_message='Já existe uma Sprint ativa neste projeto.'),
+        ),
+        migrations.AddConstraint(
+            model_name='userstory',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('product_backlog__isnull', False), ('sprint_backlog__isnull', True)), models.Q(('product_backlog__isnull', True), ('sprint_backlog__isnull', False)), _connector='OR'), name='story_in_exactly_one_backlog', violation_error_message='Uma User Story deve estar em exatamente um backlog (Product Backlog ou Sprint Backlog).'),
+        ),
+    ]
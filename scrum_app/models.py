@@ -1,7 +1,11 @@
 # pylint: disable=missing-module-docstring
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.utils import timezone
+
+from .positions import key_between
 
 
 class Project(models.Model):
@@ -69,6 +73,9 @@ class ProjectMember(models.Model):
         verbose_name_plural = "Membros do Projeto"
         unique_together = ["project", "user"]
         ordering = ["joined_at"]
+        indexes = [
+            models.Index(fields=["project", "joined_at"], name="member_project_joined_idx"),
+        ]
 
     def __str__(self) -> str:
         return (
@@ -112,6 +119,24 @@ class Sprint(models.Model):
         verbose_name = "Sprint"
         verbose_name_plural = "Sprints"
         ordering = ["-start_date", "-created_at"]
+        # Ascending columns: SQLite walks them backwards for the DESC
+        # ordering and the implicit rowid then matches the "-id" tie-break.
+        indexes = [
+            models.Index(
+                fields=["project", "start_date", "created_at"],
+                name="sprint_project_start_idx",
+            ),
+            models.Index(fields=["project", "status"], name="sprint_project_status_idx"),
+        ]
+        constraints = [
+            # Só 1 sprint ACTIVE por projeto, garantido pelo banco
+            models.UniqueConstraint(
+                fields=["project"],
+                condition=Q(status="ACTIVE"),
+                name="sprint_one_active_per_project",
+                violation_error_message="Já existe uma Sprint ativa neste projeto.",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name} - {self.project.name}"
@@ -123,15 +148,9 @@ class Sprint(models.Model):
                 {"end_date": "A data de fim não pode ser anterior à data de início."}
             )
 
-        # opcional (mas bem Scrum): só 1 sprint ACTIVE por projeto
-        if self.status == self.Status.ACTIVE:
-            qs = Sprint.objects.filter(project=self.project, status=self.Status.ACTIVE)
-            if self.pk:
-                qs = qs.exclude(pk=self.pk)
-            if qs.exists():
-                raise ValidationError(
-                    {"status": "Já existe uma Sprint ativa neste projeto."}
-                )
+    def constraint_error(self, name):  # pylint: disable=unused-argument
+        """The form error for a violation of constraint ``name``."""
+        return ValidationError({"status": "Já existe uma Sprint ativa neste projeto."})
 
 
 class ProductBacklog(models.Model):
@@ -176,6 +195,191 @@ class SprintBacklog(models.Model):
         return f"Sprint Backlog - {self.sprint.name}"
 
 
+def _sync_priority_rank(instance, save_kwargs):
+    """
+    Copy ``priority`` into ``priority_rank`` before a save.
+
+    Bulk paths (``bulk_create``/``bulk_update``/``QuerySet.update``) skip
+    save() and must set ``priority_rank`` themselves.
+    """
+    instance.priority_rank = instance.PRIORITY_RANKS[instance.priority]
+    update_fields = save_kwargs.get("update_fields")
+    if update_fields is not None and "priority" in update_fields:
+        save_kwargs["update_fields"] = {*update_fields, "priority_rank"}
+
+
+class VersionConflict(Exception):
+    """A conditional write found the row at another version."""
+
+    def __init__(self, current):
+        super().__init__(f"{current!r} is at version {current.version}")
+        self.current = current
+
+
+def _bump_version(instance, save_kwargs):
+    """
+    Advance ``version`` on every save() of an existing row.
+
+    Bulk paths (``bulk_update``/``QuerySet.update``) skip save() and must
+    advance it themselves when they change editable fields.
+    """
+    if instance._state.adding:  # pylint: disable=protected-access
+        return
+    instance.version += 1
+    update_fields = save_kwargs.get("update_fields")
+    if update_fields is not None:
+        save_kwargs["update_fields"] = {*update_fields, "version"}
+
+
+def violated_constraint(exc, model):
+    """
+    Name of the ``model`` constraint an IntegrityError reports, or None.
+
+    PostgreSQL names the constraint; SQLite names CHECK constraints but
+    reports unique indexes by their columns ("table.column, ...").
+    """
+    message = str(exc)
+    table = model._meta.db_table
+    for constraint in model._meta.constraints:
+        if constraint.name in message:
+            return constraint.name
+        if isinstance(constraint, models.UniqueConstraint) and constraint.fields:
+            columns = ", ".join(
+                f"{table}.{model._meta.get_field(field).column}"
+                for field in constraint.fields
+            )
+            if message.endswith(columns):
+                return constraint.name
+    return None
+
+
+def save_checked(instance, **save_kwargs):
+    """
+    Save ``instance`` and let the database enforce its model's constraints.
+
+    Replaces ``full_clean()`` + ``save()`` on write paths: instead of a
+    validation query before the write (which races with concurrent writers),
+    a violated constraint makes the write fail and comes back as the
+    ValidationError from ``instance.constraint_error()``.
+
+    Raises:
+        ValidationError: If the save violates one of the model's constraints
+    """
+    try:
+        # Savepoint: a failed statement must not break an enclosing transaction
+        with transaction.atomic():
+            instance.save(**save_kwargs)
+    except IntegrityError as exc:
+        name = violated_constraint(exc, type(instance))
+        if name is None:
+            raise
+        raise instance.constraint_error(name) from exc
+
+
+def update_if_current(instance, version, **changes):
+    """
+    Write ``changes`` only if the row is still at ``version``.
+
+    Runs a single ``UPDATE ... WHERE id = %s AND version = %s`` touching the
+    given columns, ``version`` and ``updated_at``; no row lock is taken.
+    Signals are not sent, so callers bump cache generations and publish
+    board events (scrum_app.events) themselves.
+
+    Args:
+        instance: Task or UserStory instance
+        version: Version the caller read
+        **changes: Field values to write
+
+    Returns:
+        The instance, updated in memory
+
+    Raises:
+        VersionConflict: If another write got there first (carries the
+            current row)
+        DoesNotExist: If the row was deleted meanwhile
+    """
+    model = type(instance)
+    if "priority" in changes:
+        changes["priority_rank"] = model.PRIORITY_RANKS[changes["priority"]]
+    changes["updated_at"] = timezone.now()
+
+    updated = model.objects.filter(pk=instance.pk, version=version).update(
+        version=F("version") + 1, **changes
+    )
+    if not updated:
+        raise VersionConflict(model.objects.get(pk=instance.pk))
+
+    for field, value in changes.items():
+        setattr(instance, field, value)
+    instance.version = version + 1
+    return instance
+
+
+def bulk_update_if_current(instances, versions, fields, batch_size=500):
+    """
+    Write ``fields`` of many instances, each only if its row is still at the
+    version the caller read.
+
+    ``bulk_update()`` with the version check of update_if_current() in the
+    WHERE clause: one ``UPDATE ... SET col = CASE id ... WHERE id IN (...)
+    AND version = CASE id ...`` per batch, advancing ``version`` and
+    ``updated_at`` too. No row lock is taken and signals are not sent.
+
+    Args:
+        instances: Task or UserStory instances (one model) holding the new
+            values
+        versions: Mapping of pk -> version the caller read
+        fields: Names of the fields to write
+        batch_size: Most rows per UPDATE
+
+    Returns:
+        set: pks of the rows left alone because another write got there
+        first (or deleted them); the other instances are updated in memory
+    """
+    if not instances:
+        return set()
+    model = type(instances[0])
+    now = timezone.now()
+    written = set()
+    for start in range(0, len(instances), batch_size):
+        batch = instances[start : start + batch_size]
+        pks = [instance.pk for instance in batch]
+        assignments = {}
+        for name in fields:
+            field = model._meta.get_field(name)
+            assignments[name] = Case(
+                *(
+                    When(pk=instance.pk, then=Value(getattr(instance, name), field))
+                    for instance in batch
+                ),
+                output_field=field,
+            )
+        expected = Case(
+            *(When(pk=pk, then=Value(versions[pk])) for pk in pks),
+            output_field=IntegerField(),
+        )
+        count = model.objects.filter(pk__in=pks, version=expected).update(
+            version=F("version") + 1, updated_at=now, **assignments
+        )
+        if count == len(batch):
+            written.update(pks)
+            continue
+        # Our rows are the ones at the next version carrying our timestamp
+        written.update(
+            pk
+            for pk, version, updated_at in model.objects.filter(pk__in=pks)
+            .order_by()
+            .values_list("pk", "version", "updated_at")
+            if version == versions[pk] + 1 and updated_at == now
+        )
+
+    for instance in instances:
+        if instance.pk in written:
+            instance.version = versions[instance.pk] + 1
+            instance.updated_at = now
+    return {instance.pk for instance in instances} - written
+
+
 class UserStory(models.Model):
     """Model representing a user story in the Scrum Flow application."""
 
@@ -185,6 +389,14 @@ class UserStory(models.Model):
         HIGH = "HIGH", "Alta"
         CRITICAL = "CRITICAL", "Crítica"
 
+    # Sortable value of each priority; the text values sort alphabetically
+    PRIORITY_RANKS = {
+        Priority.LOW: 1,
+        Priority.MEDIUM: 2,
+        Priority.HIGH: 3,
+        Priority.CRITICAL: 4,
+    }
+
     class Status(models.TextChoices):
         TODO = "TODO", "A Fazer"
         IN_PROGRESS = "IN_PROGRESS", "Em Progresso"
@@ -232,6 +444,12 @@ class UserStory(models.Model):
         default=Priority.MEDIUM,
         verbose_name="Prioridade",
     )
+    # Kept in sync with ``priority`` by save(); backlogs are ordered by it
+    priority_rank = models.PositiveSmallIntegerField(
+        default=PRIORITY_RANKS[Priority.MEDIUM],
+        editable=False,
+        verbose_name="Ordem de prioridade",
+    )
 
     status = models.CharField(
         max_length=15,
@@ -258,6 +476,29 @@ class UserStory(models.Model):
         blank=True,
     )
 
+    # Denormalized from the backlog chain so access checks are one indexed join
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name="user_stories",
+        verbose_name="Projeto",
+        editable=False,
+    )
+
+    # Fractional-index key (see scrum_app.positions) for manual backlog order
+    position = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name="Posição",
+    )
+
+    # Optimistic concurrency: advanced by every write (see update_if_current)
+    version = models.PositiveIntegerField(
+        default=1, editable=False, verbose_name="Versão"
+    )
+
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Data de criação")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Última atualização")
 
@@ -266,34 +507,99 @@ class UserStory(models.Model):
     class Meta:
         verbose_name = "User Story"
         verbose_name_plural = "User Stories"
-        ordering = ["-priority", "-created_at"]
+        ordering = ["-priority_rank", "-created_at"]
+        indexes = [
+            models.Index(
+                fields=["product_backlog", "priority_rank", "created_at"],
+                name="story_product_rank_idx",
+            ),
+            models.Index(
+                fields=["sprint_backlog", "priority_rank", "created_at"],
+                name="story_sprint_rank_idx",
+            ),
+            models.Index(
+                fields=["product_backlog", "position"], name="story_product_position_idx"
+            ),
+            models.Index(
+                fields=["sprint_backlog", "position"], name="story_sprint_position_idx"
+            ),
+        ]
+        constraints = [
+            # Uma user story está em exatamente um backlog
+            models.CheckConstraint(
+                condition=(
+                    Q(product_backlog__isnull=False, sprint_backlog__isnull=True)
+                    | Q(product_backlog__isnull=True, sprint_backlog__isnull=False)
+                ),
+                name="story_in_exactly_one_backlog",
+                violation_error_message=(
+                    "Uma User Story deve estar em exatamente um backlog "
+                    "(Product Backlog ou Sprint Backlog)."
+                ),
+            ),
+        ]
 
     def __str__(self) -> str:
         return str(self.title)
 
-    def clean(self):
-        # print(self.product_backlog, self.sprint_backlog)
-
-        # Uma user story deve estar em apenas um backlog
-        has_product = self.product_backlog is not None
-        has_sprint = self.sprint_backlog is not None
-
-        if has_product and has_sprint:
-            raise ValidationError(
+    def constraint_error(self, name):  # pylint: disable=unused-argument
+        """The error for a violation of constraint ``name``."""
+        if self.product_backlog_id is not None and self.sprint_backlog_id is not None:
+            return ValidationError(
                 "Uma User Story não pode estar em Product Backlog e Sprint Backlog simultaneamente."
             )
+        return ValidationError(
+            "Uma User Story deve estar associada a um Product Backlog ou Sprint Backlog."
+        )
 
-        # Uma user story deve estar em pelo menos um backlog
-        if not has_product and not has_sprint:
-            raise ValidationError(
-                "Uma User Story deve estar associada a um Product Backlog ou Sprint Backlog."
+    def save(self, *args, **kwargs):
+        if self.project_id is None:
+            self.project_id = self._backlog_project_id()
+        if not self.position:
+            self.place_at_end()
+        _sync_priority_rank(self, kwargs)
+        _bump_version(self, kwargs)
+        super().save(*args, **kwargs)
+
+    def backlog_lookup(self):
+        """Filter kwargs selecting the backlog that holds the story."""
+        if self.product_backlog_id is not None:
+            return {"product_backlog_id": self.product_backlog_id}
+        return {"sprint_backlog_id": self.sprint_backlog_id}
+
+    def place_at_end(self):
+        """Give the story a position after the last story of its backlog."""
+        if self.product_backlog_id is None and self.sprint_backlog_id is None:
+            self.position = key_between()
+            return
+        last = (
+            UserStory.objects.filter(**self.backlog_lookup())
+            .exclude(pk=self.pk)
+            .order_by("-position")
+            .values_list("position", flat=True)
+            .first()
+        )
+        self.position = key_between(last or None, None)
+
+    def _backlog_project_id(self):
+        """Resolve the project through whichever backlog holds the story."""
+        if self.product_backlog_id is not None:
+            return self.product_backlog.project_id
+        if self.sprint_backlog_id is not None:
+            return (
+                SprintBacklog.objects.filter(pk=self.sprint_backlog_id)
+                .values_list("sprint__project_id", flat=True)
+                .first()
             )
+        return None
 
     def move_to_sprint(self, sprint):
         """Move user story from product backlog to sprint backlog."""
         sprint_backlog, _ = SprintBacklog.objects.get_or_create(sprint=sprint)
         self.product_backlog = None
         self.sprint_backlog = sprint_backlog
+        self.project_id = sprint.project_id
+        self.place_at_end()
         self.save()
 
     def move_to_product_backlog(self, project):
@@ -301,6 +607,8 @@ class UserStory(models.Model):
         product_backlog, _ = ProductBacklog.objects.get_or_create(project=project)
         self.sprint_backlog = None
         self.product_backlog = product_backlog
+        self.project = project
+        self.place_at_end()
         self.save()
 
 
@@ -317,6 +625,12 @@ class Task(models.Model):
         MEDIUM = "MEDIUM", "Média"
         HIGH = "HIGH", "Alta"
 
+    PRIORITY_RANKS = {
+        Priority.LOW: 1,
+        Priority.MEDIUM: 2,
+        Priority.HIGH: 3,
+    }
+
     user_story = models.ForeignKey(
         UserStory,
         on_delete=models.CASCADE,
@@ -324,6 +638,15 @@ class Task(models.Model):
         verbose_name="User Story",
     )
 
+    # Copied from user_story.project; stories never change project
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name="tasks",
+        verbose_name="Projeto",
+        editable=False,
+    )
+
     title = models.CharField(max_length=200, verbose_name="Título")
     description = models.TextField(verbose_name="Descrição", blank=True)
 
@@ -349,6 +672,11 @@ class Task(models.Model):
         default=Priority.MEDIUM,
         verbose_name="Prioridade",
     )
+    priority_rank = models.PositiveSmallIntegerField(
+        default=PRIORITY_RANKS[Priority.MEDIUM],
+        editable=False,
+        verbose_name="Ordem de prioridade",
+    )
 
     estimated_hours = models.DecimalField(
         max_digits=5,
@@ -359,6 +687,11 @@ class Task(models.Model):
         help_text="Estimativa de horas para completar a task",
     )
 
+    # Optimistic concurrency: advanced by every write (see update_if_current)
+    version = models.PositiveIntegerField(
+        default=1, editable=False, verbose_name="Versão"
+    )
+
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Data de criação")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Última atualização")
 
@@ -367,11 +700,24 @@ class Task(models.Model):
     class Meta:
         verbose_name = "Task"
         verbose_name_plural = "Tasks"
-        ordering = ["-priority", "status", "-created_at"]
+        ordering = ["-priority_rank", "status", "-created_at"]
+        indexes = [
+            models.Index(
+                fields=["user_story", "status", "priority_rank", "created_at"],
+                name="task_story_status_rank_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return str(self.title)
 
+    def save(self, *args, **kwargs):
+        if self.project_id is None and self.user_story_id is not None:
+            self.project_id = self.user_story.project_id
+        _sync_priority_rank(self, kwargs)
+        _bump_version(self, kwargs)
+        super().save(*args, **kwargs)
+
 
 class TaskComment(models.Model):
     """Model representing a comment on a task."""
@@ -400,7 +746,34 @@ class TaskComment(models.Model):
         verbose_name = "Comentário"
         verbose_name_plural = "Comentários"
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["task", "created_at"], name="comment_task_created_idx"),
+        ]
 
     def __str__(self) -> str:
         # pylint: disable=no-member
         return f"Comentário de {self.author.username} em {self.task.title}"
+
+
+class BoardEvent(models.Model):
+    """
+    Outbox row of a board change event (see scrum_app.events.OutboxBackend).
+
+    Rows are only kept for a few minutes: every worker tails the table by
+    primary key and the oldest rows are pruned as it goes.
+    """
+
+    channel = models.CharField(max_length=50, verbose_name="Canal")
+    payload = models.JSONField(verbose_name="Dados")
+    created_at = models.DateTimeField(
+        auto_now_add=True, db_index=True, verbose_name="Data de criação"
+    )
+
+    objects: models.Manager["BoardEvent"]
+
+    class Meta:
+        verbose_name = "Evento de quadro"
+        verbose_name_plural = "Eventos de quadro"
+
+    def __str__(self) -> str:
+        return f"{self.channel} #{self.pk}"
@@ -0,0 +1,207 @@
+"""Keyset (cursor) pagination."""
+
+import base64
+import json
+from functools import reduce
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+COUNT_EXACT = "exact"
+COUNT_CAPPED = "capped"
+COUNT_NONE = None
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded."""
+
+
+class KeysetPage:
+    """A page of results plus the cursors to reach its neighbours."""
+
+    def __init__(self, object_list, next_cursor, previous_cursor, count, count_is_capped):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+        self.count_is_capped = count_is_capped
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking past the last row seen instead of OFFSET.
+
+    ``ordering`` uses the usual ``order_by`` syntax and must end with a unique
+    column (normally ``id``/``-id``) so that every row has a distinct key; key
+    columns must be NOT NULL. Each page is a single ``WHERE key > cursor
+    ORDER BY key LIMIT n`` that an index on the ordering can answer directly,
+    so page 500 costs the same as page 1.
+
+    ``count_mode`` controls the total shown to users:
+
+    - ``COUNT_EXACT``: a full ``COUNT(*)``;
+    - ``COUNT_CAPPED``: count at most ``count_limit`` rows (rendered as
+      "1000+" when capped);
+    - ``COUNT_NONE``: no count query at all.
+    """
+
+    def __init__(
+        self,
+        queryset,
+        ordering,
+        per_page=10,
+        count_mode=COUNT_EXACT,
+        count_limit=1000,
+    ):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.per_page = per_page
+        self.count_mode = count_mode
+        self.count_limit = count_limit
+        self._keys = [
+            (name.lstrip("-"), name.startswith("-")) for name in self.ordering
+        ]
+
+    # Cursor encoding
+
+    def _key_values(self, obj):
+        # value_to_string keeps full precision (microseconds included)
+        return [
+            self.queryset.model._meta.get_field(name).value_to_string(obj)
+            for name, _ in self._keys
+        ]
+
+    def _encode(self, obj, direction):
+        payload = json.dumps({"d": direction, "k": self._key_values(obj)})
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def _decode(self, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            direction, raw_values = payload["d"], payload["k"]
+            if direction not in ("n", "p") or len(raw_values) != len(self._keys):
+                raise InvalidCursor(cursor)
+            values = [
+                self.queryset.model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(self._keys, raw_values)
+            ]
+        except (ValueError, KeyError, TypeError, ValidationError) as exc:
+            raise InvalidCursor(cursor) from exc
+        return direction, values
+
+    # Query building
+
+    def _seek_filter(self, values, forward):
+        """
+        Rows strictly after (``forward``) or before the given key values.
+
+        Expands the row-value comparison into
+        ``(a > x) OR (a = x AND b > y) OR ...`` honouring per-column direction.
+        """
+        branches = []
+        for i, (name, descending) in enumerate(self._keys):
+            ascending_step = forward != descending
+            lookup = "gt" if ascending_step else "lt"
+            equal = {key: value for (key, _), value in zip(self._keys[:i], values[:i])}
+            branches.append(Q(**equal, **{f"{name}__{lookup}": values[i]}))
+        return reduce(lambda left, right: left | right, branches)
+
+    def _reversed_ordering(self):
+        return [name[1:] if name.startswith("-") else f"-{name}" for name in self.ordering]
+
+    def _count(self):
+        if self.count_mode == COUNT_EXACT:
+            return self.queryset.count(), False
+        if self.count_mode == COUNT_CAPPED:
+            capped = self.queryset.order_by()[: self.count_limit + 1].count()
+            return self._cap(capped)
+        return None, False
+
+    async def _acount(self):
+        if self.count_mode == COUNT_EXACT:
+            return await self.queryset.acount(), False
+        if self.count_mode == COUNT_CAPPED:
+            capped = await self.queryset.order_by()[: self.count_limit + 1].acount()
+            return self._cap(capped)
+        return None, False
+
+    def _cap(self, capped):
+        if capped > self.count_limit:
+            return self.count_limit, True
+        return capped, False
+
+    def _resolve_cursor(self, cursor):
+        """(forward, key values) for a cursor; bad cursors mean page one."""
+        if cursor:
+            try:
+                direction, values = self._decode(cursor)
+                return direction == "n", values
+            except InvalidCursor:
+                pass
+        return True, None
+
+    def build_queryset(self, cursor=None):
+        """The seek-filtered, ordered queryset behind a page (no LIMIT)."""
+        forward, values = self._resolve_cursor(cursor)
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self._seek_filter(values, forward))
+        return queryset.order_by(
+            *(self.ordering if forward else self._reversed_ordering())
+        )
+
+    def cursor_for(self, obj, forward=True):
+        """Cursor of the page that starts right after (or before) ``obj``."""
+        return self._encode(obj, "n" if forward else "p")
+
+    def get_page(self, cursor=None):
+        """
+        Return the page identified by ``cursor``; bad or missing cursors
+        yield the first page.
+        """
+        rows = list(self.build_queryset(cursor)[: self.per_page + 1])
+        return self._make_page(cursor, rows, *self._count())
+
+    async def aget_page(self, cursor=None):
+        """get_page() for async views."""
+        queryset = self.build_queryset(cursor)[: self.per_page + 1]
+        rows = [obj async for obj in queryset]
+        count, count_is_capped = await self._acount()
+        return self._make_page(cursor, rows, count, count_is_capped)
+
+    def _make_page(self, cursor, rows, count, count_is_capped):
+        """KeysetPage from the ``per_page + 1`` rows fetched for ``cursor``."""
+        forward, values = self._resolve_cursor(cursor)
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if not forward:
+            rows.reverse()
+
+        if forward:
+            has_next, has_previous = has_more, values is not None
+        else:
+            has_next, has_previous = True, has_more
+
+        next_cursor = self._encode(rows[-1], "n") if rows and has_next else None
+        previous_cursor = self._encode(rows[0], "p") if rows and has_previous else None
+
+        return KeysetPage(rows, next_cursor, previous_cursor, count, count_is_capped)
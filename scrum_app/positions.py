@@ -0,0 +1,74 @@
+"""
+Fractional-index position keys for manual ordering.
+
+A key is a base-62 string compared byte by byte (``"0" < "9" < "A" < "Z" <
+"a" < "z"``) that never ends in ``"0"``, so there is always room for another
+key on either side of it. Moving an item only rewrites that item's key; keys
+grow by roughly one character every six inserts at the same spot and are
+rewritten evenly by a rebalance once they get too long.
+"""
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+# Keys longer than this trigger a rebalance of their backlog
+REBALANCE_LENGTH = 32
+
+
+def _midpoint(low, high):
+    """Key strictly between ``low`` ("" = start) and ``high`` (None = end)."""
+    if high is not None:
+        # Copy the shared prefix, padding ``low`` with zeros
+        shared = 0
+        while shared < len(high) and (
+            low[shared] if shared < len(low) else "0"
+        ) == high[shared]:
+            shared += 1
+        if shared:
+            return high[:shared] + _midpoint(low[shared:], high[shared:])
+
+    low_digit = DIGITS.index(low[0]) if low else 0
+    high_digit = DIGITS.index(high[0]) if high is not None else BASE
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit + 1) // 2]
+    # Adjacent digits: ``high`` truncated still sorts above ``low``
+    if high is not None and len(high) > 1:
+        return high[:1]
+    return DIGITS[low_digit] + _midpoint(low[1:], None)
+
+
+def key_between(before=None, after=None):
+    """
+    Return a key sorting strictly between ``before`` and ``after``.
+
+    Either bound may be None (start or end of the list).
+
+    Raises:
+        ValueError: if ``before`` does not sort below ``after``
+    """
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"{before!r} must sort before {after!r}")
+    return _midpoint(before or "", after)
+
+
+def keys_between(before, after, count):
+    """
+    Return ``count`` ascending keys between ``before`` and ``after``.
+
+    Keys are placed by bisection, so their length grows with log(count)
+    instead of count; used to append several items and to rebalance.
+    """
+    if count <= 0:
+        return []
+    middle = key_between(before, after)
+    left = count // 2
+    return (
+        keys_between(before, middle, left)
+        + [middle]
+        + keys_between(middle, after, count - left - 1)
+    )
+
+
+def needs_rebalance(key):
+    """True when ``key`` is long enough that its list should be respaced."""
+    return len(key) > REBALANCE_LENGTH
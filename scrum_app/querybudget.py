@@ -0,0 +1,125 @@
+"""
+SQL query accounting per request (query count, DB time, N+1 detection).
+
+``record_queries()`` installs a ``connection.execute_wrapper`` that counts
+every query, times it and groups queries by shape (the SQL with its
+parameters left out). A shape that runs many times in one request is the
+signature of an N+1 pattern; for those the recorder remembers the template
+line or project code frame that issued the query.
+"""
+
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.template.base import Node
+
+APP_DIR = str(Path(__file__).resolve().parent)
+_THIS_FILE = str(Path(__file__).resolve())
+
+# "IN (%s, %s, %s)" and "IN (1, 2)" are the same shape whatever the length
+_IN_LIST = re.compile(r"\bIN \((?:[^()]*)\)", re.IGNORECASE)
+_NUMBER = re.compile(r"\b\d+\b")
+
+
+def query_shape(sql):
+    """Normalize ``sql`` so that queries differing only by values compare equal."""
+    return _NUMBER.sub("?", _IN_LIST.sub("IN (...)", sql))
+
+
+def _query_origin():
+    """Template line or project frame responsible for the current query."""
+    frame = sys._getframe(2)  # pylint: disable=protected-access
+    code_frame = None
+    while frame is not None:
+        node = frame.f_locals.get("self")
+        if isinstance(node, Node) and getattr(node, "origin", None):
+            token = getattr(node, "token", None)
+            line = f":{token.lineno}" if token is not None else ""
+            return f"template {node.origin.template_name}{line}"
+        filename = frame.f_code.co_filename
+        if code_frame is None and filename.startswith(APP_DIR) and filename != _THIS_FILE:
+            code_frame = f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return code_frame or "unknown"
+
+
+class QueryShape:
+    """Every execution of one query shape within a recording."""
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.count = 0
+        self.duration = 0.0
+        self.origins = Counter()
+
+    @property
+    def origin(self):
+        """Where most of the repeats came from."""
+        if not self.origins:
+            return None
+        return ", ".join(
+            f"{origin} ({count}x)" if len(self.origins) > 1 else origin
+            for origin, count in self.origins.most_common(3)
+        )
+
+
+class QueryRecorder:
+    """``execute_wrapper`` callable collecting counts, time and shapes."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+
+            key = query_shape(sql)
+            shape = self.shapes.get(key)
+            if shape is None:
+                shape = self.shapes[key] = QueryShape(sql)
+            shape.count += 1
+            shape.duration += elapsed
+            # Only repeats are traced; one-off queries are not N+1 candidates
+            if shape.count > 1:
+                shape.origins[_query_origin()] += 1
+
+    def repeated(self, threshold=None):
+        """Shapes executed at least ``threshold`` times, most frequent first."""
+        if threshold is None:
+            threshold = settings.SCRUM_N_PLUS_ONE_THRESHOLD
+        return sorted(
+            (shape for shape in self.shapes.values() if shape.count >= threshold),
+            key=lambda shape: shape.count,
+            reverse=True,
+        )
+
+    def report(self, threshold=None):
+        """Human-readable summary, listing suspected N+1 shapes."""
+        lines = [f"{self.count} queries in {self.duration * 1000:.1f} ms"]
+        for shape in self.repeated(threshold):
+            lines.append(
+                f"  N+1? {shape.count}x ({shape.duration * 1000:.1f} ms) "
+                f"from {shape.origin}: {shape.sql[:200]}"
+            )
+        return "\n".join(lines)
+
+
+@contextmanager
+def record_queries(using=DEFAULT_DB_ALIAS):
+    """Record the queries run on connection ``using`` inside the block."""
+    recorder = QueryRecorder()
+    with connections[using].execute_wrapper(recorder):
+        yield recorder
@@ -1,30 +1,31 @@
 """Project member-related business logic."""
 
-from django.core.paginator import Paginator
 from django.db import transaction
 
 from ..models import ProjectMember
+from ..pagination import KeysetPaginator
 
 
 class ProjectMemberService:
     """Service class for project member-related business logic."""
 
     @staticmethod
-    def get_project_members_page(project, page_number, per_page=10):
+    def get_project_members_page(project, cursor, per_page=10):
         """
-        Get paginated project members.
+        Get a page of project members using keyset pagination.
 
         Args:
             project: Project instance
-            page_number: Page number to retrieve
+            cursor: Opaque cursor from a previous page (None for the first)
             per_page: Number of members per page (default: 10)
 
         Returns:
-            Page: Paginated members
+            KeysetPage: Paginated members
         """
-        members_list = list(project.members.select_related("user").all())
-        paginator = Paginator(members_list, per_page)
-        return paginator.get_page(page_number)
+        paginator = KeysetPaginator(
+            project.members.select_related("user"), ["joined_at", "id"], per_page
+        )
+        return paginator.get_page(cursor)
 
     @staticmethod
     @transaction.atomic
@@ -1,27 +1,66 @@
 """Project-related business logic."""
 
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 
-from ..models import Project
+from ..generations import coalesced_bumps
+from ..models import Project, ProjectMember, Sprint, Task, UserStory
+
+
+def _count_per_project(queryset):
+    """Correlated COUNT(*) of ``queryset`` rows for the outer project."""
+    counts = (
+        queryset.filter(project=OuterRef("pk"))
+        .order_by()
+        .values("project")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
 
 
 class ProjectService:
     """Service class for project-related business logic."""
 
+    @staticmethod
+    def with_stats(queryset):
+        """
+        Annotate projects with member, sprint, story and open-task counts.
+
+        Each count is a correlated subquery on the project FK index, so no
+        join fans out the project rows and templates never query again.
+
+        Returns:
+            QuerySet: Projects with ``member_count``, ``sprint_count``,
+            ``story_count`` and ``open_task_count``
+        """
+        return queryset.annotate(
+            member_count=_count_per_project(ProjectMember.objects.all()),
+            sprint_count=_count_per_project(Sprint.objects.all()),
+            story_count=_count_per_project(UserStory.objects.all()),
+            open_task_count=_count_per_project(
+                Task.objects.exclude(status=Task.Status.DONE)
+            ),
+        )
+
     @staticmethod
     def get_user_projects(user):
         """
         Get all projects where the user is owner OR a project member.
 
+        The visible ids come from a UNION of the owner index and the
+        membership index, so the cost follows the user's own project count
+        instead of the size of the project table.
+
         Returns:
-            QuerySet: Projects visible to the user
+            QuerySet: Projects visible to the user, annotated with counts
         """
-        return (
-            Project.objects.filter(Q(owner=user) | Q(members__user=user))
-            .distinct()
-            .order_by("-created_at")
-        )
+        owned = Project.objects.filter(owner=user).order_by().values("pk")
+        joined = ProjectMember.objects.filter(user=user).order_by().values("project")
+        return ProjectService.with_stats(
+            Project.objects.filter(pk__in=owned.union(joined))
+        ).order_by("-created_at")
 
     @staticmethod
     def get_project_by_id(project_id):
@@ -57,7 +96,9 @@ class ProjectService:
         NOTE: Authorization should be enforced in the view.
         """
         project_name = project.name
-        project.delete()
+        # The cascade sends a signal per row; bump each cache scope once
+        with coalesced_bumps():
+            project.delete()
         return project_name
 
     @staticmethod
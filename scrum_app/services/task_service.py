@@ -0,0 +1,232 @@
+"""Task-related business logic."""
+
+from django.db import transaction
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+
+from ..events import publish_tasks_saved
+from ..generations import PROJECT, STORY, bump_generation
+from ..models import (
+    Task,
+    VersionConflict,
+    bulk_update_if_current,
+    update_if_current,
+)
+
+KANBAN_COLUMN_LIMIT = 30
+# Most tasks a single batched status update may move
+TASK_BULK_STATUS_LIMIT = 500
+
+
+class KanbanColumn:
+    """One status column of a Kanban board."""
+
+    def __init__(self, status, label):
+        self.status = status
+        self.label = label
+        self.tasks = []
+        self.count = 0
+
+    @property
+    def has_more(self):
+        """True when the column holds more tasks than were loaded."""
+        return self.count > len(self.tasks)
+
+    @property
+    def next_offset(self):
+        """Offset for the "load more" request."""
+        return len(self.tasks)
+
+
+class TaskService:
+    """Service class for task-related business logic."""
+
+    @staticmethod
+    def _column_ordering():
+        """Task.Meta.ordering within a single status column."""
+        return [F("priority_rank").desc(), F("created_at").desc(), F("pk").desc()]
+
+    @staticmethod
+    def kanban_board_queryset(user_story, per_column=KANBAN_COLUMN_LIMIT):
+        """The single query behind get_kanban_board()."""
+        ordering = TaskService._column_ordering()
+        return (
+            Task.objects.filter(user_story=user_story)
+            .select_related("assigned_to")
+            .annotate(
+                column_position=Window(
+                    RowNumber(), partition_by=[F("status")], order_by=ordering
+                ),
+                column_count=Window(Count("pk"), partition_by=[F("status")]),
+            )
+            .filter(column_position__lte=per_column)
+            .order_by("status", "column_position")
+        )
+
+    @staticmethod
+    def get_kanban_board(user_story, per_column=KANBAN_COLUMN_LIMIT):
+        """
+        Build the Kanban board for a user story with a single query.
+
+        Window functions number the tasks inside each status partition and
+        count the partition, so the query returns at most ``per_column`` cards
+        per column together with the real column totals.
+
+        Args:
+            user_story: UserStory instance
+            per_column: Maximum cards loaded per column
+
+        Returns:
+            dict: Task.Status value -> KanbanColumn, in board order
+        """
+        return TaskService._build_board(
+            TaskService.kanban_board_queryset(user_story, per_column)
+        )
+
+    @staticmethod
+    async def aget_kanban_board(user_story, per_column=KANBAN_COLUMN_LIMIT):
+        """get_kanban_board() for async views."""
+        queryset = TaskService.kanban_board_queryset(user_story, per_column)
+        return TaskService._build_board([task async for task in queryset])
+
+    @staticmethod
+    def _build_board(tasks):
+        """Group the rows of kanban_board_queryset() into columns."""
+        columns = {
+            status: KanbanColumn(status, label) for status, label in Task.Status.choices
+        }
+
+        for task in tasks:
+            column = columns[task.status]
+            column.tasks.append(task)
+            column.count = task.column_count
+
+        return columns
+
+    @staticmethod
+    def get_kanban_column_page(user_story, status, offset, limit=KANBAN_COLUMN_LIMIT):
+        """
+        Get the next cards of a single Kanban column ("load more").
+
+        Args:
+            user_story: UserStory instance
+            status: Task.Status value of the column
+            offset: Number of cards already shown
+            limit: Number of cards to return
+
+        Returns:
+            tuple: (list of tasks, has_more)
+        """
+        queryset = TaskService.kanban_column_queryset(user_story, status)
+        tasks = list(queryset[offset : offset + limit + 1])
+        return tasks[:limit], len(tasks) > limit
+
+    @staticmethod
+    def kanban_column_queryset(user_story, status):
+        """Ordered tasks of one Kanban column."""
+        return (
+            Task.objects.filter(user_story=user_story, status=status)
+            .select_related("assigned_to")
+            .order_by(*TaskService._column_ordering())
+        )
+
+    @staticmethod
+    def get_column_counts(user_story):
+        """
+        Count the tasks of each Kanban column with one aggregate query.
+
+        Args:
+            user_story: UserStory instance
+
+        Returns:
+            dict: Task.Status value -> number of tasks, empty columns included
+        """
+        counts = dict.fromkeys(Task.Status.values, 0)
+        rows = (
+            Task.objects.filter(user_story=user_story)
+            .order_by()
+            .values_list("status")
+            .annotate(total=Count("pk"))
+        )
+        counts.update(rows)
+        return counts
+
+    @staticmethod
+    def update_status(task, status, version=None):
+        """
+        Move a task to another Kanban column unless someone else changed it.
+
+        Only ``status`` (plus ``version`` and ``updated_at``) is written, with
+        a conditional UPDATE on the version the client last saw.
+
+        Args:
+            task: Task instance
+            status: Task.Status value
+            version: Version the client saw (defaults to ``task.version``)
+
+        Returns:
+            Task: The updated task
+
+        Raises:
+            VersionConflict: If the task changed since ``version``
+        """
+        if version is None:
+            version = task.version
+        update_if_current(task, version, status=status)
+        bump_generation(STORY, task.user_story_id)
+        bump_generation(PROJECT, task.project_id)
+        publish_tasks_saved(task.user_story_id, [task])
+        return task
+
+    @staticmethod
+    def bulk_update_status(user_story, changes, versions=None):
+        """
+        Move many tasks of a user story in one transaction.
+
+        Tasks already in their target column are left alone; the others are
+        written by one UPDATE conditional on the versions (see
+        bulk_update_if_current), so no row is locked and a concurrent write
+        to any of them rolls the whole batch back. The post_save signal is
+        not sent: the story and project generations are bumped and the board
+        event is published explicitly.
+
+        Args:
+            user_story: UserStory instance
+            changes: Mapping of task id -> Task.Status value
+            versions: Optional mapping of task id -> version the client saw
+
+        Returns:
+            list: The tasks whose status changed
+
+        Raises:
+            Task.DoesNotExist: If a task does not belong to the user story
+            VersionConflict: If a task changed since the given version; no
+                task is moved
+        """
+        versions = versions or {}
+        with transaction.atomic():
+            tasks = list(
+                Task.objects.filter(user_story=user_story, pk__in=changes).order_by()
+            )
+            if len(tasks) != len(changes):
+                raise Task.DoesNotExist("Task not found in this user story")
+
+            moved = []
+            for task in tasks:
+                if versions.get(task.pk, task.version) != task.version:
+                    raise VersionConflict(task)
+                if task.status != changes[task.pk]:
+                    task.status = changes[task.pk]
+                    moved.append(task)
+
+            if moved:
+                stale = bulk_update_if_current(
+                    moved, {task.pk: task.version for task in moved}, ["status"]
+                )
+                if stale:
+                    # Changed (or deleted) since it was read: undo the batch
+                    raise VersionConflict(Task.objects.get(pk=min(stale)))
+                bump_generation(STORY, user_story.pk)
+                bump_generation(PROJECT, user_story.project_id)
+                publish_tasks_saved(user_story.pk, moved)
+        return moved
@@ -1,11 +1,46 @@
 """Service layer for UserStory management."""
 
-from scrum_app.models import ProductBacklog, SprintBacklog, UserStory
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.db import transaction
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Length
+from django.utils import timezone
+
+from scrum_app.events import publish_story_event
+from scrum_app.generations import (
+    PROJECT,
+    backlog_scope,
+    bump_generation,
+    coalesced_bumps,
+)
+from scrum_app.models import (
+    ProductBacklog,
+    SprintBacklog,
+    UserStory,
+    bulk_update_if_current,
+    save_checked,
+)
+from scrum_app.positions import (
+    REBALANCE_LENGTH,
+    key_between,
+    keys_between,
+    needs_rebalance,
+)
+
+# Most stories a single bulk action may touch
+STORY_BULK_LIMIT = 500
+# Backlog table columns editable in place (see bulk_edit)
+BULK_EDIT_FIELDS = ("priority", "status", "story_points")
 
 
 class UserStoryService:
     """Service class for UserStory business logic."""
 
+    # Backlog tables (product and sprint) are paginated on this key
+    BACKLOG_ORDERING = ("-priority_rank", "-created_at", "-id")
+    # Manual (drag and drop) order of a backlog
+    POSITION_ORDERING = ("position", "id")
+
     @staticmethod
     def create_user_story_for_product_backlog(project, **kwargs):
         """
@@ -19,14 +54,14 @@ class UserStoryService:
             UserStory: The created user story
         """
         product_backlog, _ = ProductBacklog.objects.get_or_create(project=project)
-        print(product_backlog)
         # Remove product_backlog and sprint_backlog from kwargs if present
         kwargs.pop("product_backlog", None)
         kwargs.pop("sprint_backlog", None)
 
-        user_story = UserStory(product_backlog=product_backlog, **kwargs)
-        user_story.full_clean()
-        user_story.save()
+        user_story = UserStory(
+            product_backlog=product_backlog, project=project, **kwargs
+        )
+        save_checked(user_story)
 
         return user_story
 
@@ -48,9 +83,10 @@ class UserStoryService:
         kwargs.pop("product_backlog", None)
         kwargs.pop("sprint_backlog", None)
 
-        user_story = UserStory(sprint_backlog=sprint_backlog, **kwargs)
-        user_story.full_clean()
-        user_story.save()
+        user_story = UserStory(
+            sprint_backlog=sprint_backlog, project_id=sprint.project_id, **kwargs
+        )
+        save_checked(user_story)
 
         return user_story
 
@@ -69,8 +105,7 @@ class UserStoryService:
         for key, value in kwargs.items():
             setattr(user_story, key, value)
 
-        user_story.full_clean()
-        user_story.save()
+        save_checked(user_story)
 
         return user_story
 
@@ -89,8 +124,9 @@ class UserStoryService:
         sprint_backlog, _ = SprintBacklog.objects.get_or_create(sprint=sprint)
         user_story.product_backlog = None
         user_story.sprint_backlog = sprint_backlog
-        user_story.full_clean()
-        user_story.save()
+        user_story.project_id = sprint.project_id
+        user_story.place_at_end()
+        save_checked(user_story)
 
         return user_story
 
@@ -109,11 +145,332 @@ class UserStoryService:
         product_backlog, _ = ProductBacklog.objects.get_or_create(project=project)
         user_story.sprint_backlog = None
         user_story.product_backlog = product_backlog
-        user_story.full_clean()
-        user_story.save()
+        user_story.project = project
+        user_story.place_at_end()
+        save_checked(user_story)
 
         return user_story
 
+    @staticmethod
+    def bulk_move(project, story_ids, sprint=None):
+        """
+        Move a batch of stories of ``project`` to one backlog.
+
+        The target backlog is resolved once and every accepted story is
+        moved by a single UPDATE, appended after the target's last story in
+        its current backlog order. Rejected stories are reported instead of
+        failing the batch. ``update()`` skips ``save()`` and the signals, so
+        ``updated_at`` and ``version`` are advanced here and the generations
+        and board events are handled explicitly.
+
+        Args:
+            project: Project owning the stories
+            story_ids: Primary keys of the stories to move
+            sprint: Sprint to move to, or None for the product backlog
+
+        Returns:
+            tuple: (list of moved stories, dict of story id -> error message)
+
+        Raises:
+            ValueError: If ``sprint`` belongs to another project
+        """
+        if sprint is not None and sprint.project_id != project.pk:
+            raise ValueError("A sprint deve pertencer ao projeto.")
+
+        errors = {}
+        with transaction.atomic(), coalesced_bumps():
+            if sprint is None:
+                target, _ = ProductBacklog.objects.get_or_create(project=project)
+                target_lookup = {"product_backlog_id": target.pk}
+            else:
+                target, _ = SprintBacklog.objects.get_or_create(sprint=sprint)
+                target_lookup = {"sprint_backlog_id": target.pk}
+
+            stories = {
+                story.pk: story
+                for story in UserStory.objects.select_for_update()
+                .filter(pk__in=story_ids)
+                .order_by(*UserStoryService.POSITION_ORDERING)
+            }
+            moving = []
+            for story_id in dict.fromkeys(story_ids):
+                story = stories.get(story_id)
+                if story is None:
+                    errors[story_id] = "User Story não encontrada."
+                elif story.project_id != project.pk:
+                    errors[story_id] = f'"{story}" pertence a outro projeto.'
+                elif story.backlog_lookup() == target_lookup:
+                    errors[story_id] = f'"{story}" já está neste backlog.'
+                else:
+                    moving.append(story)
+            if not moving:
+                return [], errors
+
+            # Keep the stories' relative order at the end of the target
+            moving.sort(key=lambda story: (story.position, story.pk))
+            last = (
+                UserStory.objects.filter(**target_lookup)
+                .order_by("-position")
+                .values_list("position", flat=True)
+                .first()
+            )
+            keys = keys_between(last or None, None, len(moving))
+
+            sources = {backlog_scope(**story.backlog_lookup()) for story in moving}
+            left_sprint_backlog = {story.pk: story.sprint_backlog_id for story in moving}
+            now = timezone.now()
+            for story, key in zip(moving, keys):
+                story.product_backlog_id = target_lookup.get("product_backlog_id")
+                story.sprint_backlog_id = target_lookup.get("sprint_backlog_id")
+                story.position = key
+                story.updated_at = now
+                story.version += 1
+
+            UserStory.objects.filter(pk__in=[story.pk for story in moving]).update(
+                product_backlog_id=target_lookup.get("product_backlog_id"),
+                sprint_backlog_id=target_lookup.get("sprint_backlog_id"),
+                position=Case(
+                    *(When(pk=story.pk, then=Value(story.position)) for story in moving)
+                ),
+                updated_at=now,
+                version=F("version") + 1,
+            )
+
+            for scope, pk in sources | {backlog_scope(**target_lookup)}:
+                bump_generation(scope, pk)
+            bump_generation(PROJECT, project.pk)
+            for story in moving:
+                publish_story_event("story.saved", story, left_sprint_backlog[story.pk])
+
+            if needs_rebalance(keys[-1]):
+                transaction.on_commit(
+                    lambda: UserStoryService.rebalance_backlog(**target_lookup)
+                )
+
+        return moving, errors
+
+    @staticmethod
+    def bulk_edit(project, changes, versions=None):
+        """
+        Apply backlog table edits to many stories of ``project`` at once.
+
+        Each row is validated on its own: unknown stories, stale versions and
+        invalid values are reported per story and field, and the remaining
+        rows are written by one UPDATE limited to the columns that actually
+        changed and conditional on the versions (see bulk_update_if_current),
+        so no row is locked and a story another write got to first is
+        reported instead of overwritten. ``save()`` and the signals are
+        skipped, so ``priority_rank`` is set here and the generations and
+        board events are handled explicitly.
+
+        Args:
+            project: Project owning the stories
+            changes: Mapping of story id -> {field name: submitted value},
+                fields taken from BULK_EDIT_FIELDS
+            versions: Optional mapping of story id -> version the client saw
+
+        Returns:
+            tuple: (list of updated stories, dict of story id -> {field name
+            or NON_FIELD_ERRORS: error message})
+        """
+        versions = versions or {}
+        errors = {}
+        with transaction.atomic():
+            stories = {
+                story.pk: story
+                for story in UserStory.objects.filter(
+                    project=project, pk__in=changes
+                ).order_by()
+            }
+            updated, fields = [], set()
+            for story_id, row in changes.items():
+                story = stories.get(story_id)
+                if story is None:
+                    errors[story_id] = {NON_FIELD_ERRORS: "User Story não encontrada."}
+                    continue
+                if versions.get(story_id, story.version) != story.version:
+                    errors[story_id] = UserStoryService._stale_error(story)
+                    continue
+
+                values, row_errors = UserStoryService._clean_row(story, row)
+                if row_errors:
+                    errors[story_id] = row_errors
+                    continue
+                changed = {
+                    name: value
+                    for name, value in values.items()
+                    if getattr(story, name) != value
+                }
+                if not changed:
+                    continue
+                for name, value in changed.items():
+                    setattr(story, name, value)
+                if "priority" in changed:
+                    story.priority_rank = UserStory.PRIORITY_RANKS[story.priority]
+                    changed["priority_rank"] = story.priority_rank
+                fields.update(changed)
+                updated.append(story)
+
+            stale = bulk_update_if_current(
+                updated, {story.pk: story.version for story in updated}, sorted(fields)
+            )
+            for story in updated:
+                if story.pk in stale:
+                    errors[story.pk] = UserStoryService._stale_error(story)
+            updated = [story for story in updated if story.pk not in stale]
+            if updated:
+                for scope, pk in {
+                    backlog_scope(**story.backlog_lookup()) for story in updated
+                }:
+                    bump_generation(scope, pk)
+                bump_generation(PROJECT, project.pk)
+                for story in updated:
+                    publish_story_event("story.saved", story)
+
+        return updated, errors
+
+    @staticmethod
+    def _stale_error(story):
+        """bulk_edit() error of a story changed by someone else."""
+        return {NON_FIELD_ERRORS: f'"{story}" foi alterada por outra pessoa.'}
+
+    @staticmethod
+    def _clean_row(story, row):
+        """Validated model values of one bulk edit row, and its field errors."""
+        values, errors = {}, {}
+        for name, raw in row.items():
+            if name not in BULK_EDIT_FIELDS:
+                errors[name] = "Campo não editável em lote."
+                continue
+            field = UserStory._meta.get_field(name)
+            if raw in ("", None) and field.null:
+                raw = None
+            try:
+                values[name] = field.clean(raw, story)
+            except ValidationError as exc:
+                errors[name] = " ".join(exc.messages)
+        return values, errors
+
+    @staticmethod
+    def reorder(user_story, before=None, after=None):
+        """
+        Move a story between two neighbours of its backlog with one UPDATE.
+
+        Only one neighbour is needed: the other side is looked up, so a
+        story dropped at the edge of a page lands next to the right story.
+        A rebalance of the backlog is scheduled when the new key is long.
+
+        Args:
+            user_story: The user story to move
+            before: Story that should come right before it (or None)
+            after: Story that should come right after it (or None)
+
+        Returns:
+            str: The new position key
+
+        Raises:
+            ValueError: if a neighbour belongs to another backlog
+        """
+        lookup = user_story.backlog_lookup()
+        siblings = UserStory.objects.filter(**lookup).exclude(pk=user_story.pk)
+        for neighbour in (before, after):
+            if neighbour is None:
+                continue
+            if neighbour.pk == user_story.pk or neighbour.backlog_lookup() != lookup:
+                raise ValueError("Neighbours must be other stories of the same backlog.")
+
+        if before is None and after is not None:
+            before = (
+                siblings.filter(
+                    Q(position__lt=after.position)
+                    | Q(position=after.position, pk__lt=after.pk)
+                )
+                .order_by("-position", "-id")
+                .first()
+            )
+        elif after is None and before is not None:
+            after = (
+                siblings.filter(
+                    Q(position__gt=before.position)
+                    | Q(position=before.position, pk__gt=before.pk)
+                )
+                .order_by(*UserStoryService.POSITION_ORDERING)
+                .first()
+            )
+
+        low = before.position if before else None
+        high = after.position if after else None
+        if low is not None and high is not None and low >= high:
+            # Duplicate keys (concurrent appends): respace, then retry once
+            UserStoryService.rebalance_backlog(**lookup)
+            before = UserStory.objects.get(pk=before.pk)
+            after = UserStory.objects.get(pk=after.pk)
+            low, high = before.position, after.position
+
+        position = key_between(low, high)
+        UserStory.objects.filter(pk=user_story.pk).update(position=position)
+        user_story.position = position
+        # update() sends no signals; the project generation keeps the
+        # backlog pages' ETags (scrum_app.conditional) current
+        bump_generation(*backlog_scope(**lookup))
+        bump_generation(PROJECT, user_story.project_id)
+
+        if needs_rebalance(position):
+            transaction.on_commit(lambda: UserStoryService.rebalance_backlog(**lookup))
+
+        return position
+
+    @staticmethod
+    def rebalance_backlog(**backlog_lookup):
+        """
+        Respace the position keys of one backlog, keeping its order.
+
+        Args:
+            **backlog_lookup: ``product_backlog_id=...`` or ``sprint_backlog_id=...``
+
+        Returns:
+            int: Number of stories rewritten
+        """
+        with transaction.atomic():
+            stories = list(
+                UserStory.objects.filter(**backlog_lookup)
+                .order_by(*UserStoryService.POSITION_ORDERING)
+                .only("pk", "position", "project_id")
+            )
+            keys = keys_between(None, None, len(stories))
+            changed = []
+            for story, key in zip(stories, keys):
+                if story.position != key:
+                    story.position = key
+                    changed.append(story)
+            UserStory.objects.bulk_update(changed, ["position"], batch_size=500)
+            if changed:
+                bump_generation(*backlog_scope(**backlog_lookup))
+                bump_generation(PROJECT, *{story.project_id for story in changed})
+        return len(changed)
+
+    @staticmethod
+    def backlogs_needing_rebalance(min_length=None):
+        """
+        Backlogs holding at least one over-long position key.
+
+        Returns:
+            list: ``rebalance_backlog`` kwargs, one dict per backlog
+        """
+        long_keys = UserStory.objects.annotate(key_length=Length("position")).filter(
+            key_length__gt=min_length if min_length is not None else REBALANCE_LENGTH
+        )
+        lookups = []
+        for field in ("product_backlog_id", "sprint_backlog_id"):
+            ids = (
+                long_keys.filter(**{f"{field}__isnull": False})
+                .order_by()
+                .values_list(field, flat=True)
+                .distinct()
+            )
+            lookups.extend({field: backlog_id} for backlog_id in ids)
+        return lookups
+
     @staticmethod
     def delete_user_story(user_story):
         """
@@ -122,19 +479,21 @@ class UserStoryService:
         Args:
             user_story: The user story to delete
         """
-        user_story.delete()
+        with coalesced_bumps():
+            user_story.delete()
 
     @staticmethod
     def get_project_from_user_story(user_story):
         """
         Get the project associated with a user story.
 
+        Uses the denormalized ``UserStory.project`` FK; load the story with
+        ``select_related("project")`` to make this free.
+
         Args:
             user_story: The user story
 
         Returns:
             Project: The associated project
         """
-        if user_story.product_backlog:
-            return user_story.product_backlog.project
-        return user_story.sprint_backlog.sprint.project
+        return user_story.project
@@ -0,0 +1,224 @@
+"""Signal handlers for scrum_app."""
+
+from django.contrib.auth.models import Group, User
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .access import invalidate_user_acl
+from .events import publish, publish_story_event, publish_tasks_saved, story_channel
+from .generations import PROJECT, STORY, backlog_scope, bump_generation, coalesced_bumps
+from .models import (
+    ProductBacklog,
+    Project,
+    ProjectMember,
+    Sprint,
+    SprintBacklog,
+    Task,
+    TaskComment,
+    UserStory,
+)
+
+
+def _invalidate_acl(*user_ids):
+    """
+    Drop cached ACLs now and again once the transaction commits.
+
+    The second pass covers a concurrent request that re-cached the old state
+    between the write and the commit.
+    """
+    invalidate_user_acl(*user_ids)
+    transaction.on_commit(lambda: invalidate_user_acl(*user_ids))
+
+
+# Project ACL cache invalidation
+
+
+@receiver(pre_save, sender=Project)
+def remember_previous_owner(sender, instance, **kwargs):
+    """Ownership transfers must also invalidate the previous owner."""
+    instance._acl_previous_owner_id = None
+    if instance.pk:
+        instance._acl_previous_owner_id = (
+            Project.objects.filter(pk=instance.pk)
+            .values_list("owner_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_owner_acl(sender, instance, **kwargs):
+    _invalidate_acl(instance.owner_id, getattr(instance, "_acl_previous_owner_id", None))
+
+
+@receiver(post_save, sender=ProjectMember)
+@receiver(post_delete, sender=ProjectMember)
+def invalidate_member_acl(sender, instance, **kwargs):
+    _invalidate_acl(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_new_user_acl(sender, instance, created, **kwargs):
+    """Primary keys can be reused after a rollback; never trust old entries."""
+    if created:
+        _invalidate_acl(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_group_acl(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # instance is a Group and pk_set holds user ids
+        if action == "pre_clear":
+            instance._acl_cleared_user_ids = list(
+                instance.user_set.values_list("pk", flat=True)
+            )
+        elif action == "post_clear":
+            _invalidate_acl(*getattr(instance, "_acl_cleared_user_ids", []))
+        elif action in ("post_add", "post_remove"):
+            _invalidate_acl(*pk_set)
+    elif action in ("post_add", "post_remove", "post_clear"):
+        _invalidate_acl(instance.pk)
+
+
+@receiver(pre_delete, sender=Group)
+def invalidate_deleted_group_acl(sender, instance, **kwargs):
+    _invalidate_acl(*instance.user_set.values_list("pk", flat=True))
+
+
+# Fragment cache generations (see scrum_app.generations)
+
+
+@receiver(pre_save, sender=UserStory)
+def remember_previous_backlog(sender, instance, **kwargs):
+    """A story moved to another backlog changes both backlogs."""
+    instance._cache_previous_backlog = None
+    if instance.pk:
+        instance._cache_previous_backlog = (
+            UserStory.objects.filter(pk=instance.pk)
+            .values_list("product_backlog_id", "sprint_backlog_id")
+            .first()
+        )
+
+
+@receiver(post_save, sender=UserStory)
+@receiver(post_delete, sender=UserStory)
+def bump_backlog_generation(sender, instance, **kwargs):
+    backlogs = {backlog_scope(instance.product_backlog_id, instance.sprint_backlog_id)}
+    previous = getattr(instance, "_cache_previous_backlog", None)
+    if previous:
+        backlogs.add(backlog_scope(*previous))
+    for scope, pk in backlogs:
+        bump_generation(scope, pk)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def bump_story_generation(sender, instance, **kwargs):
+    bump_generation(STORY, instance.user_story_id)
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_username(sender, instance, update_fields=None, **kwargs):
+    """Boards and task pages show assignees by username."""
+    instance._cache_previous_username = None
+    if instance.pk and (update_fields is None or "username" in update_fields):
+        instance._cache_previous_username = (
+            User.objects.filter(pk=instance.pk)
+            .values_list("username", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=User)
+def bump_assignee_generations(sender, instance, **kwargs):
+    previous = getattr(instance, "_cache_previous_username", None)
+    if previous is None or previous == instance.username:
+        return
+    assigned = (
+        Task.objects.filter(assigned_to=instance)
+        .order_by()
+        .values_list("user_story_id", "project_id")
+        .distinct()
+    )
+    with coalesced_bumps():
+        for story_id, project_id in assigned:
+            bump_generation(STORY, story_id)
+            bump_generation(PROJECT, project_id)
+
+
+# Project generation: any write anywhere in a project's tree
+
+PROJECT_OF = {
+    Project: lambda instance: instance.pk,
+    ProjectMember: lambda instance: instance.project_id,
+    Sprint: lambda instance: instance.project_id,
+    ProductBacklog: lambda instance: instance.project_id,
+    SprintBacklog: lambda instance: instance.sprint.project_id,
+    UserStory: lambda instance: instance.project_id,
+    Task: lambda instance: instance.project_id,
+    TaskComment: lambda instance: instance.task.project_id,
+}
+
+
+def bump_project_generation(sender, instance, **kwargs):
+    origin = kwargs.get("origin")
+    if origin is not None and origin is not instance and type(origin) in PROJECT_OF:
+        # Cascade from a deleted parent, which bumps the project itself
+        return
+    bump_generation(PROJECT, PROJECT_OF[sender](instance))
+
+
+for _model in PROJECT_OF:
+    post_save.connect(
+        bump_project_generation,
+        sender=_model,
+        dispatch_uid=f"project_gen_save_{_model.__name__}",
+    )
+    post_delete.connect(
+        bump_project_generation,
+        sender=_model,
+        dispatch_uid=f"project_gen_delete_{_model.__name__}",
+    )
+
+
+# Live board events (see scrum_app.events)
+
+
+def _is_cascade(instance, kwargs):
+    """Deleted along with a parent, whose own event covers it."""
+    origin = kwargs.get("origin")
+    return origin is not None and origin is not instance
+
+
+@receiver(post_save, sender=Task)
+def publish_task_saved(sender, instance, **kwargs):
+    publish_tasks_saved(instance.user_story_id, [instance])
+
+
+@receiver(post_delete, sender=Task)
+def publish_task_deleted(sender, instance, **kwargs):
+    if not _is_cascade(instance, kwargs):
+        publish(story_channel(instance.user_story_id), "tasks.deleted", tasks=[instance.pk])
+
+
+@receiver(post_save, sender=TaskComment)
+@receiver(post_delete, sender=TaskComment)
+def publish_comment_changed(sender, instance, **kwargs):
+    if _is_cascade(instance, kwargs):
+        return
+    publish(
+        story_channel(instance.task.user_story_id),
+        "comments.changed",
+        task=instance.task_id,
+    )
+
+
+@receiver(post_save, sender=UserStory)
+@receiver(post_delete, sender=UserStory)
+def publish_story_changed(sender, instance, signal, **kwargs):
+    if signal is post_delete and _is_cascade(instance, kwargs):
+        return
+    event_type = "story.deleted" if signal is post_delete else "story.saved"
+    previous = getattr(instance, "_cache_previous_backlog", None)
+    publish_story_event(event_type, instance, previous[1] if previous else None)
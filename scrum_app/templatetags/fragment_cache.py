@@ -0,0 +1,110 @@
+"""
+``{% fragmentcache %}``: cache a rendered template fragment.
+
+Usage::
+
+    {% load fragment_cache %}
+    {% fragmentcache "kanban_card" task.pk task.updated_at %}
+      ...
+    {% endfragmentcache %}
+
+The key is the fragment name plus every ``vary_on`` value, so the arguments
+must change whenever the output would (``version`` and ``updated_at`` for a
+single object plus anything shown from related rows, a generation counter
+from scrum_app.generations for a whole list). Unlike
+Django's ``{% cache %}`` each lookup is counted and logged with the render
+time a hit saved.
+"""
+
+import hashlib
+import logging
+import time
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+
+from scrum_app.access import count, read_counter, reset_counters
+
+logger = logging.getLogger(__name__)
+register = template.Library()
+
+FRAGMENT_CACHE_PREFIX = "scrum_app:fragment"
+FRAGMENT_HITS_KEY = f"{FRAGMENT_CACHE_PREFIX}:stats:hits"
+FRAGMENT_MISSES_KEY = f"{FRAGMENT_CACHE_PREFIX}:stats:misses"
+# Render time saved by hits, in microseconds (cache.incr needs integers)
+FRAGMENT_SAVED_KEY = f"{FRAGMENT_CACHE_PREFIX}:stats:saved_us"
+
+
+def _fragment_cache_key(name, vary_on):
+    digest = hashlib.md5(
+        ":".join(str(value) for value in vary_on).encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"{FRAGMENT_CACHE_PREFIX}:{name}:{digest}"
+
+
+def fragment_cache_stats():
+    """
+    Hit/miss counters and render time saved, summed over every worker.
+
+    Like the ACL counters (see scrum_app.access.count) they are kept in
+    process memory and reach the cache every SCRUM_CACHE_STATS_FLUSH_SECONDS.
+    """
+    hits = read_counter(FRAGMENT_HITS_KEY)
+    misses = read_counter(FRAGMENT_MISSES_KEY)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+        "saved_seconds": read_counter(FRAGMENT_SAVED_KEY) / 1_000_000,
+    }
+
+
+def reset_fragment_cache_stats():
+    """Zero the counters."""
+    reset_counters(FRAGMENT_HITS_KEY, FRAGMENT_MISSES_KEY, FRAGMENT_SAVED_KEY)
+
+
+class FragmentCacheNode(template.Node):
+    def __init__(self, nodelist, name, vary_on):
+        self.nodelist = nodelist
+        self.name = name
+        self.vary_on = vary_on
+
+    def render(self, context):
+        name = self.name.resolve(context)
+        key = _fragment_cache_key(name, [var.resolve(context) for var in self.vary_on])
+
+        cached = cache.get(key)
+        if cached is not None:
+            html, render_us = cached
+            count(FRAGMENT_HITS_KEY)
+            count(FRAGMENT_SAVED_KEY, render_us)
+            logger.debug("fragment %s hit (saved %.2f ms)", name, render_us / 1000)
+            return html
+
+        start = time.perf_counter()
+        html = self.nodelist.render(context)
+        render_us = int((time.perf_counter() - start) * 1_000_000)
+        cache.set(key, (html, render_us), settings.SCRUM_FRAGMENT_CACHE_TIMEOUT)
+        count(FRAGMENT_MISSES_KEY)
+        logger.debug("fragment %s miss (rendered in %.2f ms)", name, render_us / 1000)
+        return html
+
+
+@register.tag("fragmentcache")
+def do_fragmentcache(parser, token):
+    """{% fragmentcache name [vary_on ...] %} ... {% endfragmentcache %}"""
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' tag requires at least a fragment name."
+        )
+    nodelist = parser.parse(("endfragmentcache",))
+    parser.delete_first_token()
+    return FragmentCacheNode(
+        nodelist,
+        parser.compile_filter(bits[1]),
+        [parser.compile_filter(bit) for bit in bits[2:]],
+    )
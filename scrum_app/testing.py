@@ -0,0 +1,49 @@
+"""Test helpers for scrum_app."""
+
+from django.conf import settings
+from django.urls import reverse
+
+from .querybudget import record_queries
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin asserting that a URL stays within its query budget.
+
+    Budgets are declared per URL name in ``settings.SCRUM_QUERY_BUDGETS`` so
+    the middleware and the tests share one source of truth.
+    """
+
+    def assertQueryBudget(  # pylint: disable=invalid-name
+        self, url_name, args=None, method="get", data=None, budget=None
+    ):
+        """
+        Request ``url_name`` and fail on budget overruns or N+1 patterns.
+
+        Args:
+            url_name: Name of the URL in scrum_flow/urls.py
+            args: Positional URL arguments
+            method: Test client method ("get", "post", ...)
+            data: Request data
+            budget: Override for the declared budget
+
+        Returns:
+            HttpResponse: The response, for further assertions
+        """
+        if budget is None:
+            if url_name not in settings.SCRUM_QUERY_BUDGETS:
+                self.fail(f"No query budget declared for {url_name!r}")
+            budget = settings.SCRUM_QUERY_BUDGETS[url_name]
+
+        url = reverse(url_name, args=args)
+        with record_queries() as recorder:
+            response = getattr(self.client, method)(url, data)
+
+        if recorder.count > budget:
+            self.fail(
+                f"{url_name} ran over its budget of {budget} queries: "
+                f"{recorder.report()}"
+            )
+        if recorder.repeated():
+            self.fail(f"{url_name} repeats queries: {recorder.report()}")
+        return response
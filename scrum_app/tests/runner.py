@@ -0,0 +1,23 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Run the tests on a process-local cache: a configured Redis cache outlives
+    the test database, and its entries (keyed by primary key) would describe
+    another database's rows.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._local_cache = override_settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+            }
+        )
+        self._local_cache.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._local_cache.disable()
+        super().teardown_test_environment(**kwargs)
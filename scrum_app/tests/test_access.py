@@ -0,0 +1,114 @@
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.test import TestCase, override_settings
+
+from scrum_app.access import (
+    ACL_HITS_KEY,
+    ACL_MISSES_KEY,
+    ProjectAccess,
+    acl_cache_stats,
+    reset_acl_cache_stats,
+)
+from scrum_app.models import Project, ProjectMember
+
+
+class ProjectAccessTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.editor_group, _ = Group.objects.get_or_create(name="editor")
+
+        self.owner = User.objects.create_user(username="owner", password="123")
+        self.member = User.objects.create_user(username="member", password="123")
+        self.outsider = User.objects.create_user(username="outsider", password="123")
+        self.member.groups.add(self.editor_group)
+
+        self.project = Project.objects.create(name="Projeto", owner=self.owner)
+        self.other = Project.objects.create(name="Outro", owner=self.outsider)
+        ProjectMember.objects.create(project=self.project, user=self.member)
+
+    def test_resolves_everything_in_one_query(self):
+        access = ProjectAccess(self.member)
+        with self.assertNumQueries(1):
+            self.assertTrue(access.is_member(self.project))
+            self.assertFalse(access.is_owner(self.project))
+            self.assertTrue(access.is_editor)
+            self.assertTrue(access.can_manage(self.project.pk))
+            self.assertFalse(access.is_member(self.other))
+
+    def test_owner_counts_as_member(self):
+        access = ProjectAccess(self.owner)
+        self.assertTrue(access.is_owner(self.project))
+        self.assertTrue(access.is_member(self.project))
+        self.assertFalse(access.is_editor)
+
+    def test_outsider_is_denied(self):
+        access = ProjectAccess(self.outsider)
+        self.assertFalse(access.is_member(self.project))
+        self.assertFalse(access.can_manage(self.project))
+
+    def test_superuser_manages_sprints_and_members_but_not_the_project(self):
+        admin = User.objects.create_superuser(username="admin", password="123")
+        ProjectMember.objects.create(project=self.project, user=admin)
+        access = ProjectAccess(admin)
+        self.assertFalse(access.can_manage(self.project))
+        with self.assertRaises(PermissionDenied):
+            access.require_editor(self.project)
+        self.assertTrue(access.can_manage(self.project, allow_superuser=True))
+        access.require_editor(self.project, allow_superuser=True)
+        with self.assertRaises(PermissionDenied):
+            access.require_editor(self.other, allow_superuser=True)
+
+    def test_views_use_request_access(self):
+        self.client.login(username="member", password="123")
+        resp = self.client.get("/")
+        self.assertIsInstance(resp.wsgi_request.access, ProjectAccess)
+
+
+class ProjectAclCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        reset_acl_cache_stats()
+        self.owner = User.objects.create_user(username="owner", password="123")
+        self.user = User.objects.create_user(username="user", password="123")
+        self.project = Project.objects.create(name="Projeto", owner=self.owner)
+
+    def test_second_request_is_served_from_cache(self):
+        self.assertFalse(ProjectAccess(self.user).is_member(self.project))
+        with self.assertNumQueries(0):
+            self.assertFalse(ProjectAccess(self.user).is_member(self.project))
+        self.assertEqual(acl_cache_stats()["hits"], 1)
+        self.assertEqual(acl_cache_stats()["misses"], 1)
+
+    def test_counters_reach_the_cache_in_batches(self):
+        with override_settings(SCRUM_CACHE_STATS_FLUSH_SECONDS=3600):
+            ProjectAccess(self.user).is_member(self.project)
+            self.assertIsNone(cache.get(ACL_MISSES_KEY))
+            self.assertEqual(acl_cache_stats()["misses"], 1)
+        with override_settings(SCRUM_CACHE_STATS_FLUSH_SECONDS=0):
+            ProjectAccess(self.user).is_member(self.project)
+        self.assertEqual(cache.get(ACL_MISSES_KEY), 1)
+        self.assertEqual(cache.get(ACL_HITS_KEY), 1)
+
+    def test_membership_changes_invalidate(self):
+        self.assertFalse(ProjectAccess(self.user).is_member(self.project))
+        member = ProjectMember.objects.create(project=self.project, user=self.user)
+        self.assertTrue(ProjectAccess(self.user).is_member(self.project))
+        member.delete()
+        self.assertFalse(ProjectAccess(self.user).is_member(self.project))
+
+    def test_group_changes_invalidate(self):
+        editor_group, _ = Group.objects.get_or_create(name="editor")
+        self.assertFalse(ProjectAccess(self.user).is_editor)
+        self.user.groups.add(editor_group)
+        self.assertTrue(ProjectAccess(self.user).is_editor)
+        editor_group.user_set.clear()
+        self.assertFalse(ProjectAccess(self.user).is_editor)
+
+    def test_ownership_transfer_invalidates_both_owners(self):
+        self.assertTrue(ProjectAccess(self.owner).is_owner(self.project))
+        self.assertFalse(ProjectAccess(self.user).is_owner(self.project))
+        self.project.owner = self.user
+        self.project.save()
+        self.assertFalse(ProjectAccess(self.owner).is_owner(self.project))
+        self.assertTrue(ProjectAccess(self.user).is_owner(self.project))
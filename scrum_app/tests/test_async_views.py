@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from scrum_app.models import Project, ProjectMember, Sprint, Task, TaskComment
+from scrum_app.services.user_story_service import UserStoryService
+
+
+class AsyncViewTests(TestCase):
+    """The async read views, served through the ASGI handler."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username="owner", password="123")
+        viewers, _ = Group.objects.get_or_create(name="member")
+        viewers.permissions.set(
+            Permission.objects.filter(codename__in=["view_project", "view_sprint"])
+        )
+        self.owner.groups.add(viewers)
+        self.project = Project.objects.create(name="Projeto", owner=self.owner)
+        self.sprint = Sprint.objects.create(
+            project=self.project,
+            name="Sprint 1",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+        self.story = UserStoryService.create_user_story_for_product_backlog(
+            self.project, title="US", description="desc"
+        )
+        self.task = Task.objects.create(
+            user_story=self.story, title="Primeira", assigned_to=self.owner
+        )
+        TaskComment.objects.create(task=self.task, author=self.owner, content="Oi")
+
+    async def test_pages_render_under_asgi(self):
+        await self.async_client.aforce_login(self.owner)
+        pages = {
+            reverse("project_list"): "Projeto",
+            reverse("project_detail", args=[self.project.pk]): "Projeto",
+            reverse("sprint_detail", args=[self.sprint.pk]): "Sprint 1",
+            reverse("product_backlog", args=[self.project.pk]): "US",
+            reverse("sprint_backlog", args=[self.sprint.pk]): "Sprint 1",
+            reverse("task_kanban", args=[self.story.pk]): "Primeira",
+            reverse("task_detail", args=[self.task.pk]): "Oi",
+        }
+        for url, text in pages.items():
+            with self.subTest(url=url):
+                resp = await self.async_client.get(url)
+                self.assertContains(resp, text)
+                self.assertContains(resp, "owner")
+
+    async def test_unchanged_page_answers_304(self):
+        await self.async_client.aforce_login(self.owner)
+        url = reverse("task_kanban", args=[self.story.pk])
+        await self.async_client.get(url)
+        etag = (await self.async_client.get(url))["ETag"]
+
+        resp = await self.async_client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(resp.status_code, 304)
+
+    async def test_non_members_are_refused(self):
+        outsider = await User.objects.acreate_user(username="outsider", password="123")
+        await self.async_client.aforce_login(outsider)
+
+        resp = await self.async_client.get(reverse("task_kanban", args=[self.story.pk]))
+        self.assertRedirects(resp, reverse("project_list"), fetch_redirect_response=False)
+
+        resp = await self.async_client.get(reverse("project_detail", args=[self.project.pk]))
+        self.assertEqual(resp.status_code, 403)
+
+    async def test_comment_is_posted_through_the_async_view(self):
+        member = await User.objects.acreate_user(username="member", password="123")
+        await ProjectMember.objects.acreate(project=self.project, user=member)
+        await self.async_client.aforce_login(member)
+
+        url = reverse("task_detail", args=[self.task.pk])
+        resp = await self.async_client.post(url, {"content": "Novo"})
+
+        self.assertRedirects(resp, url, fetch_redirect_response=False)
+        self.assertTrue(
+            await TaskComment.objects.filter(task=self.task, author=member).aexists()
+        )
@@ -0,0 +1,53 @@
+from io import StringIO
+
+from django.contrib.auth.models import Group, Permission
+from django.core.management import call_command
+from django.test import TestCase
+
+from scrum_app.management.commands.bench import (
+    build_routes,
+    find_fixture,
+    find_regressions,
+    measure,
+)
+
+
+class BenchTests(TestCase):
+    def test_every_route_answers_on_a_populated_database(self):
+        call_command(
+            "populate_db",
+            "--users=3",
+            "--projects=2",
+            "--stories=6",
+            "--seed=1",
+            stdout=StringIO(),
+        )
+        fixture = find_fixture()
+        group = Group.objects.create(name="bench")
+        group.permissions.set(Permission.objects.all())
+        fixture["user"].groups.add(group)
+        self.client.force_login(fixture["user"])
+
+        routes = build_routes(fixture)
+        posts = [name for name, method, *_ in routes if method == "POST"]
+        self.assertIn("user_story_move", posts)
+        self.assertIn("user_story_bulk_move", posts)
+        self.assertIn("user_story_bulk_edit", posts)
+        for name, method, url, data in routes:
+            result = measure(self.client, method, url, data, requests=2)
+            self.assertEqual(result["errors"], 0, name)
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+
+    def test_regressions_need_a_real_slowdown_or_more_queries(self):
+        def results(p95, queries):
+            route = {"p95_ms": p95, "queries": queries}
+            return {"scales": {"small": {"routes": {"project_list": route}}}}
+
+        baseline = results(10.0, 5)
+        self.assertEqual(find_regressions(baseline, results(11.5, 5), 0.2), [])
+        self.assertEqual(find_regressions(results(1.0, 5), results(1.5, 5), 0.2), [])
+        regressions = find_regressions(baseline, results(13.0, 6), 0.2)
+        self.assertEqual(
+            [problem for *_, problem in regressions],
+            ["p95 10.0 -> 13.0 ms", "queries 5 -> 6"],
+        )
@@ -0,0 +1,150 @@
+import time
+from datetime import date, timedelta
+
+from django.contrib import messages
+from django.contrib.auth.models import Group, Permission, User
+from django.contrib.messages.storage.base import Message
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+
+from scrum_app.models import Project, ProjectMember, Sprint, Task
+from scrum_app.services.user_story_service import UserStoryService
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username="owner", password="123")
+        viewers, _ = Group.objects.get_or_create(name="member")
+        viewers.permissions.set(
+            Permission.objects.filter(codename__in=["view_project", "view_sprint"])
+        )
+        self.owner.groups.add(viewers)
+        self.project = Project.objects.create(name="Projeto", owner=self.owner)
+        self.story = UserStoryService.create_user_story_for_product_backlog(
+            self.project, title="US", description="desc"
+        )
+        self.task = Task.objects.create(user_story=self.story, title="Primeira")
+        self.client.login(username="owner", password="123")
+
+    def _etag(self, url):
+        # The first visit sets the CSRF cookie (and may create the backlog)
+        self.client.get(url)
+        return self.client.get(url)["ETag"]
+
+    def _revalidate(self, url):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=self._etag(url))
+
+    def test_unchanged_pages_answer_304(self):
+        sprint = Sprint.objects.create(
+            project=self.project,
+            name="Sprint 1",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+        urls = [
+            reverse("project_detail", args=[self.project.pk]),
+            reverse("sprint_detail", args=[sprint.pk]),
+            reverse("product_backlog", args=[self.project.pk]),
+            reverse("sprint_backlog", args=[sprint.pk]),
+            reverse("task_kanban", args=[self.story.pk]),
+            reverse("task_detail", args=[self.task.pk]),
+            reverse("user_story_detail", args=[self.story.pk]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                resp = self._revalidate(url)
+                self.assertEqual(resp.status_code, 304)
+                self.assertTrue(resp["ETag"].startswith('W/"'))
+                self.assertIn("no-cache", resp["Cache-Control"])
+
+    def test_304_skips_the_view(self):
+        url = reverse("task_kanban", args=[self.story.pk])
+        etag = self._etag(url)
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(resp.status_code, 304)
+        self.assertFalse(resp.templates)
+        # Session, user and the project lookup; the ACL comes from the cache
+        self.assertEqual(len(queries), 3)
+
+    def test_write_in_project_changes_the_etag(self):
+        url = reverse("user_story_detail", args=[self.story.pk])
+        etag = self._etag(url)
+
+        Task.objects.create(user_story=self.story, title="Nova")
+
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp["ETag"], etag)
+
+    def test_reorder_changes_the_backlog_etag(self):
+        other = UserStoryService.create_user_story_for_product_backlog(
+            self.project, title="US 2", description="desc"
+        )
+        url = reverse("product_backlog", args=[self.project.pk])
+        etag = self._etag(url)
+
+        UserStoryService.reorder(other, after=self.story)
+
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+
+    def test_etag_varies_by_query_string(self):
+        url = reverse("product_backlog", args=[self.project.pk])
+        etag = self._etag(url)
+
+        resp = self.client.get(url, {"sort": "priority"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+
+    def test_etag_varies_by_user(self):
+        url = reverse("task_detail", args=[self.task.pk])
+        etag = self._etag(url)
+
+        member = User.objects.create_user(username="member", password="123")
+        ProjectMember.objects.create(project=self.project, user=member)
+        self.client.login(username="member", password="123")
+
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+
+    def test_access_changes_are_not_hidden_behind_if_modified_since(self):
+        url = reverse("project_detail", args=[self.project.pk])
+        self.assertFalse(self.client.get(url).has_header("Last-Modified"))
+
+        editors, _ = Group.objects.get_or_create(name="editor")
+        self.owner.groups.add(editors)
+
+        resp = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 3600)
+        )
+        self.assertEqual(resp.status_code, 200)
+
+    def test_non_members_get_no_validators(self):
+        User.objects.create_user(username="outsider", password="123")
+        self.client.login(username="outsider", password="123")
+
+        resp = self.client.get(reverse("task_kanban", args=[self.story.pk]))
+        self.assertRedirects(resp, reverse("project_list"), fetch_redirect_response=False)
+        self.assertFalse(resp.has_header("ETag"))
+
+    def test_pending_messages_force_a_render(self):
+        url = reverse("user_story_detail", args=[self.story.pk])
+        etag = self._etag(url)
+
+        # A message queued by the previous (redirecting) request
+        storage = CookieStorage(RequestFactory().get("/"))
+        self.client.cookies[storage.cookie_name] = storage._encode(  # pylint: disable=protected-access
+            [Message(messages.SUCCESS, "Salvo")]
+        )
+
+        resp = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "Salvo")
@@ -0,0 +1,138 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from scrum_app.events import OutboxBackend, event_stream, hub, story_channel
+from scrum_app.models import BoardEvent, Project, Task, TaskComment
+from scrum_app.services.task_service import TaskService
+from scrum_app.services.user_story_service import UserStoryService
+
+
+class BoardEventTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="123")
+        self.project = Project.objects.create(name="Projeto", owner=self.owner)
+        self.story = UserStoryService.create_user_story_for_product_backlog(
+            self.project, title="US", description="desc"
+        )
+        self.task = Task.objects.create(user_story=self.story, title="task")
+
+    def _committed(self, func, *args):
+        with self.captureOnCommitCallbacks(execute=True):
+            return func(*args)
+
+    async def test_task_writes_reach_story_subscribers(self):
+        subscription = hub.subscribe(story_channel(self.story.pk))
+        try:
+            await sync_to_async(self._committed)(
+                TaskService.update_status, self.task, Task.Status.DONE
+            )
+            moved = await subscription.get(timeout=1)
+            await sync_to_async(self._committed)(
+                lambda: TaskComment.objects.create(
+                    task=self.task, author=self.owner, content="oi"
+                )
+            )
+            commented = await subscription.get(timeout=1)
+        finally:
+            hub.unsubscribe(subscription)
+
+        self.assertEqual(moved["type"], "tasks.saved")
+        self.assertEqual(
+            moved["tasks"], [{"id": self.task.pk, "status": "DONE", "version": 2}]
+        )
+        self.assertEqual(commented, {"type": "comments.changed", "task": self.task.pk})
+
+    async def test_nothing_is_published_before_commit(self):
+        subscription = hub.subscribe(story_channel(self.story.pk))
+        try:
+            await sync_to_async(TaskService.update_status)(self.task, Task.Status.DONE)
+            self.assertIsNone(await subscription.get(timeout=0.05))
+        finally:
+            hub.unsubscribe(subscription)
+
+    async def test_stream_formats_events_and_unsubscribes(self):
+        stream = event_stream(story_channel(self.story.pk))
+        self.assertTrue((await anext(stream)).startswith("retry: "))
+
+        hub.dispatch(story_channel(self.story.pk), {"type": "tasks.deleted", "tasks": [7]})
+        chunk = await anext(stream)
+        await stream.aclose()
+
+        event_line, data_line = chunk.strip().split("\n")
+        self.assertEqual(event_line, "event: tasks.deleted")
+        self.assertEqual(json.loads(data_line[len("data: "):])["tasks"], [7])
+        self.assertFalse(hub.has_subscriptions())
+
+    @override_settings(SCRUM_EVENTS_POLL_INTERVAL=0.01)
+    async def test_outbox_delivers_rows_published_elsewhere(self):
+        backend = OutboxBackend()
+        subscription = hub.subscribe(story_channel(self.story.pk))
+        try:
+            await backend.listen()
+            # Another worker appends to the outbox
+            await BoardEvent.objects.acreate(
+                channel=story_channel(self.story.pk),
+                payload={"type": "tasks.deleted", "tasks": [self.task.pk]},
+            )
+            event = await subscription.get(timeout=1)
+        finally:
+            hub.unsubscribe(subscription)
+            await backend._poller  # pylint: disable=protected-access
+
+        self.assertEqual(event["tasks"], [self.task.pk])
+
+    @override_settings(SCRUM_EVENTS_POLL_INTERVAL=0.01)
+    async def test_restarted_outbox_poller_skips_rows_nobody_listened_to(self):
+        backend = OutboxBackend()
+        channel = story_channel(self.story.pk)
+        subscription = hub.subscribe(channel)
+        await backend.listen()
+        hub.unsubscribe(subscription)
+        await backend._poller  # pylint: disable=protected-access
+
+        # Published while this worker had no open streams
+        await BoardEvent.objects.acreate(
+            channel=channel, payload={"type": "tasks.deleted", "tasks": [1]}
+        )
+
+        subscription = hub.subscribe(channel)
+        try:
+            await backend.listen()
+            self.assertIsNone(await subscription.get(timeout=0.05))
+        finally:
+            hub.unsubscribe(subscription)
+            await backend._poller  # pylint: disable=protected-access
+
+
+@override_settings(SCRUM_EVENTS_STREAM_SECONDS=0.05, SCRUM_EVENTS_HEARTBEAT=0.01)
+class BoardEventViewTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="123")
+        self.outsider = User.objects.create_user(username="outsider", password="123")
+        project = Project.objects.create(name="Projeto", owner=self.owner)
+        self.story = UserStoryService.create_user_story_for_product_backlog(
+            project, title="US", description="desc"
+        )
+        self.url = reverse("user_story_events", args=[self.story.pk])
+
+    async def test_members_get_an_event_stream(self):
+        await self.async_client.aforce_login(self.owner)
+        resp = await self.async_client.get(self.url)
+
+        self.assertEqual(resp["Content-Type"], "text/event-stream")
+        chunks = [chunk async for chunk in resp.streaming_content]
+        self.assertTrue(chunks[0].startswith(b"retry: "))
+        self.assertIn(b": keep-alive\n\n", chunks)
+
+    async def test_non_members_are_refused(self):
+        await self.async_client.aforce_login(self.outsider)
+        resp = await self.async_client.get(self.url)
+        self.assertEqual(resp.status_code, 403)
+
+    def test_wsgi_clients_are_told_to_stop(self):
+        self.client.force_login(self.owner)
+        self.assertEqual(self.client.get(self.url).status_code, 204)
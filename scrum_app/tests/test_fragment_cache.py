@@ -0,0 +1,69 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from scrum_app.models import Project, Task
+from scrum_app.services.user_story_service import UserStoryService
+from scrum_app.templatetags.fragment_cache import fragment_cache_stats
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username="owner", password="123")
+        self.project = Project.objects.create(name="Projeto", owner=self.owner)
+        self.story = UserStoryService.create_user_story_for_product_backlog(
+            self.project, title="US", description="desc"
+        )
+        self.other = UserStoryService.create_user_story_for_product_backlog(
+            self.project, title="Outra", description="desc"
+        )
+        self.task = Task.objects.create(user_story=self.story, title="Primeira")
+        self.client.login(username="owner", password="123")
+
+    def test_unchanged_kanban_columns_come_from_cache(self):
+        url = reverse("task_kanban", args=[self.story.pk])
+        self.client.get(url)
+        before = fragment_cache_stats()
+        self.client.get(url)
+        after = fragment_cache_stats()
+
+        # Three column reads, no card reads
+        self.assertEqual(after["hits"] - before["hits"], 3)
+        self.assertEqual(after["misses"], before["misses"])
+
+    def test_task_changes_reach_the_cached_board(self):
+        url = reverse("task_kanban", args=[self.story.pk])
+        self.client.get(url)
+
+        self.task.title = "Renomeada"
+        self.task.save()
+        Task.objects.create(user_story=self.story, title="Nova")
+
+        resp = self.client.get(url)
+        self.assertContains(resp, "Renomeada")
+        self.assertContains(resp, "Nova")
+
+    def test_renamed_assignee_reaches_the_cached_board(self):
+        dev = User.objects.create_user(username="dev", password="123")
+        self.task.assigned_to = dev
+        self.task.save()
+        url = reverse("task_kanban", args=[self.story.pk])
+        self.client.get(url)
+
+        dev.username = "renomeado"
+        dev.save()
+
+        self.assertContains(self.client.get(url), "renomeado")
+
+    def test_reorder_reaches_the_cached_backlog(self):
+        url = reverse("product_backlog", args=[self.project.pk])
+        self.client.get(url)
+
+        UserStoryService.reorder(self.other, after=self.story)
+        titles = [s.title for s in self.client.get(url).context["page_obj"]]
+        content = self.client.get(url).content.decode()
+
+        self.assertEqual(titles, ["Outra", "US"])
+        self.assertLess(content.index("Outra"), content.index(">US<"))
@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+
+from scrum_app import generations
+from scrum_app.generations import PROJECT, coalesced_bumps, get_generation
+from scrum_app.models import (
+    ProductBacklog,
+    Project,
+    ProjectMember,
+    Sprint,
+    SprintBacklog,
+    Task,
+    TaskComment,
+)
+from scrum_app.services.user_story_service import UserStoryService
+
+
+class ProjectGenerationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username="owner", password="123")
+        self.project = Project.objects.create(name="Projeto", owner=self.owner)
+        self.sprint = Sprint.objects.create(
+            project=self.project,
+            name="Sprint 1",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+        self.story = UserStoryService.create_user_story_for_product_backlog(
+            self.project, title="US", description="desc"
+        )
+        self.task = Task.objects.create(user_story=self.story, title="Task")
+
+    def _generation(self):
+        return get_generation(PROJECT, self.project.pk)
+
+    def _project_bumps(self, renew):
+        return [call for call in renew.call_args_list if call.args[0] == PROJECT]
+
+    def test_every_model_bumps_its_project(self):
+        member = User.objects.create_user(username="member", password="123")
+        writes = [
+            lambda: self.project.save(),
+            lambda: ProjectMember.objects.create(project=self.project, user=member),
+            lambda: self.sprint.save(),
+            lambda: ProductBacklog.objects.get(project=self.project).save(),
+            lambda: SprintBacklog.objects.get_or_create(sprint=self.sprint),
+            lambda: self.story.save(),
+            lambda: self.task.save(),
+            lambda: TaskComment.objects.create(
+                task=self.task, author=self.owner, content="ok"
+            ),
+        ]
+        for write in writes:
+            before = self._generation()
+            write()
+            self.assertGreater(self._generation(), before)
+
+    def test_coalesced_bumps_increment_once(self):
+        before = self._generation()
+        with mock.patch.object(
+            generations, "_renew", wraps=generations._renew
+        ) as renew:
+            with coalesced_bumps():
+                for i in range(10):
+                    Task.objects.create(user_story=self.story, title=f"Task {i}")
+                with coalesced_bumps():
+                    self.story.save()
+                self.assertEqual(self._generation(), before)
+
+        self.assertEqual(len(self._project_bumps(renew)), 1)
+        self.assertGreater(self._generation(), before)
+
+    def test_cascade_delete_bumps_without_loading_parents(self):
+        for i in range(5):
+            TaskComment.objects.create(task=self.task, author=self.owner, content=i)
+        before = self._generation()
+
+        # Collect tasks and comments, three DELETEs; no per-comment task lookups
+        with mock.patch.object(
+            generations, "_renew", wraps=generations._renew
+        ) as renew:
+            with self.assertNumQueries(5):
+                UserStoryService.delete_user_story(self.story)
+        self.assertEqual(len(self._project_bumps(renew)), 1)
+        self.assertGreater(self._generation(), before)
@@ -0,0 +1,36 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from scrum_app.models import Project, Sprint, Task, TaskComment
+from scrum_app.services.user_story_service import UserStoryService
+
+
+class HotQueryPlanTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user(username="owner", password="123")
+        project = Project.objects.create(name="Projeto", owner=owner)
+        Sprint.objects.create(
+            project=project, name="S1", start_date="2026-01-01", end_date="2026-01-14"
+        )
+        for i in range(3):
+            story = UserStoryService.create_user_story_for_product_backlog(
+                project, title=f"US {i}", description="desc"
+            )
+        task = Task.objects.create(user_story=story, title="task")
+        TaskComment.objects.create(task=task, author=owner, content="ok")
+
+    def test_hot_queries_are_answered_by_indexes(self):
+        out = StringIO()
+        call_command("explain_hot_queries", "--strict", stdout=out)
+        self.assertIn("0 hot queries flagged", out.getvalue())
+
+    def test_accepted_sorts_are_reported_with_their_reason(self):
+        out = StringIO()
+        call_command("explain_hot_queries", stdout=out)
+        self.assertIn(
+            "(accepted: the window functions sort the tasks of one user story only)",
+            out.getvalue(),
+        )
@@ -0,0 +1,78 @@
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from scrum_app.management.commands.load_test import (
+    DEFAULT_MIX,
+    HOST,
+    Command,
+    parse_mix,
+    run_worker,
+    summarize,
+)
+
+
+class LoadTestTests(TestCase):
+    @override_settings(ALLOWED_HOSTS=[HOST])
+    def test_workers_run_the_whole_mix_against_a_populated_database(self):
+        call_command(
+            "populate_db",
+            "--users=3",
+            "--projects=2",
+            "--stories=6",
+            "--seed=1",
+            stdout=StringIO(),
+        )
+        command = Command()
+        targets = command.targets(3)
+        mix = [(name, 1) for name, _ in parse_mix(DEFAULT_MIX)]
+        command.check_permissions(targets, mix, grant=True)
+        plan = {
+            "seed": 1,
+            "mix": mix,
+            "processes": False,
+            "targets": [
+                {key: value for key, value in target.items() if key != "user"}
+                for target in targets
+            ],
+        }
+
+        samples = run_worker(0, plan, time.time() + 0.5)
+
+        self.assertTrue(samples)
+        # Concurrent edits may conflict; nothing else may fail
+        failures = [
+            sample for sample in samples if sample[5] or sample[1] not in (200, 302, 409)
+        ]
+        self.assertEqual(failures, [])
+        summary = summarize(samples, 0.5)
+        self.assertEqual(summary["requests"], len(samples))
+        self.assertEqual(sum(summary["histogram"].values()), len(samples))
+
+    def test_summary_counts_errors_by_kind(self):
+        samples = [
+            ("kanban", 200, 0.004, 0.001, 0.0, None),
+            ("drag_card", 409, 0.012, 0.001, 0.002, None),
+            ("comment", 500, 6.0, 0.0, 5.0, "database is locked"),
+        ]
+
+        summary = summarize(samples, 2.0)
+
+        self.assertEqual(summary["requests_per_second"], 1.5)
+        self.assertEqual(
+            summary["errors"], {"409 version conflict": 1, "database is locked": 1}
+        )
+        self.assertEqual(summary["histogram"]["<= 5 ms"], 1)
+        self.assertEqual(summary["histogram"]["> 5000 ms"], 1)
+        self.assertEqual(summary["write_sql_seconds"], 5.002)
+        self.assertTrue(summary["operations"]["drag_card"]["write"])
+
+    def test_mix_rejects_unknown_operations(self):
+        self.assertEqual(parse_mix("kanban=3, comment"), [("kanban", 3), ("comment", 1)])
+        with self.assertRaises(CommandError):
+            parse_mix("kanban=1,deploy=2")
+        with self.assertRaises(CommandError):
+            parse_mix("kanban=0")
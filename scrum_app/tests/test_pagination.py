@@ -0,0 +1,61 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from scrum_app.models import Project, UserStory
+from scrum_app.pagination import COUNT_CAPPED, COUNT_NONE, KeysetPaginator
+from scrum_app.services.user_story_service import UserStoryService
+
+
+class KeysetPaginatorTests(TestCase):
+    ORDERING = ["-priority_rank", "-created_at", "-id"]
+
+    def setUp(self):
+        owner = User.objects.create_user(username="owner", password="123")
+        self.project = Project.objects.create(name="Projeto", owner=owner)
+        priorities = ["LOW", "HIGH", "MEDIUM"]
+        for i in range(23):
+            UserStoryService.create_user_story_for_product_backlog(
+                self.project,
+                title=f"US {i}",
+                description="desc",
+                priority=priorities[i % 3],
+            )
+        self.queryset = UserStory.objects.filter(project=self.project)
+        self.expected = list(self.queryset.order_by(*self.ORDERING))
+
+    def test_walks_forward_and_back_matching_offset_order(self):
+        paginator = KeysetPaginator(self.queryset, self.ORDERING, per_page=5)
+
+        pages, page = [], paginator.get_page()
+        pages.append(page)
+        while page.has_next():
+            page = paginator.get_page(page.next_cursor)
+            pages.append(page)
+
+        self.assertEqual([obj for p in pages for obj in p], self.expected)
+        self.assertEqual([len(p) for p in pages], [5, 5, 5, 5, 3])
+        self.assertFalse(pages[0].has_previous())
+
+        back = paginator.get_page(pages[-1].previous_cursor)
+        self.assertEqual(back.object_list, pages[-2].object_list)
+        first = paginator.get_page(pages[1].previous_cursor)
+        self.assertEqual(first.object_list, pages[0].object_list)
+        self.assertFalse(first.has_previous())
+
+    def test_count_modes(self):
+        exact = KeysetPaginator(self.queryset, self.ORDERING).get_page()
+        capped = KeysetPaginator(
+            self.queryset, self.ORDERING, count_mode=COUNT_CAPPED, count_limit=10
+        ).get_page()
+        with self.assertNumQueries(1):
+            skipped = KeysetPaginator(
+                self.queryset, self.ORDERING, count_mode=COUNT_NONE
+            ).get_page()
+
+        self.assertEqual((exact.count, exact.count_is_capped), (23, False))
+        self.assertEqual((capped.count, capped.count_is_capped), (10, True))
+        self.assertIsNone(skipped.count)
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        page = KeysetPaginator(self.queryset, self.ORDERING).get_page("não-é-cursor")
+        self.assertEqual(page.object_list, self.expected[:10])
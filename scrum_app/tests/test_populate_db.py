@@ -0,0 +1,95 @@
+from datetime import UTC, datetime
+from io import StringIO
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import Count, F, Max, Min
+from django.test import TestCase
+
+from scrum_app.management.commands.populate_db import POPULATED_MODELS
+from scrum_app.models import Project, Task, UserStory
+
+
+class PopulateDbTests(TestCase):
+    def populate(self, *args):
+        call_command(
+            "populate_db", "--users", "3", "--projects", "2", *args, stdout=StringIO()
+        )
+
+    def test_bulk_rows_match_what_save_would_write(self):
+        self.populate()
+
+        self.assertEqual(Project.objects.count(), 6)
+        for story in UserStory.objects.all():
+            self.assertEqual(story.priority_rank, UserStory.PRIORITY_RANKS[story.priority])
+            self.assertTrue(story.position)
+        self.assertFalse(
+            Task.objects.exclude(project_id=F("user_story__project_id")).exists()
+        )
+        # Positions are unique within each backlog
+        self.assertFalse(
+            UserStory.objects.values("product_backlog", "sprint_backlog", "position")
+            .annotate(n=Count("pk"))
+            .filter(n__gt=1)
+            .exists()
+        )
+
+    def test_users_share_one_password_hash(self):
+        self.populate()
+
+        hashes = set(User.objects.values_list("password", flat=True))
+        self.assertEqual(len(hashes), 1)
+        user = User.objects.first()
+        self.assertEqual(authenticate(username=user.username, password="senha123"), user)
+
+    def test_clear_replaces_the_dataset(self):
+        self.populate()
+        self.populate("--clear")
+
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(Project.objects.count(), 6)
+
+    def test_same_seed_gives_the_same_rows_with_any_number_of_workers(self):
+        def dataset():
+            """Every row, with keys counted from the first row of their table."""
+            models = (User, *POPULATED_MODELS)
+            first = {
+                model: model.objects.aggregate(first=Min("pk"))["first"]
+                for model in models
+            }
+
+            def relative(model, field, value):
+                if value is None or not (field.primary_key or field.is_relation):
+                    return value
+                target = model if field.primary_key else field.related_model
+                return value - first[target]
+
+            rows = {}
+            for model in models:
+                fields = model._meta.concrete_fields
+                rows[model.__name__] = [
+                    tuple(
+                        relative(model, field, value)
+                        for field, value in zip(fields, row)
+                    )
+                    for row in model.objects.order_by("pk").values_list(
+                        *(field.attname for field in fields)
+                    )
+                ]
+            return rows
+
+        self.populate("--seed", "7")
+        first = dataset()
+        self.populate("--clear", "--seed", "7", "--workers", "2")
+
+        self.assertEqual(dataset(), first)
+
+    def test_timestamps_end_at_the_epoch(self):
+        self.populate("--epoch", "2025-03-01")
+
+        epoch = datetime(2025, 3, 1, tzinfo=UTC)
+        for model in (Project, UserStory, Task):
+            latest = model.objects.aggregate(latest=Max("created_at"))["latest"]
+            self.assertLessEqual(latest, epoch)
+        self.assertFalse(Task.objects.filter(updated_at__lt=F("created_at")).exists())
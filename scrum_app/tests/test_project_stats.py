@@ -0,0 +1,49 @@
+from django.contrib.auth.models import Group, Permission, User
+from django.test import TestCase
+from django.urls import reverse
+
+from scrum_app.models import Project, ProjectMember, Task
+from scrum_app.services import ProjectService
+from scrum_app.services.user_story_service import UserStoryService
+
+
+class ProjectStatsTests(TestCase):
+    def setUp(self):
+        member_group, _ = Group.objects.get_or_create(name="member")
+        member_group.permissions.set([Permission.objects.get(codename="view_project")])
+
+        self.owner = User.objects.create_user(username="owner", password="123")
+        self.member = User.objects.create_user(username="member", password="123")
+        self.owner.groups.add(member_group)
+
+        self.project = Project.objects.create(name="Projeto", owner=self.owner)
+        self.joined = Project.objects.create(name="Outro", owner=self.member)
+        self.hidden = Project.objects.create(name="Oculto", owner=self.member)
+        ProjectMember.objects.create(project=self.project, user=self.member)
+        ProjectMember.objects.create(project=self.joined, user=self.owner)
+
+        story = UserStoryService.create_user_story_for_product_backlog(
+            self.project, title="US", description="desc"
+        )
+        Task.objects.create(user_story=story, title="aberta")
+        Task.objects.create(user_story=story, title="feita", status=Task.Status.DONE)
+
+    def test_user_projects_are_owned_or_joined_with_counts(self):
+        projects = {p.pk: p for p in ProjectService.get_user_projects(self.owner)}
+
+        self.assertEqual(set(projects), {self.project.pk, self.joined.pk})
+        project = projects[self.project.pk]
+        self.assertEqual(project.member_count, 1)
+        self.assertEqual(project.sprint_count, 0)
+        self.assertEqual(project.story_count, 1)
+        self.assertEqual(project.open_task_count, 1)
+
+    def test_detail_renders_counts_without_extra_queries(self):
+        self.client.login(username="owner", password="123")
+        url = reverse("project_detail", args=[self.project.pk])
+        self.client.get(url)  # warm the ACL cache
+
+        # session, user, user + group permissions, project with counts
+        with self.assertNumQueries(5):
+            resp = self.client.get(url)
+        self.assertContains(resp, "Tasks em aberto:</strong> 1")
@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from scrum_app.models import Project, ProjectMember, Sprint, Task, TaskComment
+from scrum_app.querybudget import record_queries
+from scrum_app.services.user_story_service import UserStoryService
+from scrum_app.testing import QueryBudgetMixin
+from scrum_flow.urls import urlpatterns
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Hot pages stay flat: query counts must not grow with the data."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username="owner", password="123")
+        viewers, _ = Group.objects.get_or_create(name="member")
+        viewers.permissions.set(
+            Permission.objects.filter(codename__in=["view_project", "view_sprint"])
+        )
+        self.owner.groups.add(viewers)
+        self.project = Project.objects.create(name="Projeto", owner=self.owner)
+        users = [
+            User.objects.create_user(username=f"dev{i}", password="123")
+            for i in range(6)
+        ]
+        for user in users:
+            ProjectMember.objects.create(project=self.project, user=user)
+        self.sprint = Sprint.objects.create(
+            project=self.project,
+            name="Sprint 1",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+        for i in range(12):
+            self.story = UserStoryService.create_user_story_for_product_backlog(
+                self.project, title=f"US {i}", description="desc"
+            )
+            UserStoryService.create_user_story_for_sprint_backlog(
+                self.sprint, title=f"Sprint US {i}", description="desc"
+            )
+        for i in range(12):
+            self.task = Task.objects.create(
+                user_story=self.story,
+                title=f"Task {i}",
+                assigned_to=users[i % len(users)],
+                status=Task.Status.values[i % 3],
+            )
+        for user in users:
+            TaskComment.objects.create(task=self.task, author=user, content="ok")
+        self.client.login(username="owner", password="123")
+
+    def test_project_pages(self):
+        self.assertQueryBudget("project_list")
+        self.assertQueryBudget("project_detail", [self.project.pk])
+        self.assertQueryBudget("project_members", [self.project.pk])
+
+    def test_sprint_pages(self):
+        self.assertQueryBudget("sprint_list", [self.project.pk])
+        self.assertQueryBudget("sprint_detail", [self.sprint.pk])
+
+    def test_backlog_pages(self):
+        self.assertQueryBudget("product_backlog", [self.project.pk])
+        self.assertQueryBudget("sprint_backlog", [self.sprint.pk])
+        self.assertQueryBudget("user_story_detail", [self.story.pk])
+
+    def test_task_pages(self):
+        self.assertQueryBudget("task_kanban", [self.story.pk])
+        self.assertQueryBudget("task_detail", [self.task.pk])
+
+    def test_repeated_queries_are_traced_to_their_origin(self):
+        with record_queries() as recorder:
+            for task in Task.objects.filter(user_story=self.story):
+                str(task.assigned_to)
+
+        (shape,) = recorder.repeated()
+        self.assertEqual(shape.count, 12)
+        self.assertIn("test_query_budget.py", shape.origin)
+
+    @override_settings(SCRUM_QUERY_INSPECTOR=True, SCRUM_QUERY_BUDGETS={"task_kanban": 1})
+    def test_middleware_logs_requests_over_budget(self):
+        with self.assertLogs("scrum_app.middleware", "WARNING") as logs:
+            self.client.get(reverse("task_kanban", args=[self.story.pk]))
+
+        self.assertIn("[task_kanban] budget=1", logs.output[0])
+
+    def test_budgets_name_real_urls(self):
+        names = {getattr(pattern, "name", None) for pattern in urlpatterns}
+        for url_name in settings.SCRUM_QUERY_BUDGETS:
+            with self.subTest(url_name):
+                self.assertIn(url_name, names)
@@ -73,4 +73,26 @@ class SprintTests(TestCase):
     def test_member_can_view_sprint_detail_if_project_member(self):
         self.client.login(username="member", password="123")
         resp = self.client.get(reverse("sprint_detail", kwargs={"sprint_id": self.sprint.id}))
-        self.assertEqual(resp.status_code, 200)
\ No newline at end of file
+        self.assertEqual(resp.status_code, 200)
+
+    def test_second_active_sprint_is_refused_by_the_database(self):
+        Sprint.objects.filter(pk=self.sprint.pk).update(status=Sprint.Status.ACTIVE)
+        self.client.login(username="editor", password="123")
+        url = reverse("sprint_create", kwargs={"project_id": self.project.id})
+        payload = {
+            "name": "Sprint 2",
+            "start_date": str(date.today()),
+            "end_date": str(date.today() + timedelta(days=10)),
+            "status": Sprint.Status.ACTIVE,
+        }
+        resp = self.client.post(url, payload)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            resp.context["form"].errors["status"],
+            ["Já existe uma Sprint ativa neste projeto."],
+        )
+        self.assertEqual(
+            Sprint.objects.filter(project=self.project, status=Sprint.Status.ACTIVE).count(),
+            1,
+        )
@@ -0,0 +1,238 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.test import TestCase
+from django.urls import reverse
+
+from scrum_app.models import Project, Task, VersionConflict, bulk_update_if_current
+from scrum_app.services.task_service import TaskService
+from scrum_app.services.user_story_service import UserStoryService
+
+
+class KanbanTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="123")
+        self.outsider = User.objects.create_user(username="outsider", password="123")
+        self.project = Project.objects.create(name="Projeto", owner=self.owner)
+        self.story = UserStoryService.create_user_story_for_product_backlog(
+            self.project, title="US", description="desc"
+        )
+        for i in range(5):
+            Task.objects.create(
+                user_story=self.story, title=f"todo {i}", assigned_to=self.owner
+            )
+        Task.objects.create(
+            user_story=self.story, title="doing", status=Task.Status.IN_PROGRESS
+        )
+
+    def test_board_is_one_query_with_capped_columns(self):
+        with self.assertNumQueries(1):
+            board = TaskService.get_kanban_board(self.story, per_column=3)
+            usernames = [t.assigned_to.username for t in board[Task.Status.TODO].tasks]
+
+        self.assertEqual(usernames, ["owner"] * 3)
+        self.assertEqual(board[Task.Status.TODO].count, 5)
+        self.assertTrue(board[Task.Status.TODO].has_more)
+        self.assertEqual(board[Task.Status.IN_PROGRESS].count, 1)
+        self.assertEqual(board[Task.Status.DONE].count, 0)
+
+    def test_load_more_returns_remaining_cards(self):
+        self.client.login(username="owner", password="123")
+        url = reverse("task_kanban_more", args=[self.story.pk, Task.Status.TODO])
+        data = self.client.get(url, {"offset": 3}).json()
+
+        self.assertTrue(data["success"])
+        self.assertEqual(data["html"].count("kanban-task"), 2)
+        self.assertFalse(data["has_more"])
+        self.assertEqual(data["next_offset"], 5)
+
+    def test_load_more_requires_membership(self):
+        self.client.login(username="outsider", password="123")
+        url = reverse("task_kanban_more", args=[self.story.pk, Task.Status.TODO])
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_kanban_page_renders(self):
+        self.client.login(username="owner", password="123")
+        resp = self.client.get(reverse("task_kanban", args=[self.story.pk]))
+        self.assertContains(resp, "todo 0")
+        self.assertContains(resp, "doing")
+
+
+class TaskStatusUpdateTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="123")
+        self.outsider = User.objects.create_user(username="outsider", password="123")
+        self.project = Project.objects.create(name="Projeto", owner=self.owner)
+        self.story = UserStoryService.create_user_story_for_product_backlog(
+            self.project, title="US", description="desc"
+        )
+        self.tasks = [
+            Task.objects.create(user_story=self.story, title=f"task {i}")
+            for i in range(3)
+        ]
+        self.client.login(username="owner", password="123")
+
+    def test_status_update_returns_card_and_counts(self):
+        task = self.tasks[0]
+        resp = self.client.post(
+            reverse("task_update_status", args=[task.pk]), {"status": "DONE"}
+        )
+
+        data = resp.json()
+        self.assertTrue(data["success"])
+        self.assertIn(f'data-task-id="{task.pk}"', data["html"])
+        self.assertEqual(data["counts"], {"TODO": 2, "IN_PROGRESS": 0, "DONE": 1})
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.Status.DONE)
+
+    def test_status_update_rejects_unknown_status(self):
+        resp = self.client.post(
+            reverse("task_update_status", args=[self.tasks[0].pk]), {"status": "X"}
+        )
+        self.assertEqual(resp.status_code, 400)
+
+    def test_bulk_update_moves_tasks_in_one_update(self):
+        url = reverse("task_bulk_update_status", args=[self.story.pk])
+        before = {task.pk: task.updated_at for task in self.tasks}
+        data = {
+            "task": [task.pk for task in self.tasks],
+            "status": ["DONE", "DONE", "TODO"],
+        }
+
+        with self.assertNumQueries(4):
+            # SELECT and one UPDATE checking the versions, inside a savepoint
+            moved = TaskService.bulk_update_status(
+                self.story, dict(zip(data["task"], data["status"]))
+            )
+        self.assertEqual(len(moved), 2)
+
+        Task.objects.filter(pk=self.tasks[0].pk).update(status="TODO")
+        resp = self.client.post(url, data).json()
+        self.assertTrue(resp["success"])
+        self.assertEqual(resp["moved"], {str(self.tasks[0].pk): 3})
+        self.assertEqual(resp["counts"], {"TODO": 1, "IN_PROGRESS": 0, "DONE": 2})
+        for task in Task.objects.filter(pk__in=before):
+            if task.status == Task.Status.DONE:
+                self.assertGreater(task.updated_at, before[task.pk])
+
+    def test_bulk_update_rejects_tasks_of_other_stories(self):
+        other = UserStoryService.create_user_story_for_product_backlog(
+            self.project, title="Outra", description="desc"
+        )
+        foreign = Task.objects.create(user_story=other, title="alheia")
+        url = reverse("task_bulk_update_status", args=[self.story.pk])
+
+        resp = self.client.post(url, {"task": [foreign.pk], "status": ["DONE"]})
+
+        self.assertEqual(resp.status_code, 400)
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.status, Task.Status.TODO)
+
+    def test_bulk_update_requires_membership(self):
+        self.client.login(username="outsider", password="123")
+        url = reverse("task_bulk_update_status", args=[self.story.pk])
+        resp = self.client.post(url, {"task": [self.tasks[0].pk], "status": ["DONE"]})
+        self.assertEqual(resp.status_code, 403)
+
+
+class TaskVersionTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="123")
+        self.project = Project.objects.create(name="Projeto", owner=self.owner)
+        self.story = UserStoryService.create_user_story_for_product_backlog(
+            self.project, title="US", description="desc"
+        )
+        self.task = Task.objects.create(user_story=self.story, title="task")
+        self.client.login(username="owner", password="123")
+
+    def test_save_advances_version(self):
+        self.assertEqual(self.task.version, 1)
+        self.task.title = "renomeada"
+        self.task.save(update_fields=["title"])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.version, 2)
+
+    def test_status_update_writes_only_status_when_current(self):
+        url = reverse("task_update_status", args=[self.task.pk])
+
+        with self.assertNumQueries(1):
+            # One conditional UPDATE, no SELECT ... FOR UPDATE
+            TaskService.update_status(self.task, Task.Status.DONE, version=1)
+        resp = self.client.post(url, {"status": "IN_PROGRESS", "version": 2})
+
+        data = resp.json()
+        self.assertTrue(data["success"])
+        self.assertEqual(data["version"], 3)
+        self.assertIn('data-version="3"', data["html"])
+
+    def test_stale_status_update_returns_409_with_current_card(self):
+        # Someone else renamed the card and moved it meanwhile
+        Task.objects.filter(pk=self.task.pk).update(title="outra", version=5)
+        url = reverse("task_update_status", args=[self.task.pk])
+
+        resp = self.client.post(url, {"status": "DONE", "version": 1})
+
+        self.assertEqual(resp.status_code, 409)
+        data = resp.json()
+        self.assertTrue(data["conflict"])
+        self.assertEqual(data["status"], Task.Status.TODO)
+        self.assertEqual(data["version"], 5)
+        self.assertIn("outra", data["html"])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, Task.Status.TODO)
+
+    def test_stale_batch_moves_nothing(self):
+        fresh = Task.objects.create(user_story=self.story, title="nova")
+        Task.objects.filter(pk=self.task.pk).update(version=2)
+        url = reverse("task_bulk_update_status", args=[self.story.pk])
+
+        resp = self.client.post(
+            url,
+            {
+                "task": [fresh.pk, self.task.pk],
+                "status": ["DONE", "DONE"],
+                "version": [1, 1],
+            },
+        )
+
+        self.assertEqual(resp.status_code, 409)
+        self.assertEqual(resp.json()["tasks"][str(self.task.pk)]["version"], 2)
+        self.assertFalse(Task.objects.filter(status=Task.Status.DONE).exists())
+
+    def test_batch_write_racing_another_write_moves_nothing(self):
+        fresh = Task.objects.create(user_story=self.story, title="nova")
+
+        def concurrent_write(tasks, *args, **kwargs):
+            # Lands between the batch's read and its UPDATE
+            Task.objects.filter(pk=self.task.pk).update(version=F("version") + 1)
+            return bulk_update_if_current(tasks, *args, **kwargs)
+
+        with mock.patch(
+            "scrum_app.services.task_service.bulk_update_if_current",
+            side_effect=concurrent_write,
+        ):
+            with self.assertRaises(VersionConflict):
+                TaskService.bulk_update_status(
+                    self.story,
+                    {fresh.pk: Task.Status.DONE, self.task.pk: Task.Status.DONE},
+                )
+
+        self.assertFalse(Task.objects.filter(status=Task.Status.DONE).exists())
+
+    def test_edit_form_rejects_stale_version(self):
+        Task.objects.filter(pk=self.task.pk).update(version=2)
+        resp = self.client.post(
+            reverse("task_update", args=[self.task.pk]),
+            {
+                "title": "minha versão",
+                "status": "TODO",
+                "priority": "MEDIUM",
+                "version": 1,
+            },
+        )
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "alterado por outra pessoa")
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "task")
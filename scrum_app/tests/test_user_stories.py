@@ -0,0 +1,399 @@
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from scrum_app.models import (
+    Project,
+    Sprint,
+    SprintBacklog,
+    Task,
+    UserStory,
+    bulk_update_if_current,
+)
+from scrum_app.services.user_story_service import UserStoryService
+
+
+class UserStoryProjectTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="123")
+        self.project = Project.objects.create(name="Projeto", owner=self.owner)
+        self.sprint = Sprint.objects.create(
+            project=self.project,
+            name="Sprint 1",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+
+    def test_created_stories_and_tasks_carry_project(self):
+        story = UserStoryService.create_user_story_for_sprint_backlog(
+            self.sprint, title="US", description="desc"
+        )
+        task = Task.objects.create(user_story=story, title="Task")
+
+        self.assertEqual(story.project_id, self.project.pk)
+        self.assertEqual(task.project_id, self.project.pk)
+
+    def test_moves_keep_project_consistent(self):
+        story = UserStoryService.create_user_story_for_product_backlog(
+            self.project, title="US", description="desc"
+        )
+        UserStoryService.move_to_sprint(story, self.sprint)
+        story.refresh_from_db()
+        self.assertEqual(story.project_id, self.project.pk)
+        self.assertIsNone(story.product_backlog_id)
+
+        story.move_to_product_backlog(self.project)
+        story.refresh_from_db()
+        self.assertEqual(story.project_id, self.project.pk)
+        self.assertIsNone(story.sprint_backlog_id)
+
+    def test_database_keeps_stories_in_exactly_one_backlog(self):
+        story = UserStoryService.create_user_story_for_product_backlog(
+            self.project, title="US", description="desc"
+        )
+        sprint_backlog = SprintBacklog.objects.create(sprint=self.sprint)
+
+        with self.assertRaisesMessage(ValidationError, "simultaneamente"):
+            UserStoryService.update_user_story(story, sprint_backlog=sprint_backlog)
+        with self.assertRaisesMessage(ValidationError, "deve estar associada"):
+            UserStoryService.update_user_story(
+                story, product_backlog=None, sprint_backlog=None
+            )
+
+        # The savepoint leaves the surrounding transaction usable
+        story.refresh_from_db()
+        self.assertIsNotNone(story.product_backlog_id)
+        self.assertIsNone(story.sprint_backlog_id)
+
+    def test_project_lookup_needs_no_backlog_chain(self):
+        story = UserStoryService.create_user_story_for_sprint_backlog(
+            self.sprint, title="US", description="desc"
+        )
+        self.client.login(username="owner", password="123")
+        with self.assertNumQueries(5):
+            # session, user, ETag project lookup, ACL, story+project+sprint
+            resp = self.client.get(f"/user-stories/{story.pk}/")
+        self.assertEqual(resp.status_code, 200)
+
+
+class PriorityRankTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user(username="owner", password="123")
+        self.project = Project.objects.create(name="Projeto", owner=owner)
+
+    def test_backlog_orders_by_priority_not_alphabetically(self):
+        for priority in ["MEDIUM", "CRITICAL", "LOW", "HIGH"]:
+            UserStoryService.create_user_story_for_product_backlog(
+                self.project, title=priority, description="desc", priority=priority
+            )
+        self.client.login(username="owner", password="123")
+        resp = self.client.get(
+            f"/projects/{self.project.pk}/backlog/", {"sort": "priority"}
+        )
+
+        titles = [story.title for story in resp.context["page_obj"]]
+        self.assertEqual(titles, ["CRITICAL", "HIGH", "MEDIUM", "LOW"])
+
+    def test_rank_follows_priority_on_partial_save(self):
+        story = UserStoryService.create_user_story_for_product_backlog(
+            self.project, title="US", description="desc", priority="LOW"
+        )
+        task = Task.objects.create(user_story=story, title="Task", priority="HIGH")
+        self.assertEqual((story.priority_rank, task.priority_rank), (1, 3))
+
+        story.priority = "CRITICAL"
+        story.save(update_fields=["priority"])
+        story.refresh_from_db()
+        self.assertEqual(story.priority_rank, 4)
+
+
+class BacklogPositionTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="123")
+        self.project = Project.objects.create(name="Projeto", owner=self.owner)
+        self.sprint = Sprint.objects.create(
+            project=self.project,
+            name="Sprint 1",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+        self.stories = [
+            UserStoryService.create_user_story_for_product_backlog(
+                self.project, title=f"US {i}", description="desc"
+            )
+            for i in range(4)
+        ]
+
+    def _manual_order(self):
+        return list(
+            UserStory.objects.filter(product_backlog__project=self.project)
+            .order_by(*UserStoryService.POSITION_ORDERING)
+            .values_list("title", flat=True)
+        )
+
+    def test_new_stories_are_appended(self):
+        self.assertEqual(self._manual_order(), ["US 0", "US 1", "US 2", "US 3"])
+
+    def test_reorder_endpoint_writes_one_row(self):
+        first, _, _, last = self.stories
+        self.client.login(username="owner", password="123")
+        url = reverse("user_story_reorder", args=[last.pk])
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.post(url, {"after": first.pk})
+        self.assertTrue(resp.json()["success"])
+        writes = [q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(self._manual_order(), ["US 3", "US 0", "US 1", "US 2"])
+
+    def test_moved_story_goes_to_the_end_of_its_new_backlog(self):
+        UserStoryService.move_to_sprint(self.stories[0], self.sprint)
+        UserStoryService.move_to_product_backlog(self.stories[0], self.project)
+        self.assertEqual(self._manual_order(), ["US 1", "US 2", "US 3", "US 0"])
+
+    def test_rebalance_keeps_order_and_shortens_keys(self):
+        first, after = self.stories[:2]
+        for i in range(40):
+            # Keep squeezing stories right after the first one
+            mover = self.stories[2 + i % 2]
+            UserStoryService.reorder(mover, before=first, after=after)
+            after = mover
+        order = self._manual_order()
+        self.assertGreater(len(after.position), 2)
+
+        call_command("rebalance_backlogs", min_length=1, stdout=StringIO())
+        self.assertEqual(self._manual_order(), order)
+        longest = max(len(s.position) for s in UserStory.objects.all())
+        self.assertLessEqual(longest, 2)
+
+    def test_product_backlog_can_still_sort_by_priority(self):
+        self.stories[2].priority = "CRITICAL"
+        self.stories[2].save()
+        self.client.login(username="owner", password="123")
+        resp = self.client.get(
+            reverse("product_backlog", args=[self.project.pk]), {"sort": "priority"}
+        )
+        self.assertEqual(resp.context["page_obj"].object_list[0].title, "US 2")
+
+
+class BulkMoveTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="123")
+        self.project = Project.objects.create(name="Projeto", owner=self.owner)
+        self.sprint = Sprint.objects.create(
+            project=self.project,
+            name="Sprint 1",
+            start_date=date.today(),
+            end_date=date.today() + timedelta(days=7),
+        )
+        self.stories = [
+            UserStoryService.create_user_story_for_product_backlog(
+                self.project, title=f"US {i}", description="desc"
+            )
+            for i in range(4)
+        ]
+        self.client.login(username="owner", password="123")
+
+    def test_batch_moves_with_one_update(self):
+        ids = [story.pk for story in self.stories[:3]]
+        # Stories living in the sprint already keep their place
+        existing = UserStoryService.create_user_story_for_sprint_backlog(
+            self.sprint, title="Sprint US", description="desc"
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            moved, errors = UserStoryService.bulk_move(
+                self.project, list(reversed(ids)), self.sprint
+            )
+
+        self.assertEqual(errors, {})
+        self.assertEqual(len(moved), 3)
+        updates = [q for q in queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+
+        # Appended after the existing story, in their former backlog order
+        order = list(
+            UserStory.objects.filter(sprint_backlog__sprint=self.sprint)
+            .order_by(*UserStoryService.POSITION_ORDERING)
+            .values_list("pk", flat=True)
+        )
+        self.assertEqual(order, [existing.pk, *ids])
+        for story in UserStory.objects.filter(pk__in=ids):
+            self.assertIsNone(story.product_backlog_id)
+            self.assertEqual(story.version, 2)
+
+    def test_rejected_stories_are_reported(self):
+        other = Project.objects.create(name="Outro", owner=self.owner)
+        foreign = UserStoryService.create_user_story_for_product_backlog(
+            other, title="Alheia", description="desc"
+        )
+
+        moved, errors = UserStoryService.bulk_move(
+            self.project, [self.stories[0].pk, foreign.pk, 999999], self.sprint
+        )
+
+        self.assertEqual([story.pk for story in moved], [self.stories[0].pk])
+        self.assertEqual(set(errors), {foreign.pk, 999999})
+        foreign.refresh_from_db()
+        self.assertIsNotNone(foreign.product_backlog_id)
+
+        moved, errors = UserStoryService.bulk_move(
+            self.project, [self.stories[0].pk], self.sprint
+        )
+        self.assertEqual(moved, [])
+        self.assertIn("já está", errors[self.stories[0].pk])
+
+    def test_backlog_pages_post_the_selection(self):
+        backlog_url = reverse("product_backlog", args=[self.project.pk])
+        self.assertContains(self.client.get(backlog_url), 'id="bulk-move-form"')
+
+        resp = self.client.post(
+            reverse("user_story_bulk_move", args=[self.project.pk]),
+            {
+                "stories": [self.stories[0].pk, self.stories[1].pk],
+                "target": self.sprint.pk,
+                "next": backlog_url,
+            },
+        )
+
+        self.assertRedirects(resp, backlog_url, fetch_redirect_response=False)
+        self.assertEqual(
+            UserStory.objects.filter(sprint_backlog__sprint=self.sprint).count(), 2
+        )
+
+        sprint_url = reverse("sprint_backlog", args=[self.sprint.pk])
+        resp = self.client.post(
+            reverse("user_story_bulk_move", args=[self.project.pk]),
+            {"stories": [self.stories[0].pk], "target": "product", "next": sprint_url},
+        )
+        self.assertRedirects(resp, sprint_url, fetch_redirect_response=False)
+        self.stories[0].refresh_from_db()
+        self.assertIsNotNone(self.stories[0].product_backlog_id)
+
+    def test_empty_selection_is_refused(self):
+        resp = self.client.post(
+            reverse("user_story_bulk_move", args=[self.project.pk]),
+            {"target": self.sprint.pk, "next": "https://example.com/"},
+            follow=True,
+        )
+        self.assertRedirects(resp, reverse("product_backlog", args=[self.project.pk]))
+        self.assertContains(resp, "Selecione ao menos uma user story.")
+
+
+class BulkEditTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", password="123")
+        self.project = Project.objects.create(name="Projeto", owner=self.owner)
+        self.stories = [
+            UserStoryService.create_user_story_for_product_backlog(
+                self.project, title=f"US {i}", description="desc"
+            )
+            for i in range(3)
+        ]
+        self.client.login(username="owner", password="123")
+
+    def test_only_changed_columns_are_written(self):
+        first, second, _ = self.stories
+
+        with CaptureQueriesContext(connection) as queries:
+            updated, errors = UserStoryService.bulk_edit(
+                self.project,
+                {
+                    first.pk: {"priority": "CRITICAL"},
+                    second.pk: {"story_points": "8", "status": "TODO"},
+                },
+            )
+
+        self.assertEqual(errors, {})
+        self.assertEqual({story.pk for story in updated}, {first.pk, second.pk})
+        (update,) = [q["sql"] for q in queries if q["sql"].startswith("UPDATE")]
+        self.assertIn('"priority_rank"', update)
+        self.assertIn('"story_points"', update)
+        # Unchanged everywhere: not part of the statement
+        self.assertNotIn('"status"', update)
+        self.assertNotIn('"title"', update)
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.priority_rank, UserStory.PRIORITY_RANKS["CRITICAL"])
+        self.assertEqual(first.version, 2)
+        self.assertEqual(second.story_points, 8)
+
+    def test_invalid_rows_are_reported_and_others_saved(self):
+        first, second, third = self.stories
+
+        updated, errors = UserStoryService.bulk_edit(
+            self.project,
+            {
+                first.pk: {"priority": "URGENT"},
+                second.pk: {"status": "DONE"},
+                third.pk: {"status": "DONE"},
+            },
+            versions={third.pk: third.version - 1},
+        )
+
+        self.assertEqual([story.pk for story in updated], [second.pk])
+        self.assertIn("priority", errors[first.pk])
+        self.assertIn("__all__", errors[third.pk])
+        first.refresh_from_db()
+        self.assertEqual(first.priority, "MEDIUM")
+
+    def test_story_written_meanwhile_is_reported_not_overwritten(self):
+        first, second, _ = self.stories
+
+        def concurrent_write(stories, *args, **kwargs):
+            # Lands between the bulk edit's read and its UPDATE
+            UserStory.objects.filter(pk=first.pk).update(
+                status="DONE", version=F("version") + 1
+            )
+            return bulk_update_if_current(stories, *args, **kwargs)
+
+        with mock.patch(
+            "scrum_app.services.user_story_service.bulk_update_if_current",
+            side_effect=concurrent_write,
+        ):
+            updated, errors = UserStoryService.bulk_edit(
+                self.project,
+                {first.pk: {"status": "IN_PROGRESS"}, second.pk: {"status": "DONE"}},
+            )
+
+        self.assertEqual([story.pk for story in updated], [second.pk])
+        self.assertIn("alterada por outra pessoa", errors[first.pk]["__all__"])
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.version), ("DONE", 2))
+        second.refresh_from_db()
+        self.assertEqual((second.status, second.version), ("DONE", 2))
+
+    def test_endpoint_takes_the_changed_cells(self):
+        story = self.stories[0]
+        resp = self.client.post(
+            reverse("user_story_bulk_edit", args=[self.project.pk]),
+            {
+                f"{story.pk}-status": "IN_PROGRESS",
+                f"{story.pk}-story_points": "",
+                f"{story.pk}-version": story.version,
+            },
+        )
+
+        data = resp.json()
+        self.assertTrue(data["success"])
+        self.assertEqual(data["updated"][str(story.pk)]["status"], "IN_PROGRESS")
+        self.assertEqual(data["updated"][str(story.pk)]["version"], 2)
+
+    def test_non_members_are_refused(self):
+        User.objects.create_user(username="outsider", password="123")
+        self.client.login(username="outsider", password="123")
+        resp = self.client.post(
+            reverse("user_story_bulk_edit", args=[self.project.pk]),
+            {f"{self.stories[0].pk}-status": "DONE"},
+        )
+        self.assertEqual(resp.status_code, 403)
@@ -0,0 +1,60 @@
+"""Server-Sent Events streams of board changes (see scrum_app.events)."""
+
+from django.contrib.auth.decorators import login_required
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+
+from scrum_app.events import event_stream, sprint_backlog_channel, story_channel
+from scrum_app.models import Sprint, SprintBacklog, UserStory
+
+
+async def _refusal(request, project_id):
+    """Response refusing the stream, or None when it may be opened."""
+    # Under WSGI a never-ending async stream would be buffered forever;
+    # 204 tells EventSource to stop reconnecting.
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+
+    if not await request.access.ais_member(project_id):
+        return JsonResponse({"success": False, "error": "Acesso negado"}, status=403)
+    return None
+
+
+def _stream_response(channel):
+    response = StreamingHttpResponse(
+        event_stream(channel), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Keep reverse proxies from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@login_required
+async def user_story_events_view(request, user_story_pk):
+    """Live task changes of a user story's Kanban board."""
+    project_id = (
+        await UserStory.objects.filter(pk=user_story_pk)
+        .order_by()
+        .values_list("project_id", flat=True)
+        .afirst()
+    )
+    if project_id is None:
+        raise Http404
+    refusal = await _refusal(request, project_id)
+    if refusal is not None:
+        return refusal
+    return _stream_response(story_channel(user_story_pk))
+
+
+@login_required
+async def sprint_backlog_events_view(request, sprint_pk):
+    """Live story changes of a sprint backlog."""
+    sprint = await Sprint.objects.filter(pk=sprint_pk).order_by().afirst()
+    if sprint is None:
+        raise Http404
+    refusal = await _refusal(request, sprint.project_id)
+    if refusal is not None:
+        return refusal
+    sprint_backlog, _ = await SprintBacklog.objects.aget_or_create(sprint=sprint)
+    return _stream_response(sprint_backlog_channel(sprint_backlog.pk))
@@ -3,60 +3,44 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, permission_required
 from django.core.exceptions import PermissionDenied
-from django.core.paginator import Paginator
-from django.shortcuts import get_object_or_404, redirect, render
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
 
+from ..conditional import project_condition, project_id_kwarg
 from ..forms import ProjectForm
 from ..models import Project
+from ..pagination import COUNT_NONE, KeysetPaginator
 from ..services import ProjectService
-
-
-def _require_project_member(project: Project, user) -> None:
-    """Ensure user belongs to the project (owner or ProjectMember)."""
-    if not project.is_member(user):
-        raise PermissionDenied
-
-
-def _require_project_editor(project: Project, user) -> None:
-    """Ensure user can manage the project.
-
-    Allowed:
-    - Owner
-    - User in global Django group 'editor'
-    (But must still be a project member; checked separately)
-    """
-    if project.is_owner(user):
-        return
-    if user.groups.filter(name="editor").exists():
-        return
-    raise PermissionDenied
+from .rendering import arender
 
 
 @login_required
 @permission_required("scrum_app.view_project", raise_exception=True)
-def project_list_view(request):
+async def project_list_view(request):
     """List projects where the current user is owner OR member."""
-    projects = ProjectService.get_user_projects(request.user)
+    projects = ProjectService.get_user_projects(await request.auser())
 
-    paginator = Paginator(projects, 10)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    paginator = KeysetPaginator(
+        projects, ["-created_at", "-id"], 10, count_mode=COUNT_NONE
+    )
+    page_obj = await paginator.aget_page(request.GET.get("cursor"))
 
-    return render(request, "projects/project_list.html", {"page_obj": page_obj})
+    return await arender(request, "projects/project_list.html", {"page_obj": page_obj})
 
 
 @login_required
 @permission_required("scrum_app.view_project", raise_exception=True)
-def project_detail_view(request, pk):
+@project_condition(project_id_kwarg("pk"), vary_on_perms=True)
+async def project_detail_view(request, pk):
     """Display project details. Requires membership."""
-    project = get_object_or_404(Project, pk=pk)
-    _require_project_member(project, request.user)
+    if not await request.access.ais_member(pk):
+        raise PermissionDenied
+    project = await aget_object_or_404(
+        ProjectService.with_stats(Project.objects.select_related("owner")), pk=pk
+    )
 
-    can_manage = project.is_owner(request.user) or request.user.groups.filter(
-        name="editor"
-    ).exists()
+    can_manage = await request.access.acan_manage(project)
 
-    return render(
+    return await arender(
         request,
         "projects/project_detail.html",
         {"project": project, "can_manage": can_manage},
@@ -88,8 +72,8 @@ def project_create_view(request):
 def project_update_view(request, pk):
     """Update a project. Allowed: owner or editor (must be member)."""
     project = get_object_or_404(Project, pk=pk)
-    _require_project_member(project, request.user)
-    _require_project_editor(project, request.user)
+    request.access.require_member(project)
+    request.access.require_editor(project)
 
     if request.method == "POST":
         form = ProjectForm(request.POST, instance=project)
@@ -119,8 +103,8 @@ def project_update_view(request, pk):
 def project_delete_view(request, pk):
     """Delete a project. Allowed: owner or editor (must be member)."""
     project = get_object_or_404(Project, pk=pk)
-    _require_project_member(project, request.user)
-    _require_project_editor(project, request.user)
+    request.access.require_member(project)
+    request.access.require_editor(project)
 
     if request.method == "POST":
         project_name = ProjectService.delete_project(project)
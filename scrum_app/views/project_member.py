@@ -3,7 +3,6 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, permission_required
 from django.contrib.auth.models import Group
-from django.core.exceptions import PermissionDenied
 from django.shortcuts import get_object_or_404, redirect, render
 
 from ..forms import AddMemberForm
@@ -11,42 +10,18 @@ from ..models import Project, ProjectMember
 from ..services import ProjectMemberService
 
 
-def _require_project_member(project: Project, user) -> None:
-    """User must be owner or an added member (ProjectMember)."""
-    if not project.is_member(user):
-        raise PermissionDenied
-
-
-def _require_project_editor(project: Project, user) -> None:
-    """Only editors/admin can manage members (within projects they belong to).
-
-    Rule:
-    - Superuser is always allowed
-    - Owner is always allowed
-    - Users in Django group 'editor' are allowed (but must still be project members)
-    """
-    if user.is_superuser:
-        return
-    if project.is_owner(user):
-        return
-    if user.groups.filter(name="editor").exists():
-        return
-    raise PermissionDenied
-
-
 @login_required
 @permission_required("scrum_app.view_project", raise_exception=True)
 def project_members_view(request, pk):
     """List members of a project (allowed: project members)."""
-    project = get_object_or_404(Project, pk=pk)
-    _require_project_member(project, request.user)
+    project = get_object_or_404(Project.objects.select_related("owner"), pk=pk)
+    request.access.require_member(project)
 
-    page_number = request.GET.get("page")
-    members_page = ProjectMemberService.get_project_members_page(project, page_number)
+    members_page = ProjectMemberService.get_project_members_page(
+        project, request.GET.get("cursor")
+    )
 
-    can_manage = request.user.is_superuser or project.is_owner(
-        request.user
-    ) or request.user.groups.filter(name="editor").exists()
+    can_manage = request.access.can_manage(project, allow_superuser=True)
 
     return render(
         request,
@@ -64,8 +39,8 @@ def project_members_view(request, pk):
 def project_add_member_view(request, pk):
     """Add a member to a project (allowed: editor/admin within the project)."""
     project = get_object_or_404(Project, pk=pk)
-    _require_project_member(project, request.user)
-    _require_project_editor(project, request.user)
+    request.access.require_member(project)
+    request.access.require_editor(project, allow_superuser=True)
 
     if request.method == "POST":
         form = AddMemberForm(request.POST, project=project)
@@ -98,8 +73,8 @@ def project_add_member_view(request, pk):
 def project_remove_member_view(request, pk, member_id):
     """Remove a member from a project (allowed: editor/admin within the project)."""
     project = get_object_or_404(Project, pk=pk)
-    _require_project_member(project, request.user)
-    _require_project_editor(project, request.user)
+    request.access.require_member(project)
+    request.access.require_editor(project, allow_superuser=True)
 
     member = get_object_or_404(ProjectMember, pk=member_id, project=project)
 
@@ -0,0 +1,23 @@
+"""Rendering helpers for the async views."""
+
+from asgiref.sync import sync_to_async
+from django.shortcuts import render
+
+
+async def arender(request, template_name, context):
+    """
+    render() for async views.
+
+    Templates read ``request.user`` (through the auth context processor),
+    whose first access loads the user synchronously; it is replaced by the
+    user ``request.auser()`` has already resolved. Everything else in
+    ``context`` must be evaluated beforehand. The template renders off the
+    event loop, since ``{% fragmentcache %}`` reads and writes the cache.
+    """
+    request.user = await request.auser()
+    return await sync_to_async(render)(request, template_name, context)
+
+
+async def alist(queryset):
+    """Evaluate ``queryset`` through the async ORM, ahead of rendering."""
+    return [obj async for obj in queryset]
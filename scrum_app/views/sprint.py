@@ -1,74 +1,44 @@
 from django.contrib.auth.decorators import login_required, permission_required
-from django.core.exceptions import PermissionDenied
-from django.core.paginator import Paginator
-from django.shortcuts import get_object_or_404, redirect, render
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
 
+from ..conditional import project_condition, project_id_from
 from ..forms.sprint_forms import SprintForm
-from ..models import Project, Sprint
+from ..models import Project, Sprint, save_checked
+from ..pagination import COUNT_NONE, KeysetPaginator
+from .rendering import arender
 
 
 # Helpers
 
-def _get_project_or_404(project_id, user):
+def _get_project_or_404(project_id, access):
     project = get_object_or_404(Project, id=project_id)
-    if not project.is_member(user):
-        raise PermissionDenied
+    access.require_member(project)
     return project
 
 
-def _get_sprint_or_404(sprint_id, user):
-    sprint = get_object_or_404(Sprint, id=sprint_id)
-    if not sprint.project.is_member(user):
-        raise PermissionDenied
+def _get_sprint_or_404(sprint_id, access):
+    sprint = get_object_or_404(Sprint.objects.select_related("project"), id=sprint_id)
+    access.require_member(sprint.project_id)
     return sprint
 
 
-def _require_project_editor(project: Project, user) -> None:
-    """Allow management within a project.
-
-    Allowed:
-    - superuser
-    - project owner
-    - user in global group 'editor'
-    NOTE: must be project member (owner counts as member in your model)
-    """
-    if user.is_superuser:
-        return
-
-    if not project.is_member(user):
-        raise PermissionDenied
-
-    if project.is_owner(user):
-        return
-
-    if user.groups.filter(name="editor").exists():
-        return
-
-    raise PermissionDenied
-
-
-def _can_manage_sprint(project: Project, user) -> bool:
-    """Used for UI (show/hide buttons)."""
-    return (
-        user.is_superuser
-        or project.is_owner(user)
-        or user.groups.filter(name="editor").exists()
-    )
-
-
 # Sprint views
 
 @login_required
 @permission_required("scrum_app.view_sprint", raise_exception=True)
 def sprint_list_view(request, project_id):
-    project = _get_project_or_404(project_id, request.user)
+    project = _get_project_or_404(project_id, request.access)
 
-    qs = project.sprints.all().order_by("-start_date", "-created_at")
-    paginator = Paginator(qs, 10)
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    paginator = KeysetPaginator(
+        project.sprints.all(),
+        ["-start_date", "-created_at", "-id"],
+        10,
+        count_mode=COUNT_NONE,
+    )
+    page_obj = paginator.get_page(request.GET.get("cursor"))
 
-    can_manage = _can_manage_sprint(project, request.user)
+    can_manage = request.access.can_manage(project, allow_superuser=True)
 
     return render(
         request,
@@ -79,13 +49,18 @@ def sprint_list_view(request, project_id):
 
 @login_required
 @permission_required("scrum_app.view_sprint", raise_exception=True)
-def sprint_detail_view(request, sprint_id):
-    sprint = _get_sprint_or_404(sprint_id, request.user)
+@project_condition(project_id_from(Sprint, "sprint_id"))
+async def sprint_detail_view(request, sprint_id):
+    sprint = await aget_object_or_404(
+        Sprint.objects.select_related("project"), id=sprint_id
+    )
     project = sprint.project
+    if not await request.access.ais_member(project):
+        raise PermissionDenied
 
-    can_manage = _can_manage_sprint(project, request.user)
+    can_manage = await request.access.acan_manage(project, allow_superuser=True)
 
-    return render(
+    return await arender(
         request,
         "sprints/sprint_detail.html",
         {"project": project, "sprint": sprint, "can_manage": can_manage},
@@ -95,17 +70,20 @@ def sprint_detail_view(request, sprint_id):
 @login_required
 @permission_required("scrum_app.add_sprint", raise_exception=True)
 def sprint_create_view(request, project_id):
-    project = _get_project_or_404(project_id, request.user)
-    _require_project_editor(project, request.user)
+    project = _get_project_or_404(project_id, request.access)
+    request.access.require_editor(project, allow_superuser=True)
 
     if request.method == "POST":
         form = SprintForm(request.POST)
         if form.is_valid():
             sprint = form.save(commit=False)
             sprint.project = project
-            sprint.full_clean()
-            sprint.save()
-            return redirect("sprint_list", project_id=project.id)
+            try:
+                save_checked(sprint)
+            except ValidationError as exc:
+                form.add_error(None, exc)
+            else:
+                return redirect("sprint_list", project_id=project.id)
     else:
         form = SprintForm()
 
@@ -125,17 +103,20 @@ def sprint_create_view(request, project_id):
 @login_required
 @permission_required("scrum_app.change_sprint", raise_exception=True)
 def sprint_update_view(request, sprint_id):
-    sprint = _get_sprint_or_404(sprint_id, request.user)
+    sprint = _get_sprint_or_404(sprint_id, request.access)
     project = sprint.project
-    _require_project_editor(project, request.user)
+    request.access.require_editor(project, allow_superuser=True)
 
     if request.method == "POST":
         form = SprintForm(request.POST, instance=sprint)
         if form.is_valid():
             sprint = form.save(commit=False)
-            sprint.full_clean()
-            sprint.save()
-            return redirect("sprint_detail", sprint_id=sprint.id)
+            try:
+                save_checked(sprint)
+            except ValidationError as exc:
+                form.add_error(None, exc)
+            else:
+                return redirect("sprint_detail", sprint_id=sprint.id)
     else:
         form = SprintForm(instance=sprint)
 
@@ -156,13 +137,12 @@ def sprint_update_view(request, sprint_id):
 @login_required
 @permission_required("scrum_app.change_sprint", raise_exception=True)
 def sprint_close_view(request, sprint_id):
-    sprint = _get_sprint_or_404(sprint_id, request.user)
+    sprint = _get_sprint_or_404(sprint_id, request.access)
     project = sprint.project
-    _require_project_editor(project, request.user)
+    request.access.require_editor(project, allow_superuser=True)
 
     if request.method == "POST":
         sprint.status = Sprint.Status.CLOSED
-        sprint.full_clean()
-        sprint.save()
+        sprint.save(update_fields=["status", "updated_at"])
 
     return redirect("sprint_detail", sprint_id=sprint.id)
\ No newline at end of file
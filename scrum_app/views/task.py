@@ -1,62 +1,104 @@
 """Views for Task management and Kanban board."""
 
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
-from django.shortcuts import get_object_or_404, redirect, render
-from django.views.decorators.http import require_POST
+from django.http import Http404, JsonResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.views.decorators.http import require_GET, require_POST
 
+from scrum_app.conditional import project_condition, project_id_from
 from scrum_app.forms.task_forms import TaskCommentForm, TaskForm
-from scrum_app.models import Task, TaskComment, UserStory
+from scrum_app.generations import STORY, aget_generation
+from scrum_app.models import Task, TaskComment, UserStory, VersionConflict
+from scrum_app.services.task_service import TASK_BULK_STATUS_LIMIT, TaskService
+from scrum_app.views.rendering import alist, arender
 
 
-def _get_project_from_user_story(user_story):
-    """Helper to get project from user story."""
-    if user_story.product_backlog:
-        return user_story.product_backlog.project
-    return user_story.sprint_backlog.sprint.project
-
-
-def _check_user_access(user, project):
-    """Helper to check if user has access to project."""
-    return project.is_member(user)
+def _get_task_or_404(pk):
+    """Load a task with its story, project and assignee in one query."""
+    return get_object_or_404(
+        Task.objects.select_related("user_story", "project", "assigned_to"), pk=pk
+    )
 
 
 @login_required
-def task_kanban_view(request, user_story_pk):
+@project_condition(project_id_from(UserStory, "user_story_pk"))
+async def task_kanban_view(request, user_story_pk):
     """View to display Kanban board for a user story's tasks."""
-    user_story = get_object_or_404(UserStory, pk=user_story_pk)
-    project = _get_project_from_user_story(user_story)
+    user_story = await aget_object_or_404(
+        UserStory.objects.select_related("project"), pk=user_story_pk
+    )
+    project = user_story.project
 
     # Check if user is member or owner
-    if not _check_user_access(request.user, project):
+    if not await request.access.ais_member(project):
         messages.error(request, "Você não tem permissão para acessar esta user story.")
         return redirect("project_list")
 
-    # Get tasks grouped by status
-    tasks_todo = user_story.tasks.filter(status=Task.Status.TODO)
-    tasks_in_progress = user_story.tasks.filter(status=Task.Status.IN_PROGRESS)
-    tasks_done = user_story.tasks.filter(status=Task.Status.DONE)
+    # Read before the board query so a concurrent write is never cached
+    # under the generation that follows it
+    cache_generation = await aget_generation(STORY, user_story.pk)
+
+    # One query for every column (capped), counts included
+    board = await TaskService.aget_kanban_board(user_story)
 
     context = {
         "user_story": user_story,
         "project": project,
-        "tasks_todo": tasks_todo,
-        "tasks_in_progress": tasks_in_progress,
-        "tasks_done": tasks_done,
+        "column_todo": board[Task.Status.TODO],
+        "column_in_progress": board[Task.Status.IN_PROGRESS],
+        "column_done": board[Task.Status.DONE],
+        "cache_generation": cache_generation,
     }
 
-    return render(request, "tasks/task_kanban.html", context)
+    return await arender(request, "tasks/task_kanban.html", context)
+
+
+@login_required
+@require_GET
+def task_kanban_more_view(request, user_story_pk, status):
+    """AJAX view returning the next cards of one Kanban column."""
+    user_story = get_object_or_404(UserStory, pk=user_story_pk)
+
+    if not request.access.is_member(user_story.project_id):
+        return JsonResponse({"success": False, "error": "Acesso negado"}, status=403)
+
+    if status not in Task.Status.values:
+        raise Http404
+
+    try:
+        offset = max(int(request.GET.get("offset", 0)), 0)
+    except ValueError:
+        offset = 0
+
+    tasks, has_more = TaskService.get_kanban_column_page(user_story, status, offset)
+    html = "".join(
+        render_to_string("tasks/_kanban_card.html", {"task": task}, request=request)
+        for task in tasks
+    )
+
+    return JsonResponse(
+        {
+            "success": True,
+            "html": html,
+            "has_more": has_more,
+            "next_offset": offset + len(tasks),
+        }
+    )
 
 
 @login_required
 def task_create_view(request, user_story_pk):
     """Create a new task for a user story."""
-    user_story = get_object_or_404(UserStory, pk=user_story_pk)
-    project = _get_project_from_user_story(user_story)
+    user_story = get_object_or_404(
+        UserStory.objects.select_related("project"), pk=user_story_pk
+    )
+    project = user_story.project
 
     # Check if user is member or owner
-    if not _check_user_access(request.user, project):
+    if not request.access.is_member(project):
         messages.error(request, "Você não tem permissão para acessar esta user story.")
         return redirect("project_list")
 
@@ -83,12 +125,12 @@ def task_create_view(request, user_story_pk):
 @login_required
 def task_update_view(request, pk):
     """Update an existing task."""
-    task = get_object_or_404(Task, pk=pk)
+    task = _get_task_or_404(pk)
     user_story = task.user_story
-    project = _get_project_from_user_story(user_story)
+    project = task.project
 
     # Check if user is member or owner
-    if not _check_user_access(request.user, project):
+    if not request.access.is_member(project):
         messages.error(request, "Você não tem permissão para editar esta task.")
         return redirect("project_list")
 
@@ -115,17 +157,17 @@ def task_update_view(request, pk):
 @login_required
 def task_delete_view(request, pk):
     """Delete a task."""
-    task = get_object_or_404(Task, pk=pk)
+    task = _get_task_or_404(pk)
     user_story = task.user_story
-    project = _get_project_from_user_story(user_story)
+    project = task.project
 
     # Check if user is member or owner
-    if not _check_user_access(request.user, project):
+    if not request.access.is_member(project):
         messages.error(request, "Você não tem permissão para excluir esta task.")
         return redirect("project_list")
 
     if request.method == "POST":
-        user_story_pk = task.user_story.pk
+        user_story_pk = task.user_story_id
         task.delete()
         messages.success(request, "Task excluída com sucesso!")
         return redirect("task_kanban", user_story_pk=user_story_pk)
@@ -140,76 +182,197 @@ def task_delete_view(request, pk):
 
 
 @login_required
-def task_detail_view(request, pk):
+@project_condition(project_id_from(Task, "pk"))
+async def task_detail_view(request, pk):
     """Display task details with comments."""
-    task = get_object_or_404(Task, pk=pk)
+    task = await aget_object_or_404(
+        Task.objects.select_related("user_story", "project", "assigned_to"), pk=pk
+    )
     user_story = task.user_story
-    project = _get_project_from_user_story(user_story)
+    project = task.project
 
     # Check if user is member or owner
-    if not _check_user_access(request.user, project):
+    if not await request.access.ais_member(project):
         messages.error(request, "Você não tem permissão para visualizar esta task.")
         return redirect("project_list")
 
     # Handle comment submission
     if request.method == "POST":
         comment_form = TaskCommentForm(request.POST)
-        if comment_form.is_valid():
+        if await sync_to_async(comment_form.is_valid)():
             comment = comment_form.save(commit=False)
             comment.task = task
-            comment.author = request.user
-            comment.save()
+            comment.author = await request.auser()
+            await comment.asave()
             messages.success(request, "Comentário adicionado com sucesso!")
             return redirect("task_detail", pk=task.pk)
     else:
         comment_form = TaskCommentForm()
 
-    comments = task.comments.all()
-
     context = {
         "task": task,
         "user_story": user_story,
         "project": project,
-        "comments": comments,
+        "comments": await alist(
+            TaskComment.objects.filter(task=task).select_related("author")
+        ),
         "comment_form": comment_form,
+        "is_project_owner": await request.access.ais_owner(project),
     }
 
-    return render(request, "tasks/task_detail.html", context)
+    return await arender(request, "tasks/task_detail.html", context)
+
+
+def _kanban_card_payload(request, task):
+    """JSON fields describing one card after a status change (or conflict)."""
+    return {
+        "status": task.status,
+        "version": task.version,
+        "html": render_to_string(
+            "tasks/_kanban_card.html", {"task": task}, request=request
+        ),
+        "counts": TaskService.get_column_counts(task.user_story_id),
+    }
+
+
+@login_required
+@require_GET
+def task_kanban_card_view(request, pk):
+    """AJAX view returning one card, for boards following live events."""
+    task = get_object_or_404(Task.objects.select_related("assigned_to"), pk=pk)
+
+    if not request.access.is_member(task.project_id):
+        return JsonResponse({"success": False, "error": "Acesso negado"}, status=403)
+
+    return JsonResponse({"success": True, **_kanban_card_payload(request, task)})
 
 
 @login_required
 @require_POST
 def task_update_status_view(request, pk):
-    """AJAX view to update task status (for drag and drop in Kanban)."""
-    task = get_object_or_404(Task, pk=pk)
-    user_story = task.user_story
-    project = _get_project_from_user_story(user_story)
+    """
+    AJAX view to update task status (for drag and drop in Kanban).
+
+    Returns the re-rendered card and the new column counts so the board is
+    patched in place instead of reloaded. When the card changed since the
+    posted ``version`` nothing is written and the current card comes back
+    with a 409.
+    """
+    task = get_object_or_404(Task.objects.select_related("assigned_to"), pk=pk)
 
     # Check if user is member or owner
-    if not _check_user_access(request.user, project):
+    if not request.access.is_member(task.project_id):
         return JsonResponse({"success": False, "error": "Acesso negado"}, status=403)
 
     new_status = request.POST.get("status")
 
-    if new_status in dict(Task.Status.choices):
-        task.status = new_status
-        task.save()
-        return JsonResponse({"success": True})
+    if new_status not in Task.Status.values:
+        return JsonResponse({"success": False, "error": "Status inválido"}, status=400)
+
+    # Clients that do not send a version compare against the row read above
+    version = request.POST.get("version")
+    try:
+        version = int(version) if version else None
+    except ValueError:
+        return JsonResponse({"success": False, "error": "Versão inválida"}, status=400)
+
+    try:
+        TaskService.update_status(task, new_status, version)
+    except Task.DoesNotExist as exc:
+        raise Http404 from exc
+    except VersionConflict as conflict:
+        return JsonResponse(
+            {
+                "success": False,
+                "error": "A task foi alterada por outra pessoa.",
+                "conflict": True,
+                **_kanban_card_payload(request, conflict.current),
+            },
+            status=409,
+        )
+
+    return JsonResponse({"success": True, **_kanban_card_payload(request, task)})
 
-    return JsonResponse({"success": False, "error": "Status inválido"}, status=400)
+
+@login_required
+@require_POST
+def task_bulk_update_status_view(request, user_story_pk):
+    """
+    AJAX view moving many tasks of a user story at once.
+
+    Expects repeated ``task``/``status`` pairs, optionally with a matching
+    ``version`` each, and applies them in a single transaction ("move all
+    remaining tasks to DONE"). Any version conflict cancels the whole batch
+    with a 409 carrying the current state of the requested tasks.
+    """
+    user_story = get_object_or_404(UserStory, pk=user_story_pk)
+
+    if not request.access.is_member(user_story.project_id):
+        return JsonResponse({"success": False, "error": "Acesso negado"}, status=403)
+
+    task_ids = request.POST.getlist("task")
+    statuses = request.POST.getlist("status")
+    posted_versions = request.POST.getlist("version")
+    if (
+        not task_ids
+        or len(task_ids) != len(statuses)
+        or posted_versions and len(posted_versions) != len(task_ids)
+        or len(task_ids) > TASK_BULK_STATUS_LIMIT
+        or any(status not in Task.Status.values for status in statuses)
+    ):
+        return JsonResponse(
+            {"success": False, "error": "Alterações inválidas"}, status=400
+        )
+
+    try:
+        task_ids = [int(task_id) for task_id in task_ids]
+        versions = {
+            task_id: int(version)
+            for task_id, version in zip(task_ids, posted_versions)
+            if version
+        }
+        moved = TaskService.bulk_update_status(
+            user_story, dict(zip(task_ids, statuses)), versions
+        )
+    except (ValueError, Task.DoesNotExist):
+        return JsonResponse({"success": False, "error": "Task inválida"}, status=400)
+    except VersionConflict:
+        current = Task.objects.filter(pk__in=task_ids).values_list(
+            "pk", "status", "version"
+        )
+        return JsonResponse(
+            {
+                "success": False,
+                "error": "Algumas tasks foram alteradas por outra pessoa.",
+                "conflict": True,
+                "tasks": {
+                    pk: {"status": status, "version": version}
+                    for pk, status, version in current
+                },
+                "counts": TaskService.get_column_counts(user_story),
+            },
+            status=409,
+        )
+
+    return JsonResponse(
+        {
+            "success": True,
+            "moved": {task.pk: task.version for task in moved},
+            "counts": TaskService.get_column_counts(user_story),
+        }
+    )
 
 
 @login_required
 @require_POST
 def task_comment_delete_view(request, pk):
     """Delete a comment from a task."""
-    comment = get_object_or_404(TaskComment, pk=pk)
+    comment = get_object_or_404(TaskComment.objects.select_related("task"), pk=pk)
     task = comment.task
-    user_story = task.user_story
-    project = _get_project_from_user_story(user_story)
 
     # Check if user is the author or project owner
-    if request.user != comment.author and not project.is_owner(request.user):
+    is_owner = request.access.is_owner(task.project_id)
+    if comment.author_id != request.user.pk and not is_owner:
         messages.error(request, "Você não tem permissão para excluir este comentário.")
         return redirect("task_detail", pk=task.pk)
 
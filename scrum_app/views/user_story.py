@@ -2,78 +2,254 @@
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
-from django.shortcuts import get_object_or_404, redirect, render
-
-from scrum_app.forms.user_story_forms import MoveUserStoryForm, UserStoryForm
+from django.http import JsonResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
+from django.urls import reverse
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.decorators.http import require_POST
+
+from scrum_app.conditional import project_condition, project_id_from, project_id_kwarg
+from scrum_app.forms.user_story_forms import (
+    BulkMoveUserStoryForm,
+    MoveUserStoryForm,
+    UserStoryForm,
+)
+from scrum_app.generations import PRODUCT_BACKLOG, SPRINT_BACKLOG, aget_generation
 from scrum_app.models import ProductBacklog, Project, Sprint, SprintBacklog, UserStory
-from scrum_app.services.user_story_service import UserStoryService
+from scrum_app.pagination import COUNT_CAPPED, KeysetPaginator
+from scrum_app.services.user_story_service import (
+    BULK_EDIT_FIELDS,
+    STORY_BULK_LIMIT,
+    UserStoryService,
+)
+from scrum_app.views.rendering import alist, arender
+
+
+def _get_user_story_or_404(pk):
+    """Load a story with its project and (if any) sprint in one query."""
+    return get_object_or_404(
+        UserStory.objects.select_related("project", "sprint_backlog__sprint"), pk=pk
+    )
+
+
+def _move_targets(project):
+    """Sprints offered by the bulk move toolbar of the backlog pages."""
+    return (
+        Sprint.objects.filter(project_id=project.pk)
+        .exclude(status=Sprint.Status.CLOSED)
+        .order_by("-start_date", "-id")
+        .only("pk", "name")
+    )
 
 
 @login_required
-def product_backlog_view(request, project_pk):
+@project_condition(project_id_kwarg("project_pk"))
+async def product_backlog_view(request, project_pk):
     """View to display the product backlog of a project."""
-    project = get_object_or_404(Project, pk=project_pk)
-
     # Check if user is member or owner
-    if not project.is_member(request.user):
+    if not await request.access.ais_member(project_pk):
         messages.error(request, "Você não tem permissão para acessar este projeto.")
         return redirect("project_list")
+    project = await aget_object_or_404(Project, pk=project_pk)
 
     # Get or create product backlog
-    product_backlog, _ = ProductBacklog.objects.get_or_create(project=project)
+    product_backlog, _ = await ProductBacklog.objects.aget_or_create(project=project)
+
+    # Read before querying (see task_kanban_view)
+    cache_generation = await aget_generation(PRODUCT_BACKLOG, product_backlog.pk)
 
-    # Get all user stories in product backlog
-    user_stories = product_backlog.user_stories.all().order_by(
-        "-priority", "-created_at"
+    # Manual (drag and drop) order by default, priority order on request
+    sort = "priority" if request.GET.get("sort") == "priority" else "position"
+    ordering = (
+        UserStoryService.BACKLOG_ORDERING
+        if sort == "priority"
+        else UserStoryService.POSITION_ORDERING
     )
 
-    # Add pagination
-    paginator = Paginator(user_stories, 10)  # 10 user stories per page
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    # Keyset pagination: 10 user stories per page, total capped at 1000
+    paginator = KeysetPaginator(
+        product_backlog.user_stories.all(), ordering, 10, count_mode=COUNT_CAPPED
+    )
+    page_obj = await paginator.aget_page(request.GET.get("cursor"))
+    move_targets = await alist(_move_targets(project))
 
     context = {
         "project": project,
         "product_backlog": product_backlog,
         "page_obj": page_obj,
+        "move_targets": move_targets,
+        # Nowhere to move stories to without an open sprint
+        "selectable": bool(move_targets),
+        "sort": sort,
+        "sortable": sort == "position",
+        "bulk_edit_choices": {
+            "priority": UserStory.Priority.choices,
+            "status": UserStory.Status.choices,
+        },
+        "cache_generation": cache_generation,
     }
 
-    return render(request, "backlog/product_backlog.html", context)
+    return await arender(request, "backlog/product_backlog.html", context)
+
+
+@login_required
+@require_POST
+def user_story_reorder_view(request, pk):
+    """AJAX view to move a story between two neighbours (drag and drop)."""
+    user_story = get_object_or_404(UserStory, pk=pk)
+
+    # Check if user is member or owner
+    if not request.access.is_member(user_story.project_id):
+        return JsonResponse({"success": False, "error": "Acesso negado"}, status=403)
+
+    neighbours = {}
+    for side in ("before", "after"):
+        neighbour_id = request.POST.get(side)
+        neighbours[side] = (
+            get_object_or_404(UserStory, pk=neighbour_id) if neighbour_id else None
+        )
+    if not any(neighbours.values()):
+        return JsonResponse(
+            {"success": False, "error": "Informe a posição de destino"}, status=400
+        )
+
+    try:
+        position = UserStoryService.reorder(user_story, **neighbours)
+    except ValueError:
+        return JsonResponse({"success": False, "error": "Posição inválida"}, status=400)
+
+    return JsonResponse({"success": True, "position": position})
 
 
 @login_required
-def sprint_backlog_view(request, sprint_pk):
+@project_condition(project_id_from(Sprint, "sprint_pk"))
+async def sprint_backlog_view(request, sprint_pk):
     """View to display the sprint backlog of a sprint."""
-    sprint = get_object_or_404(Sprint, pk=sprint_pk)
+    sprint = await aget_object_or_404(
+        Sprint.objects.select_related("project"), pk=sprint_pk
+    )
     project = sprint.project
 
     # Check if user is member or owner
-    if not project.is_member(request.user):
+    if not await request.access.ais_member(project):
         messages.error(request, "Você não tem permissão para acessar esta sprint.")
         return redirect("project_list")
 
     # Get or create sprint backlog
-    sprint_backlog, _ = SprintBacklog.objects.get_or_create(sprint=sprint)
-
-    # Get all user stories in sprint backlog
-    user_stories = sprint_backlog.user_stories.all().order_by(
-        "-priority", "-created_at"
+    sprint_backlog, _ = await SprintBacklog.objects.aget_or_create(sprint=sprint)
+    cache_generation = await aget_generation(SPRINT_BACKLOG, sprint_backlog.pk)
+
+    # Keyset pagination: 10 user stories per page, total capped at 1000
+    paginator = KeysetPaginator(
+        sprint_backlog.user_stories.all(),
+        UserStoryService.BACKLOG_ORDERING,
+        10,
+        count_mode=COUNT_CAPPED,
     )
-
-    # Add pagination
-    paginator = Paginator(user_stories, 10)  # 10 user stories per page
-    page_number = request.GET.get("page")
-    page_obj = paginator.get_page(page_number)
+    page_obj = await paginator.aget_page(request.GET.get("cursor"))
+    move_targets = await alist(_move_targets(project).exclude(pk=sprint.pk))
 
     context = {
         "project": project,
         "sprint": sprint,
         "sprint_backlog": sprint_backlog,
         "page_obj": page_obj,
+        "move_targets": move_targets,
+        "cache_generation": cache_generation,
     }
 
-    return render(request, "backlog/sprint_backlog.html", context)
+    return await arender(request, "backlog/sprint_backlog.html", context)
+
+
+@login_required
+@require_POST
+def user_story_bulk_move_view(request, project_pk):
+    """Move the stories selected on a backlog page to another backlog."""
+    project = get_object_or_404(Project, pk=project_pk)
+
+    # Check if user is member or owner
+    if not request.access.is_member(project):
+        messages.error(request, "Você não tem permissão para mover estas user stories.")
+        return redirect("project_list")
+
+    # Back to the backlog page the selection was made on
+    next_url = request.POST.get("next")
+    if not url_has_allowed_host_and_scheme(
+        next_url, allowed_hosts={request.get_host()}, require_https=request.is_secure()
+    ):
+        next_url = reverse("product_backlog", args=[project.pk])
+
+    form = BulkMoveUserStoryForm(request.POST, sprints=project.sprints.all())
+    if not form.is_valid():
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(request, error)
+        return redirect(next_url)
+
+    sprint = form.cleaned_data["target"]
+    moved, errors = UserStoryService.bulk_move(
+        project, form.cleaned_data["stories"], sprint
+    )
+    if moved:
+        destination = f"a Sprint '{sprint.name}'" if sprint else "o Product Backlog"
+        messages.success(
+            request, f"{len(moved)} user story(s) movida(s) para {destination}."
+        )
+    for error in errors.values():
+        messages.warning(request, error)
+
+    return redirect(next_url)
+
+
+@login_required
+@require_POST
+def user_story_bulk_edit_view(request, project_pk):
+    """
+    AJAX view saving the cells changed in the backlog table's edit mode.
+
+    Expects one ``<story id>-<field>`` value per changed cell, plus the
+    ``<story id>-version`` each row was loaded at. Valid rows are saved even
+    when others are rejected; the per-row errors come back keyed by story.
+    """
+    project = get_object_or_404(Project, pk=project_pk)
+
+    # Check if user is member or owner
+    if not request.access.is_member(project):
+        return JsonResponse({"success": False, "error": "Acesso negado"}, status=403)
+
+    changes, versions = {}, {}
+    for key, value in request.POST.items():
+        story_id, _, name = key.partition("-")
+        if not story_id.isdigit():
+            continue
+        if name == "version":
+            if not value.isdigit():
+                return JsonResponse(
+                    {"success": False, "error": "Versão inválida"}, status=400
+                )
+            versions[int(story_id)] = int(value)
+        else:
+            changes.setdefault(int(story_id), {})[name] = value
+    if not changes or len(changes) > STORY_BULK_LIMIT:
+        return JsonResponse(
+            {"success": False, "error": "Alterações inválidas"}, status=400
+        )
+
+    updated, errors = UserStoryService.bulk_edit(project, changes, versions)
+
+    return JsonResponse(
+        {
+            "success": not errors,
+            "updated": {
+                story.pk: {
+                    "version": story.version,
+                    **{name: getattr(story, name) for name in BULK_EDIT_FIELDS},
+                }
+                for story in updated
+            },
+            "errors": errors,
+        }
+    )
 
 
 @login_required
@@ -82,7 +258,7 @@ def user_story_create_for_product_backlog(request, project_pk):
     project = get_object_or_404(Project, pk=project_pk)
 
     # Check if user is member or owner
-    if not project.is_member(request.user):
+    if not request.access.is_member(project):
         messages.error(request, "Você não tem permissão para acessar este projeto.")
         return redirect("project_list")
 
@@ -112,11 +288,11 @@ def user_story_create_for_product_backlog(request, project_pk):
 @login_required
 def user_story_create_for_sprint_backlog(request, sprint_pk):
     """Create a new user story for sprint backlog."""
-    sprint = get_object_or_404(Sprint, pk=sprint_pk)
+    sprint = get_object_or_404(Sprint.objects.select_related("project"), pk=sprint_pk)
     project = sprint.project
 
     # Check if user is member or owner
-    if not project.is_member(request.user):
+    if not request.access.is_member(project):
         messages.error(request, "Você não tem permissão para acessar esta sprint.")
         return redirect("project_list")
 
@@ -147,7 +323,7 @@ def user_story_create_for_sprint_backlog(request, sprint_pk):
 @login_required
 def user_story_update_view(request, pk):
     """Update an existing user story."""
-    user_story = get_object_or_404(UserStory, pk=pk)
+    user_story = _get_user_story_or_404(pk)
 
     # Get project from backlog
     project = UserStoryService.get_project_from_user_story(user_story)
@@ -157,7 +333,7 @@ def user_story_update_view(request, pk):
         backlog_type = "Sprint Backlog"
 
     # Check if user is member or owner
-    if not project.is_member(request.user):
+    if not request.access.is_member(project):
         messages.error(request, "Você não tem permissão para editar esta user story.")
         return redirect("project_list")
 
@@ -173,7 +349,7 @@ def user_story_update_view(request, pk):
                     return redirect("product_backlog", project_pk=project.pk)
                 else:
                     return redirect(
-                        "sprint_backlog", sprint_pk=user_story.sprint_backlog.sprint.pk
+                        "sprint_backlog", sprint_pk=user_story.sprint_backlog.sprint_id
                     )
             except Exception as e:
                 messages.error(request, f"Erro ao atualizar User Story: {str(e)}")
@@ -194,7 +370,7 @@ def user_story_update_view(request, pk):
 @login_required
 def user_story_delete_view(request, pk):
     """Delete a user story."""
-    user_story = get_object_or_404(UserStory, pk=pk)
+    user_story = _get_user_story_or_404(pk)
 
     # Get project from backlog
     project = UserStoryService.get_project_from_user_story(user_story)
@@ -203,10 +379,10 @@ def user_story_delete_view(request, pk):
         redirect_pk = project.pk
     else:
         redirect_url = "sprint_backlog"
-        redirect_pk = user_story.sprint_backlog.sprint.pk
+        redirect_pk = user_story.sprint_backlog.sprint_id
 
     # Check if user is member or owner
-    if not project.is_member(request.user):
+    if not request.access.is_member(project):
         messages.error(request, "Você não tem permissão para excluir esta user story.")
         return redirect("project_list")
 
@@ -233,15 +409,16 @@ def user_story_delete_view(request, pk):
 
 
 @login_required
+@project_condition(project_id_from(UserStory, "pk"))
 def user_story_detail_view(request, pk):
     """Display user story details."""
-    user_story = get_object_or_404(UserStory, pk=pk)
+    user_story = _get_user_story_or_404(pk)
 
     # Get project from backlog
     project = UserStoryService.get_project_from_user_story(user_story)
 
     # Check if user is member or owner
-    if not project.is_member(request.user):
+    if not request.access.is_member(project):
         messages.error(
             request, "Você não tem permissão para visualizar esta user story."
         )
@@ -258,13 +435,13 @@ def user_story_detail_view(request, pk):
 @login_required
 def user_story_move_view(request, pk):
     """Move a user story between product and sprint backlog."""
-    user_story = get_object_or_404(UserStory, pk=pk)
+    user_story = _get_user_story_or_404(pk)
 
     # Get project from backlog
     project = UserStoryService.get_project_from_user_story(user_story)
 
     # Check if user is member or owner
-    if not project.is_member(request.user):
+    if not request.access.is_member(project):
         messages.error(request, "Você não tem permissão para mover esta user story.")
         return redirect("project_list")
 
@@ -1,4 +1,5 @@
 # pylint: disable=missing-module-docstring
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -19,11 +20,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "scrum_app.middleware.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "scrum_app.middleware.ProjectAccessMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -44,10 +47,30 @@ TEMPLATES = [
     },
 ]
 
+# SQLite tuned for concurrent requests (measure with the load_test command):
+# WAL lets readers run alongside the writer, synchronous=NORMAL only syncs at
+# checkpoints, and the pragmas are applied on every new connection. Write
+# transactions start with BEGIN IMMEDIATE, taking the write lock up front: a
+# deferred transaction that reads, then writes, cannot upgrade its lock while
+# another connection writes and fails with "database is locked" without
+# waiting. "timeout" is SQLite's busy_timeout, in seconds.
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            "init_command": (
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                "PRAGMA mmap_size=268435456;"
+                "PRAGMA cache_size=-65536;"
+                "PRAGMA temp_store=MEMORY"
+            ),
+            "transaction_mode": "IMMEDIATE",
+            "timeout": 20,
+        },
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
@@ -76,3 +99,70 @@ STATIC_URL = "static/"
 LOGIN_REDIRECT_URL = "home"
 LOGOUT_REDIRECT_URL = "login"
 LOGIN_URL = "login"
+
+# The ACLs, generations and fragments below are shared by every worker
+# process and management command, so the cache must be too. Set
+# SCRUM_REDIS_URL (e.g. redis://localhost:6379/0, needs the redis package)
+# whenever more than one worker process serves requests. Without it each
+# process keeps a private LocMemCache, which is only correct for a single
+# process such as runserver. Tests always run on a LocMemCache (see
+# scrum_app.tests.runner).
+if os.environ.get("SCRUM_REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["SCRUM_REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    }
+TEST_RUNNER = "scrum_app.tests.runner.TestRunner"
+
+# Project ACL cache (see scrum_app.access)
+SCRUM_ACL_CACHE_TIMEOUT = 60 * 60
+# How often each process adds its hit/miss counts to the shared counters
+SCRUM_CACHE_STATS_FLUSH_SECONDS = 10
+
+# Rendered fragment cache (see scrum_app.templatetags.fragment_cache)
+SCRUM_FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Board change events over SSE (see scrum_app.events). Use
+# "scrum_app.events.OutboxBackend" when running more than one worker.
+SCRUM_EVENTS_BACKEND = "scrum_app.events.LocalBackend"
+SCRUM_EVENTS_HEARTBEAT = 15
+SCRUM_EVENTS_STREAM_SECONDS = 5 * 60
+SCRUM_EVENTS_RETRY_MS = 3000
+SCRUM_EVENTS_POLL_INTERVAL = 0.5
+SCRUM_EVENTS_OUTBOX_RETENTION = 5 * 60
+
+# Query inspector (see scrum_app.querybudget). Off unless asked for; the
+# budgets are also enforced by the test suite.
+SCRUM_QUERY_INSPECTOR = False
+SCRUM_N_PLUS_ONE_THRESHOLD = 5
+SCRUM_QUERY_BUDGETS = {
+    # Counts include the session, user and (cold) ACL lookups, plus the
+    # project lookup of the conditional GET (scrum_app.conditional)
+    "project_list": 5,
+    "project_detail": 6,
+    "project_members": 8,
+    "sprint_list": 7,
+    "sprint_detail": 6,
+    "product_backlog": 8,
+    "sprint_backlog": 8,
+    "user_story_detail": 5,
+    "task_kanban": 6,
+    "task_detail": 5,
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "scrum_app": {"handlers": ["console"], "level": "INFO"},
+    },
+}
@@ -5,6 +5,7 @@ from django.contrib.auth import views as auth_views
 from django.urls import path
 
 from scrum_app.views.auth import home_view, register_view
+from scrum_app.views.events import sprint_backlog_events_view, user_story_events_view
 from scrum_app.views.project import (
     project_create_view,
     project_delete_view,
@@ -25,10 +26,13 @@ from scrum_app.views.sprint import (
     sprint_update_view,
 )
 from scrum_app.views.task import (
+    task_bulk_update_status_view,
     task_comment_delete_view,
     task_create_view,
     task_delete_view,
     task_detail_view,
+    task_kanban_card_view,
+    task_kanban_more_view,
     task_kanban_view,
     task_update_status_view,
     task_update_view,
@@ -36,11 +40,14 @@ from scrum_app.views.task import (
 from scrum_app.views.user_story import (
     product_backlog_view,
     sprint_backlog_view,
+    user_story_bulk_edit_view,
+    user_story_bulk_move_view,
     user_story_create_for_product_backlog,
     user_story_create_for_sprint_backlog,
     user_story_delete_view,
     user_story_detail_view,
     user_story_move_view,
+    user_story_reorder_view,
     user_story_update_view,
 )
 
@@ -105,12 +112,27 @@ urlpatterns = [
         user_story_create_for_product_backlog,
         name="user_story_create_product",
     ),
+    path(
+        "projects/<int:project_pk>/backlog/move/",
+        user_story_bulk_move_view,
+        name="user_story_bulk_move",
+    ),
+    path(
+        "projects/<int:project_pk>/backlog/edit/",
+        user_story_bulk_edit_view,
+        name="user_story_bulk_edit",
+    ),
     # Sprint Backlog URLs
     path(
         "sprints/<int:sprint_pk>/backlog/",
         sprint_backlog_view,
         name="sprint_backlog",
     ),
+    path(
+        "sprints/<int:sprint_pk>/backlog/events/",
+        sprint_backlog_events_view,
+        name="sprint_backlog_events",
+    ),
     path(
         "sprints/<int:sprint_pk>/backlog/user-story/new/",
         user_story_create_for_sprint_backlog,
@@ -137,12 +159,32 @@ urlpatterns = [
         user_story_move_view,
         name="user_story_move",
     ),
+    path(
+        "user-stories/<int:pk>/reorder/",
+        user_story_reorder_view,
+        name="user_story_reorder",
+    ),
     # Task URLs
     path(
         "user-stories/<int:user_story_pk>/kanban/",
         task_kanban_view,
         name="task_kanban",
     ),
+    path(
+        "user-stories/<int:user_story_pk>/kanban/<str:status>/more/",
+        task_kanban_more_view,
+        name="task_kanban_more",
+    ),
+    path(
+        "user-stories/<int:user_story_pk>/events/",
+        user_story_events_view,
+        name="user_story_events",
+    ),
+    path(
+        "user-stories/<int:user_story_pk>/kanban/update-status/",
+        task_bulk_update_status_view,
+        name="task_bulk_update_status",
+    ),
     path(
         "user-stories/<int:user_story_pk>/tasks/new/",
         task_create_view,
@@ -163,6 +205,11 @@ urlpatterns = [
         task_delete_view,
         name="task_delete",
     ),
+    path(
+        "tasks/<int:pk>/card/",
+        task_kanban_card_view,
+        name="task_kanban_card",
+    ),
     path(
         "tasks/<int:pk>/update-status/",
         task_update_status_view,